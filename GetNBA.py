@@ -1,18 +1,45 @@
-import requests
-import time
-import matplotlib as mpl
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
+# requests and matplotlib are imported where they are first used so the
+# last frame can be put on screen before paying for them (see warm_start.py)
+import fonts
+import warm_start
+import supervisor
+import render_pool
+import upstream
+import shared_cache
+import schedule_index
+import config
+import sinks
+fonts.persist_font_cache()
 import sys
 import json
 import os
 from datetime import datetime
-import textwrap
 
 # --- Configuration ---
 # You can set this to 'PHI', 'NYY', or any other MLB team abbreviation.
 TEAM_ABBREVIATION = 'WSH'
 UPDATE_INTERVAL_SECONDS = 10 
+# Outside these windows the display shows an idle message and the process
+# sleeps instead of exiting (same hours as isWithinActiveHours() in GetNBA.html)
+ACTIVE_HOURS = [("12:30", "01:30")]
+# Multi-team deployments: every team listed here gets its own scoreboard
+# image (output/scoreboard_<TEAM>.png); the window shows the first one.
+TEAMS = [TEAM_ABBREVIATION]
+# Number of render worker processes. 0 renders in this process, like before;
+# anything else fetches here and renders in a pool of warm workers.
+RENDER_WORKERS = 0
+# Remote displays: publish only the rectangles that changed between frames to
+# output/frames/<TEAM>/ (see frame_diff.py), and serve that folder on
+# FRAME_DIFF_PORT unless it is None
+PUBLISH_FRAME_DIFFS = False
+FRAME_DIFF_PORT = 8766
+# Record every changed game state (output/history/) and build an animated
+# recap when the game ends, as output/recaps/<TEAM>_<game id> plus this
+# extension (see recap.py); '.mp4' needs ffmpeg. None turns both off.
+RECAP_FORMAT = '.gif'
+# Show every game of the night as a grid of cards, like GetNBA.html does in
+# the browser, instead of one team's scoreboard (drawn with Pillow, see slate.py)
+SLATE_MODE = False
 
 # --- Define the output paths based on the script's location ---
 # This makes the script work correctly when run from cron
@@ -25,6 +52,13 @@ except NameError:
 output_dir = os.path.join(script_dir, "output")
 SAVE_PATH_JSON = os.path.join(output_dir, "scoreboard_data.json")
 SAVE_PATH_PNG = os.path.join(output_dir, "scoreboard.png")
+SAVE_PATH_STATE = os.path.join(output_dir, "warm_state.json")
+FRAME_DIFF_DIR = os.path.join(output_dir, "frames")
+HISTORY_DIR = os.path.join(output_dir, "history")
+RECAP_DIR = os.path.join(output_dir, "recaps")
+SAVE_PATH_ARCHIVE = os.path.join(output_dir, "season_archive.sqlite")
+PROFILE_DIR = os.path.join(output_dir, "profiles")
+SAVE_PATH_SLATE = os.path.join(output_dir, "slate.png")
 
 
 # --- ESPN API Endpoint (Updated to a more stable endpoint) ---
@@ -32,9 +66,64 @@ API_URL = "http://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboar
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3",
 }
-
-#mpl.rcParams['font.family'] = "sans-serif"
-#mpl.rcParams['font.sans-serif'] = "Georgia"
+# Responses are shared through a file cache with every other scoreboard
+# process on this host polling the same URL; within this many seconds they
+# reuse one request (0 always asks ESPN directly)
+SHARED_CACHE_TTL = 8
+# Fetch the upcoming schedule once a day (see schedule_index.py) and only
+# poll the live scoreboard around the games of the teams shown; False polls
+# throughout ACTIVE_HOURS
+POLL_ONLY_NEAR_GAMES = True
+# Keep every final game of the polled slates in an SQLite season archive
+# (output/season_archive.sqlite, see archive.py)
+ARCHIVE_FINALS = True
+# Texts of the scoreboard: the title above the "<TEAM> HYPE" line, the
+# second line of the no-game screen and the banner when the team wins
+TITLE = "DC SCOREBOARD"
+NO_GAME_TEXT = "And The Mets Still Suck"
+WIN_TEXT = 'YANKEES WIN'
+# Profile the next PROFILE_CYCLES loop cycles on SIGUSR1, or on a GET of
+# http://127.0.0.1:PROFILE_PORT/profile?cycles=N unless the port is None;
+# the profile and a per-stage summary go to output/profiles/ (see profiler.py)
+PROFILE_CYCLES = 10
+PROFILE_PORT = None
+# Outputs besides the files in output/ (see sinks.py): a Linux framebuffer
+# device such as '/dev/fb0', and a port serving the latest image and data
+# plus a stream of game updates (None turns either off). Every output is
+# written from its own queue, so a slow one never holds up the next poll.
+FRAMEBUFFER_DEVICE = None
+SINK_HTTP_PORT = None
+# Celebrate lead changes and wins of the team with a short
+# animation in the window (a banner over a flash in the team's colours).
+# The frames are rendered ahead of time and play during the pause between
+# polls, never delaying one (see celebrations.py).
+CELEBRATIONS = True
+
+# --- Hot-reloadable settings ---
+# Any of the settings above can also be set in GetNBA_config.json next to
+# this script (same names, JSON values). The file applies at startup, and
+# the LIVE_SETTINGS are applied again while running whenever the file
+# changes or the process gets SIGHUP; the others need a restart (see
+# config.py). With RENDER_WORKERS the team list is fixed, so
+# TEAM_ABBREVIATION needs a restart there too.
+LIVE_SETTINGS = ['TEAM_ABBREVIATION', 'UPDATE_INTERVAL_SECONDS', 'ACTIVE_HOURS', 'API_URL',
+                 'TITLE', 'NO_GAME_TEXT', 'WIN_TEXT']
+SAVE_PATH_CONFIG = os.path.join(script_dir, "GetNBA_config.json")
+settings = config.ConfigReloader(sys.modules[__name__], SAVE_PATH_CONFIG, LIVE_SETTINGS,
+                                 validators={'ACTIVE_HOURS': supervisor.parse_windows})
+settings.check()
+if 'TEAMS' not in settings.values:
+    TEAMS = [TEAM_ABBREVIATION]
+if RENDER_WORKERS:
+    settings.live.discard('TEAM_ABBREVIATION')
+
+# --- Fonts ---
+# Put Georgia.ttf (or any TTF) in fonts/ or set SCOREBOARD_FONT; see fonts.py.
+# The font is registered directly instead of searching the system font folders.
+
+# The output sinks of the main loop (see sinks.py). Without them (render
+# workers, recaps, benchmarks) the files are written directly, like before.
+outputs = None
 
 def ensure_output_directory_exists():
     """Ensure the output directory exists."""
@@ -42,319 +131,168 @@ def ensure_output_directory_exists():
         os.makedirs(output_dir)
         print(f"Created directory: {output_dir}")
 
-def fetch_and_find_game():
+def fetch_and_find_game(fetch=None):
     """
     Fetches data from the API, saves the raw JSON to a file, 
-    and finds the game for the configured team.
+    and finds the game for the configured team. `fetch` (e.g. an
+    upstream.UpstreamCache's fetch) replaces the direct API call.
+    """
+    json_data = (fetch or fetch_scoreboard)()
+    return upstream.mark_stale(find_game(json_data), json_data) if json_data else None
+
+def download_scoreboard():
+    """Requests the scoreboard from the API; raises on errors."""
+    import requests
+
+    response = requests.get(API_URL, headers=HEADERS, timeout=10)
+    # This will raise an HTTPError for bad responses (4xx or 5xx)
+    response.raise_for_status()
+    return response.json()
+
+# The cache shared with the other scoreboard processes; built on the first
+# fetch, and again only when SHARED_CACHE_TTL is reloaded
+_shared_cache = None
+
+def shared_response_cache():
+    global _shared_cache
+    if _shared_cache is None or _shared_cache.ttl != SHARED_CACHE_TTL:
+        _shared_cache = shared_cache.SharedCache(ttl=SHARED_CACHE_TTL)
+    return _shared_cache
+
+def fetch_scoreboard():
     """
+    Fetches data from the API (through the cache shared with the other
+    scoreboard processes on this host, see shared_cache.py) and saves the
+    raw JSON to a file. Returns None on errors.
+    """
+    import requests
+
     try:
-        response = requests.get(API_URL, headers=HEADERS, timeout=10)
-        # This will raise an HTTPError for bad responses (4xx or 5xx)
-        response.raise_for_status()
-        json_data = response.json()
+        if SHARED_CACHE_TTL:
+            json_data = shared_response_cache().get(API_URL, download_scoreboard)
+        else:
+            json_data = download_scoreboard()
         
         # Save the JSON to the same directory as the script
-        with open(SAVE_PATH_JSON, "w") as f:
-            json.dump(json_data, f, indent=4)
-        print(f"Successfully saved latest data to {SAVE_PATH_JSON}")
-
-        # Search through the data for the specified team's game
-        for event in json_data.get('events', []):
-            # This is a robust way to find the game by checking team abbreviations directly.
-            if any(TEAM_ABBREVIATION == comp.get('team', {}).get('abbreviation') for comp in event.get('competitions', [{}])[0].get('competitors', [])):
-                # The game details are inside the first competition
-                return event.get('competitions', [{}])[0]
+        if outputs is not None:
+            outputs.publish(sinks.PAYLOAD, SAVE_PATH_JSON, json_data)
+        else:
+            with open(SAVE_PATH_JSON, "w") as f:
+                json.dump(json_data, f, indent=4)
+            print(f"Successfully saved latest data to {SAVE_PATH_JSON}")
+        return json_data
                         
     except requests.exceptions.HTTPError as e:
         print(f"HTTP Error: Could not fetch data. Status code: {e.response.status_code}")
+    except shared_cache.CachedError as e:
+        print(f"Another scoreboard process could not fetch data: {e}")
     except requests.exceptions.RequestException as e:
         # This catches other network-related errors (e.g., timeout, no internet)
         print(f"A network error occurred: {e}")
     except Exception as e:
         # This catches other potential errors (e.g., JSON decoding, file permissions)
-        print(f"An unexpected error occurred in fetch_and_find_game: {e}")
+        print(f"An unexpected error occurred in fetch_scoreboard: {e}")
         
     return None
 
-def update_and_redraw_plot(fig):
-    """Fetches new data and completely redraws the plot."""
-    
-    # Clear the entire figure to ensure a fresh draw
-    plt.clf()
-    ax = fig.add_subplot(111) # Add a new axes object
-    ax.axis('off')
-    
-    # Adjust the top of the subplot to move all content down
-    plt.subplots_adjust(top=0.78)
-    
-    game = fetch_and_find_game()
-
-    # --- Set the main title ---
-    title = ax.set_title(
-        f"DC SCOREBOARD\n{TEAM_ABBREVIATION} HYPE",
-        fontsize=50, pad=40, fontweight='bold', color='white', 
-        #fontname='Georgia'
-    )
-
-    if not game:
-        title.set_text(f"No Game Today for {TEAM_ABBREVIATION}\nAnd The Mets Still Suck")
-        return
-
-    status = game.get('status', {})
-    status_type = status.get('type', {})
-    status_name = status_type.get('name')
-    status_detail = status_type.get('shortDetail', 'TBD')
-
-    competitors = game.get('competitors', [])
-    away_comp = next((c for c in competitors if c.get('homeAway') == 'away'), {})
-    home_comp = next((c for c in competitors if c.get('homeAway') == 'home'), {})
-    away_team = away_comp.get('team', {}).get('abbreviation', 'N/A')
-    home_team = home_comp.get('team', {}).get('abbreviation', 'N/A')
-    
-    # Get team IDs for coloring logic
-    away_team_id = away_comp.get('id')
-    home_team_id = home_comp.get('id')
-    
-    # Get team colors
-    away_color = f"#{away_comp.get('team', {}).get('color', 'FFFFFF')}"
-    away_alt_color = f"#{away_comp.get('team', {}).get('alternateColor', '000000')}"
-    home_color = f"#{home_comp.get('team', {}).get('color', 'FFFFFF')}"
-    home_alt_color = f"#{home_comp.get('team', {}).get('alternateColor', '000000')}"
-
-    # --- Draw tables based on game status ---
-    if status_name == 'STATUS_SCHEDULED':
-        # --- PRE-GAME DISPLAY ---
-        
-        # --- Odds Extraction for Pre-Game ---
-        away_odds, home_odds = 'N/A', 'N/A'
-        odds_container = game.get('odds')
-        if isinstance(odds_container, list) and odds_container:
-            odds_data = odds_container[0]
-            away_odds = odds_data.get('details', 'N/A')
-            home_odds = odds_data.get('overUnder', 'N/A')
-
-            if (away_odds == 'N/A' or home_odds == 'N/A') and 'details' in odds_data:
-                details_str = odds_data['details']
-                parts = details_str.split(' ')
-                if len(parts) == 2:
-                    team_abbr_from_details, odds_val_from_details = parts
-                    if team_abbr_from_details == away_team: away_odds = odds_val_from_details
-                    elif team_abbr_from_details == home_team: home_odds = odds_val_from_details
-
-        if str(away_odds).upper() == 'EVEN': away_odds = 100
-        if str(home_odds).upper() == 'EVEN': home_odds = 100
-
-        away_odds_str = f"+{away_odds}" if isinstance(away_odds, (int, float)) and away_odds > 0 else str(away_odds)
-        home_odds_str = f"+{home_odds}" if isinstance(home_odds, (int, float)) and home_odds > 0 else str(home_odds)
-
-        main_table = ax.table(
-            cellText=[[away_team, '', away_odds_str], [home_team, '', home_odds_str]],
-            colLabels=["Team", "Status", "Odds"], colWidths=[0.3, 0.4, 0.3],
-            loc='center', cellLoc='center', bbox=[0.2, 0.65, 0.6, 0.4]
-        )
-        time_part = ""
-        if ' - ' in status_detail:
-            time_part = status_detail.split(' - ')[1].strip()
-        elif ',' in status_detail:
-            time_part = status_detail.split(',')[1].strip()
-        status_detail = ' '.join(time_part.split(' ')[:-1]) if time_part else status_detail
-        main_table.get_celld()[(1, 1)].get_text().set_text(status_detail)
-        
-        # Style the pre-game table
-        main_table.auto_set_font_size(False)
-        main_table.set_fontsize(32)
-        for key, cell in main_table.get_celld().items():
-            cell.set_text_props(weight='bold', color='white')
-            cell.set_facecolor('none')
-            cell.set_edgecolor('none')
-        for i in range(3):
-            main_table.get_celld()[(0, i)].set_text_props(color='#AAAAAA')
-        for key, cell in main_table.get_celld().items():
-                cell.set_text_props(weight='bold', color='white')
-                cell.set_facecolor('#444444')
-                cell.set_edgecolor('none')
-        for i in range(3):
-            main_table.get_celld()[(0, i)].set_facecolor('none')
-        main_table.get_celld()[(1, 0)].set_facecolor(away_color)
-        main_table.get_celld()[(1, 0)].get_text().set_color(away_alt_color)
-        main_table.get_celld()[(2, 0)].set_facecolor(home_color)
-        main_table.get_celld()[(2, 0)].get_text().set_color(home_alt_color)
-        
-        
-    else:
-        # --- LIVE OR POST-GAME DISPLAY ---
-        # Draw Linescore Table
-        linescore_table = ax.table(
-            cellText=[[''] * 6] * 2,
-            colLabels=['', '1', '2', '3', '4', 'TOT'],
-            colWidths=[0.20] + [0.15] * 5, loc='center', cellLoc='center',
-            bbox=[0.075, 0.55, 0.85, 0.35]
-        )
-        linescore_table.auto_set_font_size(False)
-        linescore_table.set_fontsize(38)
-        
-        lighter_grey_bg = "#FFFFFF"
-        for key, cell in linescore_table.get_celld().items():
-            cell.set_facecolor(lighter_grey_bg)
-            cell.set_text_props(weight='bold', color='white')
-            cell.set_edgecolor('none')
-            
-        for i in range(6):
-            linescore_table.get_celld()[(0, i)].set_text_props(color="#CBCBCB")
-        
-        for row_idx in range(3):
-            for col_idx in range(6):
-                linescore_table.get_celld()[(row_idx, col_idx)].set_facecolor("#3D3D3D")
-        
-        for row_idx in range(1, 3):
-            for col_idx in range(1, 6):
-                linescore_table.get_celld()[(row_idx, col_idx)].set_edgecolor("#555555")
-        
-        away_linescores = away_comp.get('linescores', [])
-        home_linescores = home_comp.get('linescores', [])
-        away_score = str(away_comp.get('score', ''))
-        home_score = str(home_comp.get('score', ''))
-
-        linescore_table.get_celld()[(1, 0)].get_text().set_text(away_team)
-        linescore_table.get_celld()[(1, 0)].set_facecolor(away_color)
-        linescore_table.get_celld()[(1, 0)].get_text().set_color(away_alt_color)
-        for i, score in enumerate(away_linescores):
-            if i < 9: linescore_table.get_celld()[(1, i + 1)].get_text().set_text(str(int(score.get('value', 0))))
-        linescore_table.get_celld()[(1, 5)].get_text().set_text(away_score)
-        
-        linescore_table.get_celld()[(2, 0)].get_text().set_text(home_team)
-        linescore_table.get_celld()[(2, 0)].set_facecolor(home_color)
-        linescore_table.get_celld()[(2, 0)].get_text().set_color(home_alt_color)
-        for i, score in enumerate(home_linescores):
-            if i < 9: linescore_table.get_celld()[(2, i + 1)].get_text().set_text(str(int(score.get('value', 0))))
-        linescore_table.get_celld()[(2, 5)].get_text().set_text(home_score)
-        # Add the status detail below the linescore table
-        ax.text(
-            0.5, 1, status_detail,
-            transform=ax.transAxes,
-            fontsize=38,
-            color="#26FF00",
-            ha='center',
-            va='top',
-            fontweight='bold'
-        )
+def find_game(json_data, team=None):
+    """Finds the game for `team` (default: the configured team) in a scoreboard payload."""
+    team = team or TEAM_ABBREVIATION
+    return games_by_team(json_data).get(team)
 
-        if status_name == 'STATUS_IN_PROGRESS':
-            # --- Points, Assists, Rebounds Leaders Table ---
-            # 3 rows: header, away, home
-            par_table = ax.table(
-                cellText=[['', '', ''], ['', '', ''], ['', '', '']],
-                colLabels=["Points", "Assists", "Rebounds"],
-                colWidths=[0.3, 0.3, 0.3], loc='center', cellLoc='center', bbox=[0.25, 0.1, 0.6, 0.3]
-            )
+# The index of the last payload looked up (see games_by_team)
+_team_index = {'payload': None, 'games': {}}
 
-            # Style the PAR table
-            par_table.auto_set_font_size(False)
-            par_table.set_fontsize(18)
-            par_table_bg = '#555555'  # Lighter grey background
-            for key, cell in par_table.get_celld().items():
-                cell.set_text_props(weight='bold', color='white')
-                cell.set_facecolor(par_table_bg)
-                cell.set_edgecolor('none')
+def games_by_team(json_data):
+    """
+    {team abbreviation: game} of a scoreboard payload. It is built in one
+    pass the first time a payload is looked up, so finding the games of
+    every tracked team costs one scan of the slate instead of one per team.
+    """
+    if _team_index['payload'] is not json_data:
+        games = {}
+        for event in json_data.get('events', []):
+            # The game details are inside the first competition
+            competition = event.get('competitions', [{}])[0]
+            for comp in competition.get('competitors', []):
+                # The first game of a team wins, as with the old linear search (doubleheaders)
+                games.setdefault(comp.get('team', {}).get('abbreviation'), competition)
+        _team_index.update(payload=json_data, games=games)
+    return _team_index['games']
+
+def team_png_path(team):
+    """Where the scoreboard image for `team` is saved; the configured team keeps scoreboard.png."""
+    if team == TEAM_ABBREVIATION:
+        return SAVE_PATH_PNG
+    return os.path.join(output_dir, f"scoreboard_{team}.png")
 
-            # Style headers for PAR table
-            for i in range(3):
-                par_table.get_celld()[(0, i)].set_text_props(color='#AAAAAA')
+def update_and_redraw_plot(fig):
+    """Fetches new data and completely redraws the plot."""
+    show_game(fig, fetch_and_find_game())
 
-            # Get leaders for points, assists, and rebounds for each team
-            away_leaders = away_comp.get('leaders', [])
-            home_leaders = home_comp.get('leaders', [])
+def show_game(fig, game, score_timeline=None):
+    """Redraws the plot for a freshly fetched game and remembers it for the next start."""
+    warm_start.save_state(SAVE_PATH_STATE, TEAM_ABBREVIATION, game)
+    draw_scoreboard(fig, game, score_timeline=score_timeline)
 
-            def get_leader_info(leaders, stat):
-                for leader in leaders:
-                    if leader.get('type', {}).get('name') == stat:
-                        if leader.get('leaders'):
-                            athlete = leader['leaders'][0].get('athlete', {})
-                            value = leader['leaders'][0].get('value', 0)
-                            name = athlete.get('displayName', 'N/A')
-                            return f"{name} ({value})"
-                return "N/A"
+def show_slate(json_data, renderer, view):
+    """Brings the slate image up to date, saves it when it changed and shows it in the window."""
+    if json_data is None:
+        return
+    import numpy as np
+    import slate
+
+    image = renderer.render(slate.slate_games(json_data), slate.slate_title(json_data))
+    if renderer.changed:
+        save_frame(image, SAVE_PATH_SLATE)
+    view.show_frame(np.asarray(image))
+
+def draw_idle(fig, resume_at):
+    """Shows the idle message while outside the active hours (or between game windows)."""
+    resume_text = resume_at.strftime('%I:%M%p').lstrip('0')
+    if resume_at.date() != datetime.now().date():
+        resume_text = f"{resume_at.strftime('%a')} {resume_text}"
+    fig.clf()
+    ax = fig.add_subplot(111)
+    ax.axis('off')
+    fig.subplots_adjust(top=0.78)
+    ax.set_title(
+        f"Not Hyping until {resume_text}",
+        fontsize=50, pad=40, fontweight='bold', color='white'
+    )
+    save_figure(fig, SAVE_PATH_PNG)
 
-            # Populate PAR Table (row 1 = away, row 2 = home)
-            par_table.get_celld()[(1, 0)].get_text().set_text(get_leader_info(away_leaders, 'points'))
-            par_table.get_celld()[(1, 1)].get_text().set_text(get_leader_info(away_leaders, 'assists'))
-            par_table.get_celld()[(1, 2)].get_text().set_text(get_leader_info(away_leaders, 'rebounds'))
-            par_table.get_celld()[(2, 0)].get_text().set_text(get_leader_info(home_leaders, 'points'))
-            par_table.get_celld()[(2, 1)].get_text().set_text(get_leader_info(home_leaders, 'assists'))
-            par_table.get_celld()[(2, 2)].get_text().set_text(get_leader_info(home_leaders, 'rebounds'))
+def save_figure(fig, save_path):
+    """Saves the drawn figure as `save_path`, through the output sinks when there are any."""
+    if outputs is not None:
+        outputs.publish(sinks.FRAME, save_path, sinks.figure_image(fig))
+        return
+    fig.savefig(save_path, facecolor=fig.get_facecolor(), edgecolor='none')
+    print(f"Scoreboard image saved to {save_path}")
 
-            # --- Dynamic Coloring for PAR Table ---
-            for i in range(3):
-                par_table.get_celld()[(1, i)].set_facecolor(away_color)
-                par_table.get_celld()[(1, i)].get_text().set_color(away_alt_color)
-                par_table.get_celld()[(2, i)].set_facecolor(home_color)
-                par_table.get_celld()[(2, i)].get_text().set_color(home_alt_color)
+def save_frame(frame, save_path):
+    """Saves a rendered frame (a PIL image) as `save_path`, through the output sinks when there are any."""
+    if outputs is not None:
+        outputs.publish(sinks.FRAME, save_path, frame.convert('RGB'))
+        return
+    frame.save(save_path, format='PNG', compress_level=1)
+    print(f"Scoreboard image saved to {save_path}")
 
-        elif status_name == 'STATUS_FINAL':
-             # --- Draw Post-Game Table ---
-             post_game_table = ax.table(
-                cellText=[[away_team, away_score, status_detail], [home_team, home_score, '']],
-                #colLabels=["Team", "Runs", "Status"], 
-                colWidths=[0.3, 0.2, 0.4],
-                loc='center', cellLoc='center', bbox=[0.35, 0.3, 0.3, 0.25]
-             )
-             post_game_table.auto_set_font_size(False)
-             post_game_table.set_fontsize(30)
-             for key, cell in post_game_table.get_celld().items():
-                cell.set_text_props(weight='bold', color='white')
-                cell.set_facecolor('#444444')
-                cell.set_edgecolor('none')
-             #post_game_table.get_celld()[(0, 0)].set_text_props(color='#AAAAAA')
-             #post_game_table.get_celld()[(0, 1)].set_text_props(color='#AAAAAA')
-             #post_game_table.get_celld()[(0, 2)].set_text_props(color='#AAAAAA')
-             post_game_table.get_celld()[(0, 0)].set_facecolor(away_color)
-             post_game_table.get_celld()[(0, 0)].get_text().set_color(away_alt_color)
-             post_game_table.get_celld()[(1, 0)].set_facecolor(home_color)
-             post_game_table.get_celld()[(1, 0)].get_text().set_color(home_alt_color)
+def draw_scoreboard(fig, game, updated_at=None, team=None, save_path=None, score_timeline=None):
+    """Renders the scoreboard of an already fetched game (see layouts.py), saves it and shows it in the figure, if any."""
+    import layouts
 
-             # --- WINNER MESSAGE LOGIC ---
-             winner_abbr = ''
-             if int(away_score) > int(home_score):
-                 winner_abbr = away_team
-             elif int(home_score) > int(away_score):
-                 winner_abbr = home_team
-             
-             if winner_abbr == TEAM_ABBREVIATION:
-                 ax.text(0.5, 0.15, 'YANKEES WIN',
-                         transform=ax.transAxes, fontsize=60, color='blue',
-                         horizontalalignment='center', fontweight='bold',
-                         bbox=dict(facecolor='white', alpha=0.5, edgecolor='none', boxstyle='round,pad=0.2'))
+    team = team or TEAM_ABBREVIATION
+    save_path = save_path or SAVE_PATH_PNG
 
-    update_time = datetime.now().strftime('%H:%M:%S')
-    ax.text(0.99, 0.01, f'Last Updated: {update_time}',
-            transform=ax.transAxes, fontsize=12, color='gray',
-            horizontalalignment='right')
-    
-    fig.savefig(SAVE_PATH_PNG, facecolor=fig.get_facecolor(), edgecolor='none')
-    print(f"Scoreboard image saved to {SAVE_PATH_PNG}")
+    frame = layouts.render_scoreboard(game, team, upstream.updated_text(game, updated_at), score_timeline,
+                                      sport=schedule_index.sport_of(API_URL)[1],
+                                      title=TITLE, win_text=WIN_TEXT, no_game_text=NO_GAME_TEXT)
+    save_frame(frame, save_path)
+    if fig is not None:
+        import numpy as np
+        render_pool.frame_view(fig).show_frame(np.asarray(frame))
 
 if __name__ == "__main__":
-    ensure_output_directory_exists()
-    plt.ion()
-    fig = plt.figure(figsize=(16, 9))
-    fig.patch.set_facecolor('#606060')
-    fig.canvas.mpl_connect('close_event', lambda event: sys.exit(0))
-
-    mng = plt.get_current_fig_manager()
-    try: mng.window.showMaximized()
-    except AttributeError:
-        try: mng.full_screen_toggle()
-        except AttributeError: print("Warning: Could not automatically maximize or full-screen the window.")
-    
-    while True:
-        now = datetime.now()
-        if now.hour == 1 and now.minute >= 30:
-            print(f"Shutdown time reached ({now.strftime('%H:%M')}). Exiting script.")
-            sys.exit(0)
-
-        try:
-            update_and_redraw_plot(fig)
-            plt.pause(UPDATE_INTERVAL_SECONDS)
-        except Exception as e:
-            print(f"An error occurred in the main loop: {e}")
-            break
+    import main_loop
+    main_loop.run(sys.modules[__name__])
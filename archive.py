@@ -0,0 +1,238 @@
+"""
+Season archive of final games in SQLite.
+
+Nothing used to survive a final except the last scoreboard_data.json. A
+SeasonArchive records every completed game the scripts see in a polled
+slate (not only the configured team's): the teams, score, R/H/E, the
+per-period linescores, and the leaders and probables as JSON. New finals
+are buffered and written in one transaction per slate; games already
+archived are skipped without touching the database.
+
+Besides the games table there is one team_games row per team and game,
+indexed on (team, date) and (team, opponent, date), so a team's last N
+results or its head-to-head history are single index range scans:
+
+    python archive.py NYY          # last 10 results
+    python archive.py NYY BOS      # head to head
+"""
+import json
+import os
+import sqlite3
+import sys
+
+try:
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+except NameError:
+    # Fallback for interactive environments
+    script_dir = os.getcwd()
+
+ARCHIVE_PATH = os.path.join(script_dir, "output", "season_archive.sqlite")
+BATCH_SIZE = 50  # finals buffered before an automatic flush
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id TEXT PRIMARY KEY,
+    league TEXT,
+    date TEXT,
+    season INTEGER,
+    away TEXT,
+    home TEXT,
+    away_score INTEGER,
+    home_score INTEGER,
+    away_hits INTEGER,
+    home_hits INTEGER,
+    away_errors INTEGER,
+    home_errors INTEGER,
+    periods INTEGER,
+    detail TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS games_date ON games (date);
+CREATE TABLE IF NOT EXISTS team_games (
+    game_id TEXT,
+    league TEXT,
+    team TEXT,
+    opponent TEXT,
+    date TEXT,
+    home INTEGER,
+    score INTEGER,
+    opponent_score INTEGER,
+    result TEXT,
+    PRIMARY KEY (game_id, team)
+);
+CREATE INDEX IF NOT EXISTS team_games_team ON team_games (team, date);
+CREATE INDEX IF NOT EXISTS team_games_opponent ON team_games (team, opponent, date);
+CREATE TABLE IF NOT EXISTS linescores (
+    game_id TEXT,
+    team TEXT,
+    period INTEGER,
+    value INTEGER,
+    PRIMARY KEY (game_id, team, period)
+);
+"""
+
+
+def _int(value):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _leaders(competitor):
+    leaders = []
+    for category in competitor.get('leaders', []) or []:
+        top = (category.get('leaders') or [{}])[0]
+        name = top.get('athlete', {}).get('displayName')
+        if name:
+            leaders.append({'category': category.get('name') or category.get('abbreviation'),
+                            'name': name, 'value': top.get('displayValue')})
+    return leaders
+
+
+def _probables(competitor):
+    return [{'name': p.get('athlete', {}).get('displayName'), 'summary': p.get('summary')}
+            for p in competitor.get('probables', []) or [] if p.get('athlete')]
+
+
+def game_rows(game, league=None, season=None):
+    """(games row, team_games rows, linescore rows) for a final game, or None if it is not final."""
+    status = game.get('status', {}).get('type', {})
+    competitors = game.get('competitors', [])
+    away = next((c for c in competitors if c.get('homeAway') == 'away'), None)
+    home = next((c for c in competitors if c.get('homeAway') == 'home'), None)
+    if not status.get('completed') or not away or not home or not game.get('id'):
+        return None
+    abbr = lambda c: c.get('team', {}).get('abbreviation')
+    away_score, home_score = _int(away.get('score')), _int(home.get('score'))
+    date = game.get('date') or ''
+    season = season or _int(date[:4])
+    extra = {abbr(c): {'leaders': _leaders(c), 'probables': _probables(c)} for c in (away, home)}
+    game_row = (
+        game['id'], league, date, season, abbr(away), abbr(home), away_score, home_score,
+        _int(away.get('hits')), _int(home.get('hits')), _int(away.get('errors')), _int(home.get('errors')),
+        _int(game.get('status', {}).get('period')), status.get('shortDetail'), json.dumps(extra),
+    )
+
+    def result(score, other):
+        if score is None or other is None:
+            return None
+        return 'W' if score > other else 'L' if score < other else 'T'
+
+    team_rows = [
+        (game['id'], league, abbr(away), abbr(home), date, 0, away_score, home_score, result(away_score, home_score)),
+        (game['id'], league, abbr(home), abbr(away), date, 1, home_score, away_score, result(home_score, away_score)),
+    ]
+    line_rows = [
+        (game['id'], abbr(c), period, _int(line.get('value')))
+        for c in (away, home) for period, line in enumerate(c.get('linescores', []) or [], 1)
+    ]
+    return game_row, team_rows, line_rows
+
+
+def slate_league(json_data):
+    leagues = (json_data or {}).get('leagues') or [{}]
+    return leagues[0].get('abbreviation')
+
+
+class SeasonArchive:
+    def __init__(self, path=ARCHIVE_PATH, batch_size=BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Other scoreboard processes may write at the same time; wait for their lock
+        self.conn = sqlite3.connect(path, timeout=10)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        self._pending = []
+        self._known = {row[0] for row in self.conn.execute("SELECT id FROM games")}
+
+    def add(self, game, league=None, season=None):
+        """Buffers a game if it is final and not archived yet; returns True if it was new."""
+        if not game or game.get('id') in self._known:
+            return False
+        rows = game_rows(game, league, season)
+        if rows is None:
+            return False
+        self._pending.append(rows)
+        self._known.add(game['id'])
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        return True
+
+    def add_slate(self, json_data):
+        """Archives every final game of a scoreboard payload in one transaction; returns how many were new."""
+        league = slate_league(json_data)
+        season = ((json_data or {}).get('season') or {}).get('year')
+        added = sum(self.add(event.get('competitions', [{}])[0], league, (event.get('season') or {}).get('year') or season)
+                    for event in (json_data or {}).get('events', []))
+        if added:
+            self.flush()
+            print(f"Archived {added} final game{'s' if added != 1 else ''} to {self.path}")
+        return added
+
+    def flush(self):
+        if not self._pending:
+            return
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO games VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                  [game_row for game_row, _, _ in self._pending])
+            self.conn.executemany("INSERT OR REPLACE INTO team_games VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                  [row for _, team_rows, _ in self._pending for row in team_rows])
+            self.conn.executemany("INSERT OR REPLACE INTO linescores VALUES (?, ?, ?, ?)",
+                                  [row for _, _, line_rows in self._pending for row in line_rows])
+        self._pending = []
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    def last_results(self, team, n=10, league=None, before=None):
+        """A team's last `n` results, newest first (optionally only games before the ISO date `before`)."""
+        query = "SELECT * FROM team_games WHERE team = ?"
+        params = [team]
+        if league:
+            query += " AND league = ?"
+            params.append(league)
+        if before:
+            query += " AND date < ?"
+            params.append(before)
+        query += " ORDER BY date DESC LIMIT ?"
+        return [dict(row) for row in self.conn.execute(query, params + [n])]
+
+    def head_to_head(self, team, opponent, n=20, league=None):
+        """The last `n` games between two teams, newest first, from `team`'s side."""
+        query = "SELECT * FROM team_games WHERE team = ? AND opponent = ?"
+        params = [team, opponent]
+        if league:
+            query += " AND league = ?"
+            params.append(league)
+        query += " ORDER BY date DESC LIMIT ?"
+        return [dict(row) for row in self.conn.execute(query, params + [n])]
+
+    def linescore(self, game_id):
+        """{team: [runs/points per period]} of an archived game."""
+        lines = {}
+        for row in self.conn.execute("SELECT team, value FROM linescores WHERE game_id = ? ORDER BY team, period",
+                                     (game_id,)):
+            lines.setdefault(row['team'], []).append(row['value'])
+        return lines
+
+
+def record(results):
+    """'7-3 (W-L)' style summary of team_games rows."""
+    wins = sum(1 for r in results if r['result'] == 'W')
+    losses = sum(1 for r in results if r['result'] == 'L')
+    return f"{wins}-{losses}"
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit("usage: python archive.py TEAM [OPPONENT]")
+    archive = SeasonArchive()
+    team = sys.argv[1]
+    results = archive.head_to_head(team, sys.argv[2]) if len(sys.argv) > 2 else archive.last_results(team)
+    for r in results:
+        side = 'vs' if r['home'] else '@'
+        print(f"{r['date'][:10]}  {r['result'] or '-'}  {r['score']}-{r['opponent_score']}  {side} {r['opponent']}")
+    print(f"Record: {record(results)}")
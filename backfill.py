@@ -0,0 +1,291 @@
+"""
+Historical backfill: past scoreboards of a league over a date range.
+
+Seeding the season archive or building replay fixtures needs every day of
+a season, and fetching those one requests.get at a time takes hours. This
+fetches the days of a range on a bounded thread pool that shares one pooled
+requests.Session, with a token-bucket rate limit across all workers and
+retries with backoff on timeouts, 429s and 5xx answers. Every day is saved
+as a gzipped snapshot (output/backfill/<league>/YYYYMMDD.json.gz), and the
+days done are kept in a checkpoint file, so an interrupted run picks up
+where it stopped:
+
+    python backfill.py mlb 2024-03-20 2024-10-01
+    python backfill.py nba 2024-10-22 2025-04-13 --workers 4 --rate 2 --archive
+
+--base-url points the fetch at another server (a local stand-in serving
+.../<sport>/<league>/scoreboard?dates=YYYYMMDD) and --archive also records
+the final games in the season archive (see archive.py).
+"""
+import argparse
+import gzip
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, timedelta
+
+import supervisor
+
+try:
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+except NameError:
+    # Fallback for interactive environments
+    script_dir = os.getcwd()
+
+BASE_URL = "http://site.api.espn.com/apis/site/v2/sports"
+BACKFILL_DIR = os.path.join(script_dir, "output", "backfill")
+LEAGUES = {
+    'mlb': 'baseball', 'nba': 'basketball', 'wnba': 'basketball',
+    'nfl': 'football', 'nhl': 'hockey',
+}
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3",
+}
+WORKERS = 8
+REQUESTS_PER_SECOND = 5
+MAX_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 1
+RETRY_MAX_SECONDS = 30
+TIMEOUT_SECONDS = 15
+CHECKPOINT_EVERY = 25  # days done between checkpoint writes
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def scoreboard_url(league, base_url=BASE_URL):
+    return f"{base_url.rstrip('/')}/{LEAGUES[league]}/{league}/scoreboard"
+
+
+def date_range(start, end):
+    """Every date from `start` through `end` (dates or 'YYYY-MM-DD')."""
+    start, end = (date.fromisoformat(d) if isinstance(d, str) else d for d in (start, end))
+    return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+
+def snapshot_path(directory, day):
+    return os.path.join(directory, day.strftime('%Y%m%d') + ".json.gz")
+
+
+def write_snapshot(path, payload):
+    tmp_path = path + ".tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def snapshots(directory):
+    """(date, payload) of every snapshot in a backfill directory, oldest first."""
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".json.gz"):
+            stem = name[:-len(".json.gz")]
+            yield date(int(stem[:4]), int(stem[4:6]), int(stem[6:])), read_snapshot(os.path.join(directory, name))
+
+
+class RateLimiter:
+    """Token bucket shared by all workers: at most `rate` requests per second, bursts of `burst`."""
+
+    def __init__(self, rate=REQUESTS_PER_SECOND, burst=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = self.burst
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = self.clock()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_seconds = (1 - self.tokens) / self.rate
+            self.sleep(wait_seconds)
+
+
+class Checkpoint:
+    """The days of a backfill that are done, saved next to the snapshots."""
+
+    def __init__(self, path):
+        self.path = path
+        self.done = set()
+        self.failed = {}
+        try:
+            with open(path) as f:
+                saved = json.load(f)
+            self.done = set(saved.get('done', []))
+        except (OSError, ValueError):
+            pass
+        self.lock = threading.Lock()
+        self._unsaved = 0
+
+    def is_done(self, day, directory):
+        # A day only counts if its snapshot is still there
+        return day.isoformat() in self.done and os.path.exists(snapshot_path(directory, day))
+
+    def mark(self, day, error=None):
+        with self.lock:
+            if error is None:
+                self.done.add(day.isoformat())
+                self.failed.pop(day.isoformat(), None)
+            else:
+                self.failed[day.isoformat()] = str(error)
+            self._unsaved += 1
+            if self._unsaved >= CHECKPOINT_EVERY:
+                self._save()
+
+    def save(self):
+        with self.lock:
+            self._save()
+
+    def _save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({'done': sorted(self.done), 'failed': self.failed}, f)
+        os.replace(tmp_path, self.path)
+        self._unsaved = 0
+
+
+class Backfill:
+    def __init__(self, league, directory=None, base_url=BASE_URL, workers=WORKERS,
+                 rate=REQUESTS_PER_SECOND, max_attempts=MAX_ATTEMPTS, session=None):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        if league not in LEAGUES:
+            raise ValueError(f"Unknown league {league!r} (one of {', '.join(sorted(LEAGUES))})")
+        self.league = league
+        self.url = scoreboard_url(league, base_url)
+        self.directory = directory or os.path.join(BACKFILL_DIR, league)
+        os.makedirs(self.directory, exist_ok=True)
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.limiter = RateLimiter(rate)
+        self.checkpoint = Checkpoint(os.path.join(self.directory, "checkpoint.json"))
+        if session is None:
+            # One connection pool shared by every worker (keep-alive instead of a handshake per day)
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update(HEADERS)
+        self.session = session
+        self.requests_made = 0
+
+    def fetch_day(self, day):
+        """The scoreboard payload of one day, retried with backoff on transient failures."""
+        import requests
+
+        backoff = supervisor.Backoff(RETRY_BASE_SECONDS, RETRY_MAX_SECONDS)
+        for attempt in range(1, self.max_attempts + 1):
+            self.limiter.acquire()
+            self.requests_made += 1
+            try:
+                response = self.session.get(self.url, params={'dates': day.strftime('%Y%m%d')},
+                                            timeout=TIMEOUT_SECONDS)
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    return response.json()
+                error = requests.exceptions.HTTPError(f"HTTP {response.status_code}", response=response)
+                retry_after = response.headers.get('Retry-After', '')
+                delay = float(retry_after) if retry_after.isdigit() else backoff.next_delay()
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error, delay = e, backoff.next_delay()
+            if attempt < self.max_attempts:
+                print(f"{day}: {error}; retrying in {delay:.1f} s")
+                time.sleep(delay)
+        raise error
+
+    def _fetch_and_save(self, day):
+        payload = self.fetch_day(day)
+        write_snapshot(snapshot_path(self.directory, day), payload)
+        return payload
+
+    def run(self, start, end, on_payload=None):
+        """
+        Fetches every day from `start` through `end` that is not done yet.
+        on_payload(day, payload) is called on the calling thread as days
+        complete (e.g. to archive them). Returns (fetched, failed) day counts.
+        """
+        days = [day for day in date_range(start, end) if not self.checkpoint.is_done(day, self.directory)]
+        skipped = len(date_range(start, end)) - len(days)
+        print(f"Backfilling {len(days)} days of {self.league.upper()} into {self.directory}"
+              + (f" ({skipped} already done)" if skipped else ""))
+        fetched = failed = reported = 0
+        started = time.monotonic()
+        pending = {}
+        remaining = iter(days)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            try:
+                while True:
+                    # Keep the queue bounded instead of submitting a whole season up front
+                    while len(pending) < 2 * self.workers:
+                        day = next(remaining, None)
+                        if day is None:
+                            break
+                        pending[pool.submit(self._fetch_and_save, day)] = day
+                    if not pending:
+                        break
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        day = pending.pop(future)
+                        try:
+                            payload = future.result()
+                        except Exception as e:
+                            failed += 1
+                            self.checkpoint.mark(day, e)
+                            print(f"{day}: failed ({e})")
+                            continue
+                        fetched += 1
+                        self.checkpoint.mark(day)
+                        if on_payload:
+                            on_payload(day, payload)
+                    if fetched // 50 > reported:
+                        reported = fetched // 50
+                        print(f"{fetched}/{len(days)} days, {fetched / (time.monotonic() - started):.1f} days/s")
+            finally:
+                for future in pending:
+                    future.cancel()
+                self.checkpoint.save()
+        print(f"Fetched {fetched} days ({self.requests_made} requests, {failed} failed) "
+              f"in {time.monotonic() - started:.1f} s")
+        return fetched, failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fetch past scoreboards of a league over a date range.")
+    parser.add_argument("league", choices=sorted(LEAGUES))
+    parser.add_argument("start", help="first day, YYYY-MM-DD")
+    parser.add_argument("end", help="last day, YYYY-MM-DD")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--rate", type=float, default=REQUESTS_PER_SECOND, help="requests per second")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--out", help="snapshot directory (default output/backfill/LEAGUE)")
+    parser.add_argument("--archive", action="store_true", help="also record the finals in the season archive")
+    args = parser.parse_args()
+
+    backfill = Backfill(args.league, args.out, args.base_url, args.workers, args.rate)
+    on_payload = None
+    if args.archive:
+        import archive
+
+        season_archive = archive.SeasonArchive()
+        on_payload = lambda day, payload: season_archive.add_slate(payload)
+    try:
+        fetched, failed = backfill.run(args.start, args.end, on_payload)
+    except KeyboardInterrupt:
+        print("Interrupted; run the same command again to resume")
+        raise SystemExit(1)
+    finally:
+        if args.archive:
+            season_archive.close()
+    raise SystemExit(1 if failed else 0)
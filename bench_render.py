@@ -0,0 +1,101 @@
+"""
+Benchmark: the scoreboard (GetNY.draw_scoreboard, see layouts.py) on a
+sequence of games, with and without saving the PNG.
+
+    python bench_render.py [frames] [scoreboard_data.json]
+
+Without a saved scoreboard a built-in sample game is used. Every state
+(pre-game, live with a changing count, final) is rendered; CPU time per
+frame is reported and the last frame of each is kept in
+output/bench_render/ for eyeballing.
+"""
+import contextlib
+import copy
+import io
+import json
+import os
+import sys
+import time
+
+import layouts
+
+
+def sample_game(state):
+    """A Yankees home game against Boston in the given state ('pre', 'in' or 'post')."""
+    names = {'pre': 'STATUS_SCHEDULED', 'in': 'STATUS_IN_PROGRESS', 'post': 'STATUS_FINAL'}
+    details = {'pre': '10/19 - 7:05 PM EDT', 'in': 'Top 7th', 'post': 'Final'}
+    game = {
+        'id': '401', 'date': '2026-10-19T23:05Z',
+        'status': {'period': 7, 'type': {'name': names[state], 'state': state, 'shortDetail': details[state],
+                                         'completed': state == 'post'}},
+        'competitors': [
+            {'id': '10', 'homeAway': 'home', 'score': '5', 'hits': 9, 'errors': 0,
+             'team': {'abbreviation': 'NYY', 'color': '0C2340', 'alternateColor': 'FFFFFF'},
+             'linescores': [{'value': v} for v in (0, 2, 0, 1, 0, 2)],
+             'probables': [{'athlete': {'displayName': 'Gerrit Cole'}, 'summary': '12-5, 3.12 ERA'}]},
+            {'id': '2', 'homeAway': 'away', 'score': '3', 'hits': 7, 'errors': 1,
+             'team': {'abbreviation': 'BOS', 'color': 'BD3039', 'alternateColor': '0C2340'},
+             'linescores': [{'value': v} for v in (1, 0, 2, 0, 0, 0, 0)],
+             'probables': [{'athlete': {'displayName': 'Brayan Bello'}, 'summary': '9-8, 4.01 ERA'}]},
+        ],
+        'odds': [{'details': 'NYY -150', 'overUnder': 8.5}],
+    }
+    if state == 'in':
+        game['situation'] = {
+            'balls': 1, 'strikes': 2, 'outs': 1, 'onFirst': True, 'onSecond': False, 'onThird': True,
+            'pitcher': {'athlete': {'displayName': 'Gerrit Cole', 'team': {'id': '10'}}},
+            'batter': {'athlete': {'displayName': 'Rafael Devers', 'team': {'id': '2'}}},
+            'lastPlay': {'id': '4010001', 'text': 'Devers singled to right, Casas to third.'},
+        }
+        game['winProbability'] = 0.71
+    return game
+
+
+def game_sequence(base, frames):
+    """`frames` polls of `base`: the count and outs move like they do in a live game."""
+    games = []
+    for i in range(frames):
+        game = copy.deepcopy(base)
+        if 'situation' in game:
+            game['situation'].update(balls=i % 4, strikes=(i // 4) % 3, outs=(i // 12) % 3)
+        games.append(game)
+    return games
+
+
+def bench(label, render, games):
+    start_cpu, start_wall = time.process_time(), time.perf_counter()
+    # Keep the "saved to" lines out of the output (and the numbers)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for game in games:
+            render(game)
+    cpu = (time.process_time() - start_cpu) / len(games)
+    wall = (time.perf_counter() - start_wall) / len(games)
+    print(f"  {label:<16} {1000 * cpu:8.1f} ms CPU/frame {1000 * wall:8.1f} ms wall/frame")
+    return cpu
+
+
+if __name__ == "__main__":
+    # Imported here: the render workers only borrow sample_game() (see render_pool.py)
+    import GetNY
+
+    OUTPUT_DIR = os.path.join(GetNY.output_dir, "bench_render")
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    states = {state: sample_game(state) for state in ('pre', 'in', 'post')}
+    if len(sys.argv) > 2:
+        with open(sys.argv[2]) as f:
+            saved = GetNY.find_game(json.load(f))
+        if saved:
+            states = {'saved': saved}
+
+    for state, game in states.items():
+        games = game_sequence(game, frames)
+        path = os.path.join(OUTPUT_DIR, f"{state}.png")
+        # One warm-up frame, so font loading and template building are not counted
+        with contextlib.redirect_stdout(io.StringIO()):
+            GetNY.draw_scoreboard(None, games[0], save_path=path)
+
+        print(f"{state}: {frames} frames")
+        bench("render + PNG", lambda g: GetNY.draw_scoreboard(None, g, save_path=path), games)
+        bench("render only", lambda g: layouts.render_scoreboard(g, GetNY.TEAM_ABBREVIATION, '00:00:00'), games)
+    print(f"Frames are in {OUTPUT_DIR}")
@@ -0,0 +1,149 @@
+"""
+Benchmark: how fetch-side work scales with the slate size and the number
+of tracked teams.
+
+    python bench_scale.py [repeats]
+
+A real slate has about 15 games, but multi-team and multi-league
+deployments multiply both the events per payload and the teams looked up
+in it. This generates synthetic scoreboard payloads of 10 to 500 events
+(live, scheduled and final games with linescores, leaders and odds, shaped
+like ESPN's) and measures per payload size:
+
+- decode: json.loads of the payload bytes,
+- lookup: finding the games of 1 to 100 tracked teams, with the indexed
+  GetNY.find_game and with the linear scan it replaced,
+- model: building what a poll builds per tracked game (the event snapshot
+  and the layout fields), which is linear in the tracked teams by nature,
+- memory: the peak tracemalloc allocation of decode + index + model.
+
+At the end the growth exponents are fitted on a log-log scale: decode
+should stay linear in the payload (~1), and the indexed lookup should
+grow far slower than the number of tracked teams (the scan grows ~1).
+"""
+import contextlib
+import io
+import json
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import GetNY
+import bench_render
+import game_events
+import layouts
+
+EVENT_COUNTS = [10, 25, 50, 100, 250, 500]
+TEAM_COUNTS = [1, 10, 50, 100]
+STATES = ('in', 'pre', 'post')
+
+
+def team_name(i):
+    return f"T{i:03d}"
+
+
+def synthetic_payload(events):
+    """An ESPN-shaped scoreboard payload with `events` games between teams T000, T001, ..."""
+    slate = []
+    for i in range(events):
+        game = bench_render.sample_game(STATES[i % len(STATES)])
+        game['id'] = str(401000000 + i)
+        for side, competitor in enumerate(game['competitors']):
+            competitor['id'] = str(2 * i + side)
+            competitor['team'] = dict(competitor['team'], abbreviation=team_name(2 * i + side),
+                                      displayName=f"Team {2 * i + side}")
+            competitor['leaders'] = [
+                {'name': category, 'leaders': [{'displayValue': str(10 + i % 7),
+                                                 'athlete': {'displayName': f"Player {i}-{side}-{category}"}}]}
+                for category in ('hits', 'homeRuns', 'RBIs')
+            ]
+        slate.append({'id': game['id'], 'date': game['date'], 'name': f"Game {i}", 'competitions': [game]})
+    return {'leagues': [{'abbreviation': 'MLB'}], 'season': {'year': 2026}, 'events': slate}
+
+
+def scan_find_game(json_data, team):
+    """The linear search find_game used before the index, for comparison."""
+    for event in json_data.get('events', []):
+        if any(team == comp.get('team', {}).get('abbreviation') for comp in event.get('competitions', [{}])[0].get('competitors', [])):
+            return event.get('competitions', [{}])[0]
+    return None
+
+
+def tracked_teams(events, count):
+    """`count` teams spread evenly over the slate, starting from its last game."""
+    step = max(1, (2 * events) // count)
+    return [team_name(2 * events - 1 - (i * step) % (2 * events)) for i in range(count)]
+
+
+def timed(function, repeats, setup=None):
+    """Best wall time of `repeats` calls of function(setup()), in seconds (setup is not timed)."""
+    best = float('inf')
+    for _ in range(repeats):
+        args = (setup(),) if setup else ()
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def build_models(games):
+    for game in games:
+        if game:
+            game_events.snapshot(game)
+            layouts.parse_game(game)
+
+
+def measure(events, teams, raw, repeats):
+    team_list = tracked_teams(events, teams)
+
+    def indexed(payload):
+        return [GetNY.find_game(payload, team) for team in team_list]
+
+    payload = json.loads(raw)
+    decode = timed(lambda: json.loads(raw), repeats)
+    # Every poll is a new payload, so the index is built on every timed call
+    index_lookup = timed(indexed, repeats, setup=lambda: json.loads(raw))
+    scan_lookup = timed(lambda: [scan_find_game(payload, team) for team in team_list], repeats)
+    games = indexed(payload)
+    model = timed(lambda: build_models(games), repeats)
+
+    tracemalloc.start()
+    build_models(indexed(json.loads(raw)))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {'decode': decode, 'index': index_lookup, 'scan': scan_lookup, 'model': model, 'peak': peak}
+
+
+def exponent(sizes, seconds):
+    """Slope of log(seconds) over log(size): ~1 is linear, ~0 is flat."""
+    return float(np.polyfit(np.log(sizes), np.log(np.maximum(seconds, 1e-9)), 1)[0])
+
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    results = {}
+    print(f"{'events':>6} {'teams':>5} {'KB':>7} {'decode ms':>10} {'index ms':>9} {'scan ms':>8} "
+          f"{'model ms':>9} {'peak KB':>8}")
+    for events in EVENT_COUNTS:
+        raw = json.dumps(synthetic_payload(events)).encode()
+        for teams in TEAM_COUNTS:
+            if teams > 2 * events:
+                continue
+            r = results[events, teams] = measure(events, teams, raw, repeats)
+            print(f"{events:>6} {teams:>5} {len(raw) / 1024:>7.0f} {1000 * r['decode']:>10.2f} "
+                  f"{1000 * r['index']:>9.3f} {1000 * r['scan']:>8.3f} {1000 * r['model']:>9.3f} "
+                  f"{r['peak'] / 1024:>8.0f}")
+
+    teams = TEAM_COUNTS[0]
+    sizes = [events for events in EVENT_COUNTS if (events, teams) in results]
+    print(f"\nDecode vs events: ~n^{exponent(sizes, [results[e, teams]['decode'] for e in sizes]):.2f}")
+    events = EVENT_COUNTS[-1]
+    counts = [t for t in TEAM_COUNTS if (events, t) in results]
+    print(f"Lookup vs tracked teams at {events} events: indexed ~n^"
+          f"{exponent(counts, [results[events, t]['index'] for t in counts]):.2f}, scan ~n^"
+          f"{exponent(counts, [results[events, t]['scan'] for t in counts]):.2f}")
+    print(f"Model vs tracked teams at {events} events: ~n^"
+          f"{exponent(counts, [results[events, t]['model'] for t in counts]):.2f}")
@@ -0,0 +1,231 @@
+"""
+Celebration animations on the live display.
+
+The only celebration used to be the static win text of the final screen.
+A CelebrationPlayer plays short overlays (a banner sliding in over a
+pulsing flash in the team's colours) when the team takes the lead or wins,
+and in baseball when it homers. The caller picks the kinds for its sport
+and their texts.
+
+The animations are made ahead of time: prepare() lines up every kind for a
+team in its colours at the window size, and they are rendered once (about
+0.2 s a kind at 1080p) in the loop's pause, then kept. The subscriber calls
+it whenever the team plays a game it has not seen, so a celebration is only
+ever queued once it is rendered. A frame is a
+few RGBA pieces with their positions, and pieces are shared between frames
+(the banner only moves, the flash has a handful of brightness levels), so
+a kind takes a few MB. Playing it is a sequence of blits over a copy of
+the drawn scoreboard.
+
+Animations only play inside the loop's pause, in place of part of it, and
+the next poll always starts on time. The rest of the pause runs as usual,
+and a poll never waits for an animation.
+"""
+import collections
+import time
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+import game_events
+import pil_render
+
+FPS = 20
+DURATION_SECONDS = 2.0
+SLIDE_FRAMES = 8           # banner slides in over these frames ...
+FADE_FRAMES = 5            # ... and fades out over the last ones
+FLASH_LEVELS = 6           # distinct brightness levels of the flash
+FLASH_WIDTH = 0.03         # flash border, as a share of the window height
+BANNER_POINTS = 72         # banner text size at the 900 px high reference frame
+MAX_QUEUED = 3
+# What rendering one animation is assumed to take before one was timed
+RENDER_SECONDS = 0.25
+HOME_RUN, LEAD, WIN = 'home_run', 'lead', 'win'
+# Default texts; {team} is the team abbreviation
+TEXTS = {HOME_RUN: "HOME RUN!", LEAD: "{team} TAKE THE LEAD", WIN: "{team} WIN"}
+
+
+def _rgb(color, fallback):
+    color = (color or fallback).lstrip('#')
+    return tuple(int(color[i:i + 2], 16) for i in (0, 2, 4)) if len(color) == 6 else _rgb(fallback, '000000')
+
+
+def is_home_run(game):
+    """True if the last play of a live game is a home run (ESPN's "... homered to ...")."""
+    plays = game.get('recentPlays') or [game.get('situation', {}).get('lastPlay') or {}]
+    text = (plays[0].get('text') or '').lower()
+    return 'homer' in text or 'home run' in text
+
+
+def celebrations_for(events, game, team, allowed=tuple(TEXTS)):
+    """The celebrations of the `allowed` kinds `team` gets for one poll's events, best first."""
+    kinds = []
+    for event in events:
+        if event.kind == game_events.FINAL and event.data.get('winner') == team:
+            kinds.append(WIN)
+        elif event.kind == game_events.SCORE and event.team == team and is_home_run(game):
+            kinds.append(HOME_RUN)
+        elif event.kind == game_events.LEAD_CHANGE and event.data.get('leader') == team:
+            kinds.append(LEAD)
+    order = [WIN, HOME_RUN, LEAD]
+    return sorted(set(kinds) & set(allowed), key=order.index)
+
+
+def render_animation(text, color, text_color, size, fps=FPS, duration=DURATION_SECONDS):
+    """
+    The frames of one celebration at canvas `size` (width, height): a list
+    with one list of (RGBA array, x, y) pieces per frame, top-left origin.
+    """
+    width, height = size
+    scale = height / pil_render.CANVAS_SIZE[1]
+    frames = int(round(fps * duration))
+
+    # Banner: the text on a rounded plate in the team colour
+    text_image, _, _ = pil_render.sprite(text, int(round(BANNER_POINTS * scale)), text_color, anchor='lt')
+    pad_x, pad_y = int(0.5 * text_image.height), int(0.3 * text_image.height)
+    banner = Image.new('RGBA', (text_image.width + 2 * pad_x, text_image.height + 2 * pad_y), (0, 0, 0, 0))
+    ImageDraw.Draw(banner).rounded_rectangle((0, 0, banner.width - 1, banner.height - 1),
+                                             radius=pad_y, fill=color + (235,))
+    banner.alpha_composite(text_image, (pad_x, pad_y))
+    banner = np.asarray(banner)
+    fades = [(banner * np.array([1, 1, 1, (i + 1) / (FADE_FRAMES + 1)])).astype(np.uint8)
+             for i in range(FADE_FRAMES)]
+    banner_x, banner_y = (width - banner.shape[1]) // 2, (height - banner.shape[0]) // 2
+
+    # Flash: a border in the team colour, pulsing between FLASH_LEVELS alphas
+    border = max(2, int(round(FLASH_WIDTH * height)))
+    levels = []
+    for level in range(FLASH_LEVELS):
+        alpha = int(200 * (level + 1) / FLASH_LEVELS)
+        horizontal = np.empty((border, width, 4), dtype=np.uint8)
+        horizontal[...] = color + (alpha,)
+        vertical = np.empty((height - 2 * border, border, 4), dtype=np.uint8)
+        vertical[...] = color + (alpha,)
+        levels.append([(horizontal, 0, 0), (horizontal, 0, height - border),
+                       (vertical, 0, border), (vertical, width - border, border)])
+
+    animation = []
+    for i in range(frames):
+        pulse = 0.5 - 0.5 * np.cos(2 * np.pi * 3 * i / frames)   # three pulses
+        fade = min(1.0, (frames - i) / (FADE_FRAMES + 1))
+        pieces = list(levels[min(FLASH_LEVELS - 1, int(pulse * fade * FLASH_LEVELS))])
+        if i < SLIDE_FRAMES:
+            eased = 1 - (1 - (i + 1) / SLIDE_FRAMES) ** 3
+            x = int(-banner.shape[1] + eased * (banner_x + banner.shape[1]))
+            pieces.append((banner, x, banner_y))
+        elif i >= frames - FADE_FRAMES:
+            pieces.append((fades[frames - 1 - i], banner_x, banner_y))
+        else:
+            pieces.append((banner, banner_x, banner_y))
+        animation.append(pieces)
+    return animation
+
+
+class CelebrationPlayer:
+    """Plays celebrations over a figure's drawn content with blitting, inside the loop's pause."""
+
+    def __init__(self, fig, kinds=tuple(TEXTS), texts=None, fps=FPS):
+        self.fig = fig
+        # Only these kinds are rendered and played
+        self.texts = {kind: (texts or {}).get(kind, TEXTS[kind]) for kind in kinds}
+        self.fps = fps
+        self.render_seconds = RENDER_SECONDS
+        self._animations = {}
+        self._to_render = collections.deque()
+        self._queue = collections.deque(maxlen=MAX_QUEUED)
+
+    def _canvas_size(self):
+        return self.fig.canvas.get_width_height(physical=True)
+
+    def _key(self, kind, team, colors):
+        return (kind, self.texts[kind].format(team=team), colors, self._canvas_size())
+
+    def prepare(self, game, team):
+        """Lines up every celebration of `team` in its colours in `game` to be rendered in the next pauses."""
+        colors = team_colors(game, team)
+        if colors is None:
+            return
+        for kind in self.texts:
+            key = self._key(kind, team, colors)
+            if key not in self._animations and key not in self._to_render:
+                self._to_render.append(key)
+
+    def _render(self, key):
+        if key[3] != self._canvas_size():
+            return
+        # The window was resized: what was rendered for the old size is no use
+        self._animations = {k: v for k, v in self._animations.items() if k[3] == key[3]}
+        start = time.perf_counter()
+        color, text_color = key[2]
+        self._animations[key] = render_animation(key[1], color, text_color, key[3], self.fps)
+        self.render_seconds = time.perf_counter() - start
+
+    def subscriber(self, team):
+        """A game event bus subscriber that queues the celebrations of `team` (team or callable)."""
+        def celebrate(events, game):
+            name = team() if callable(team) else team
+            colors = team_colors(game, name)
+            if colors is None:
+                return
+            # A new game or team: its animations get rendered in the coming pauses
+            self.prepare(game, name)
+            for kind in celebrations_for(events, game, name, self.texts)[:1]:
+                key = self._key(kind, name, colors)
+                if key in self._animations:
+                    self._queue.append((key, self._animations[key]))
+        return celebrate
+
+    def wrap(self, pause):
+        """pause(seconds) that plays queued celebrations, renders prepared ones and pauses for the rest of the time."""
+        def celebrate_then_pause(seconds):
+            deadline = time.monotonic() + seconds
+            while self._queue and deadline - time.monotonic() > 1.0 / self.fps:
+                key, animation = self._queue.popleft()
+                # Rendered for another window size: skip rather than render in the pause
+                if key[3] == self._canvas_size():
+                    self._play(animation, deadline)
+            # Render what prepare() lined up while it fits before the next poll
+            while self._to_render and deadline - time.monotonic() > 2 * self.render_seconds:
+                self._render(self._to_render.popleft())
+            return pause(max(0.001, deadline - time.monotonic()))
+        return celebrate_then_pause
+
+    def _play(self, animation, deadline):
+        canvas = self.fig.canvas
+        if not getattr(canvas, 'supports_blit', False):
+            return
+        canvas.draw()
+        background = canvas.copy_from_bbox(self.fig.bbox)
+        height = self._canvas_size()[1]
+        images = []
+        try:
+            start = time.monotonic()
+            for i, pieces in enumerate(animation):
+                if time.monotonic() >= deadline:
+                    break
+                canvas.restore_region(background)
+                for j, (array, x, y) in enumerate(pieces):
+                    if j == len(images):
+                        images.append(self.fig.figimage(array, origin='upper', zorder=100, animated=True))
+                    image = images[j]
+                    image.set_data(array)
+                    # figimage offsets count from the bottom left
+                    image.ox, image.oy = x, height - y - array.shape[0]
+                    self.fig.draw_artist(image)
+                canvas.blit(self.fig.bbox)
+                canvas.flush_events()
+                time.sleep(max(0.0, start + (i + 1) / self.fps - time.monotonic()))
+        finally:
+            for image in images:
+                image.remove()
+            canvas.restore_region(background)
+            canvas.blit(self.fig.bbox)
+
+
+def team_colors(game, team):
+    """((r, g, b) colour, (r, g, b) text colour) of `team` in `game`, or None if it does not play."""
+    for competitor in (game or {}).get('competitors', []):
+        info = competitor.get('team', {})
+        if info.get('abbreviation') == team:
+            return _rgb(info.get('color'), 'FFFFFF'), _rgb(info.get('alternateColor'), '000000')
+    return None
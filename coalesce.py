@@ -0,0 +1,76 @@
+"""
+Latest-value hand-off between the fetch and render stages.
+
+When rendering falls behind (several teams tracked, a busy machine) there is
+no point in drawing every intermediate game state one after another. This
+queue keeps only the newest value per key: putting a value for a key that is
+still waiting replaces it, and the superseded one is counted as coalesced
+without ever being rendered.
+"""
+import threading
+from collections import OrderedDict
+
+
+class LatestValueQueue:
+    """A thread-safe queue holding at most one (the newest) value per key."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        # Keys keep the position of their first unserved put, so a key that is
+        # updated on every poll cannot starve the others
+        self._pending = OrderedDict()
+        self.put_count = 0
+        self.coalesced = 0
+        self.delivered = 0
+
+    def put(self, key, value):
+        """Queues `value` for `key`, replacing a value still waiting for that key."""
+        with self._cond:
+            if key in self._pending:
+                self.coalesced += 1
+            self._pending[key] = value
+            self.put_count += 1
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """
+        Returns the oldest waiting (key, value), blocking up to `timeout`
+        seconds. Returns None if nothing arrived in time.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._pending, timeout):
+                return None
+            self.delivered += 1
+            return self._pending.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """Takes the waiting value for one specific key, if any."""
+        with self._cond:
+            if key not in self._pending:
+                return default
+            self.delivered += 1
+            return self._pending.pop(key)
+
+    def __len__(self):
+        with self._cond:
+            return len(self._pending)
+
+    def __contains__(self, key):
+        with self._cond:
+            return key in self._pending
+
+    def stats(self):
+        """Counters for sizing hardware: how much work was put in and how much was skipped."""
+        with self._cond:
+            return {
+                'put': self.put_count,
+                'coalesced': self.coalesced,
+                'delivered': self.delivered,
+                'waiting': len(self._pending),
+            }
+
+    def stats_line(self):
+        stats = self.stats()
+        share = 100.0 * stats['coalesced'] / stats['put'] if stats['put'] else 0.0
+        return (f"{stats['put']} queued, {stats['coalesced']} coalesced ({share:.0f}%), "
+                f"{stats['delivered']} delivered, {stats['waiting']} waiting")
@@ -0,0 +1,127 @@
+"""
+Hot-reloadable settings for the scoreboard scripts.
+
+The settings at the top of GetNY.py and GetNBA.py are module constants, so
+changing the team meant editing the script and restarting it, which pays
+the whole matplotlib and GUI startup and blanks the display. A
+ConfigReloader overlays a JSON file of the same names onto the module:
+
+    GetNY_config.json:  {"TEAM_ABBREVIATION": "BOS", "UPDATE_INTERVAL_SECONDS": 15}
+
+The file is read once when the script starts (every setting in it
+applies) and again whenever its modification time changes or the process
+gets SIGHUP. On a reload only the names the script declared live are
+applied; the others are reported as needing a restart. The script's
+on_change(changes) hook then updates whatever depends on the changed
+names, and everything else (the figure, templates, caches) is kept.
+
+A file that does not parse, or a value of the wrong type, is reported and
+ignored; the settings in effect stay as they were.
+"""
+import json
+import os
+import signal
+
+
+class ConfigReloader:
+    def __init__(self, module, path, live=(), validators=None, on_change=None):
+        self.module = module
+        self.path = path
+        self.live = set(live)
+        self.validators = validators or {}
+        self.on_change = on_change
+        self.values = {}
+        self._mtime = None
+        self._requested = False
+        self._loaded = False
+
+    def install_sighup(self):
+        """Makes the next check() reload on SIGHUP (call from the main thread; no-op where there is none)."""
+        if not hasattr(signal, 'SIGHUP'):
+            return False
+
+        def handler(signum, frame):
+            # Only a flag: the handler may interrupt the loop anywhere
+            self._requested = True
+        signal.signal(signal.SIGHUP, handler)
+        return True
+
+    def _file_mtime(self):
+        try:
+            return os.path.getmtime(self.path)
+        except OSError:
+            return None
+
+    def check(self):
+        """Applies the file if it is new, changed or a reload was requested; returns {name: value} applied."""
+        mtime = self._file_mtime()
+        if self._loaded and mtime == self._mtime and not self._requested:
+            return {}
+        self._requested = False
+        self._mtime = mtime
+        first = not self._loaded
+        self._loaded = True
+        if mtime is None:
+            return {}
+        try:
+            with open(self.path) as f:
+                values = json.load(f)
+            if not isinstance(values, dict):
+                raise ValueError("expected an object of setting names")
+        except (OSError, ValueError) as e:
+            print(f"Could not read {self.path}, keeping the current settings: {e}")
+            return {}
+
+        changes = {}
+        for name, raw in values.items():
+            if not name.isupper() or not hasattr(self.module, name):
+                print(f"Unknown setting {name} in {self.path}")
+                continue
+            try:
+                value = self._coerce(name, raw)
+            except (AttributeError, TypeError, ValueError) as e:
+                print(f"Ignoring {name} = {raw!r}: {e}")
+                continue
+            if value == getattr(self.module, name):
+                continue
+            if not first and name not in self.live:
+                if self.values.get(name) != raw:
+                    print(f"{name} changed in {self.path}; restart to apply it")
+                continue
+            setattr(self.module, name, value)
+            changes[name] = value
+        self.values = values
+        if changes:
+            print(f"Settings {'loaded' if first else 'reloaded'} from {self.path}: {', '.join(sorted(changes))}")
+            if self.on_change and not first:
+                self.on_change(changes)
+        return changes
+
+    def _coerce(self, name, value):
+        """`value` in the shape of the setting's current value (lists of tuples stay tuples)."""
+        current = getattr(self.module, name)
+        if current is None or value is None:
+            pass
+        elif isinstance(current, bool) or isinstance(value, bool):
+            if not isinstance(current, bool) or not isinstance(value, bool):
+                raise TypeError(f"expected {type(current).__name__}")
+        elif isinstance(current, (int, float)):
+            if not isinstance(value, (int, float)):
+                raise TypeError("expected a number")
+            if isinstance(current, float):
+                value = float(value)
+            elif isinstance(value, float):
+                if not value.is_integer():
+                    raise TypeError("expected a whole number")
+                value = int(value)
+        elif isinstance(current, (list, tuple)):
+            if not isinstance(value, list):
+                raise TypeError("expected a list")
+            if current and isinstance(current[0], tuple):
+                value = [tuple(item) if isinstance(item, list) else item for item in value]
+        elif not isinstance(value, type(current)):
+            raise TypeError(f"expected {type(current).__name__}")
+        validate = self.validators.get(name)
+        if validate:
+            validate(value)
+        return value
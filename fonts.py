@@ -0,0 +1,104 @@
+"""
+Font handling for the scoreboard scripts.
+
+Loads a bundled or configured TTF once and registers it with matplotlib
+directly, so startup never depends on matplotlib searching the system font
+directories (see FontTest.py / GetNYY1.py for the old Georgia experiments).
+The font files and their weights are resolved once per process.
+"""
+import os
+from functools import lru_cache
+
+# --- Configuration ---
+# Drop one or more TTFs (e.g. Georgia.ttf and "Georgia Bold.ttf") into the
+# fonts/ folder next to the scripts, or point SCOREBOARD_FONT at a TTF file.
+# Without either we fall back to the DejaVu Sans that ships with matplotlib.
+try:
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+except NameError:
+    # Fallback for interactive environments
+    script_dir = os.getcwd()
+
+FONT_DIR = os.path.join(script_dir, "fonts")
+FONT_ENV_VAR = "SCOREBOARD_FONT"
+FALLBACK_FONT_FILES = ["DejaVuSans.ttf", "DejaVuSans-Bold.ttf"]
+
+# matplotlib keeps its font list in a JSON cache. On the kiosks the default
+# cache location does not survive a reboot, so every cold start rebuilt it by
+# scanning the system. Keeping it next to the output makes that a one-off.
+MPL_CACHE_DIR = os.path.join(script_dir, "output", "mplconfig")
+
+def persist_font_cache(cache_dir=MPL_CACHE_DIR):
+    """
+    Points matplotlib's config/cache directory at a persistent folder.
+    Must be called before matplotlib is imported; an explicit MPLCONFIGDIR
+    in the environment always wins.
+    """
+    if "MPLCONFIGDIR" in os.environ:
+        return os.environ["MPLCONFIGDIR"]
+    os.makedirs(cache_dir, exist_ok=True)
+    os.environ["MPLCONFIGDIR"] = cache_dir
+    return cache_dir
+
+
+@lru_cache(maxsize=None)
+def font_files():
+    """Returns the TTF files to register, resolved once per process."""
+    configured = os.environ.get(FONT_ENV_VAR)
+    if configured:
+        if os.path.isfile(configured):
+            return (configured,)
+        print(f"Warning: {FONT_ENV_VAR}={configured} does not exist, using the default font.")
+
+    if os.path.isdir(FONT_DIR):
+        bundled = sorted(
+            os.path.join(FONT_DIR, name) for name in os.listdir(FONT_DIR)
+            if name.lower().endswith(".ttf")
+        )
+        if bundled:
+            return tuple(bundled)
+
+    import matplotlib as mpl
+    mpl_font_dir = os.path.join(mpl.get_data_path(), "fonts", "ttf")
+    return tuple(os.path.join(mpl_font_dir, name) for name in FALLBACK_FONT_FILES)
+
+
+@lru_cache(maxsize=None)
+def register_fonts():
+    """
+    Registers the font files with matplotlib's font manager and returns the
+    family name of the first one.
+    """
+    import matplotlib.font_manager as fm
+
+    family = None
+    for path in font_files():
+        fm.fontManager.addfont(path)
+        if family is None:
+            family = fm.get_font(path).family_name
+    return family
+
+
+def use_scoreboard_font():
+    """Registers the scoreboard font and makes it matplotlib's default family."""
+    import matplotlib as mpl
+
+    family = register_fonts()
+    mpl.rcParams['font.family'] = [family]
+    return family
+
+
+@lru_cache(maxsize=None)
+def font_file(weight='bold'):
+    """Returns the registered file closest to the requested weight."""
+    import matplotlib.font_manager as fm
+
+    wanted = fm.weight_dict.get(weight, weight) if isinstance(weight, str) else weight
+    best_path, best_delta = None, None
+    for path in font_files():
+        entry = fm.ttfFontProperty(fm.get_font(path))
+        entry_weight = fm.weight_dict.get(entry.weight, entry.weight) if isinstance(entry.weight, str) else entry.weight
+        delta = abs(entry_weight - wanted)
+        if best_delta is None or delta < best_delta:
+            best_path, best_delta = path, delta
+    return best_path
@@ -0,0 +1,269 @@
+"""
+Dirty-rectangle updates for remote displays.
+
+Instead of re-downloading the whole scoreboard.png after every change, a
+display keeps its own copy of the frame and applies small patches. The
+FramePublisher compares each new frame with the previous one as NumPy
+arrays, groups the changed pixels into rectangles and writes only those as
+PNG patches next to a manifest.json. The manifest lists the last keyframe
+(a full frame, written when too much changed or the size changed) and every
+update since, so a client that missed a few polls just applies the ones it
+has not seen yet. Sequence numbers start over with every publisher, so the
+manifest also names the publisher's run; a client that sees another run
+starts again from its keyframe.
+
+The directory can be served over HTTP with serve(); FrameClient is the
+matching client:
+
+    python frame_diff.py http://scoreboard:8766 scoreboard.png
+"""
+import io
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+TILE_SIZE = 16            # changes are located on a grid of this many pixels
+KEYFRAME_AREA = 0.5       # send a full frame when more than this share of the frame changed
+KEYFRAME_EVERY = 100      # ... or after this many patch updates
+MANIFEST = "manifest.json"
+
+
+def changed_tiles(prev, curr, tile=TILE_SIZE):
+    """Boolean grid with one entry per tile x tile block, True where any pixel differs."""
+    diff = np.any(prev != curr, axis=-1) if curr.ndim == 3 else prev != curr
+    height, width = diff.shape
+    rows, cols = -(-height // tile), -(-width // tile)
+    padded = np.zeros((rows * tile, cols * tile), dtype=bool)
+    padded[:height, :width] = diff
+    return padded.reshape(rows, tile, cols, tile).any(axis=(1, 3)), diff
+
+
+def dirty_rects(prev, curr, tile=TILE_SIZE):
+    """
+    Rectangles (x, y, w, h) that cover every pixel that differs between two
+    frames of the same shape. Runs of changed tiles on a row are merged, runs
+    spanning the same columns on consecutive rows are stacked, and each
+    rectangle is then shrunk to the changed pixels inside it.
+    """
+    tiles, diff = changed_tiles(prev, curr, tile)
+    height, width = diff.shape
+    open_runs, boxes = {}, []
+    for row in range(tiles.shape[0]):
+        runs = []
+        flags = np.concatenate(([False], tiles[row], [False]))
+        edges = np.flatnonzero(flags[1:] != flags[:-1])
+        for start, stop in zip(edges[::2], edges[1::2]):
+            runs.append((int(start), int(stop)))
+        still_open = {}
+        for run in runs:
+            top = open_runs.pop(run, row)
+            still_open[run] = top
+        for (start, stop), top in open_runs.items():
+            boxes.append((start, top, stop, row))
+        open_runs = still_open
+    for (start, stop), top in open_runs.items():
+        boxes.append((start, top, stop, tiles.shape[0]))
+
+    rects = []
+    for start, top, stop, bottom in boxes:
+        x0, y0 = start * tile, top * tile
+        x1, y1 = min(stop * tile, width), min(bottom * tile, height)
+        block = diff[y0:y1, x0:x1]
+        ys = np.flatnonzero(block.any(axis=1))
+        xs = np.flatnonzero(block.any(axis=0))
+        rects.append((x0 + int(xs[0]), y0 + int(ys[0]), int(xs[-1] - xs[0] + 1), int(ys[-1] - ys[0] + 1)))
+    return rects
+
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _png_bytes(array):
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.fromarray(array).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+class FramePublisher:
+    """Writes keyframes and dirty-rectangle patches of consecutive frames to a directory."""
+
+    def __init__(self, directory, tile=TILE_SIZE, keyframe_area=KEYFRAME_AREA, keyframe_every=KEYFRAME_EVERY):
+        self.directory = directory
+        self.tile = tile
+        self.keyframe_area = keyframe_area
+        self.keyframe_every = keyframe_every
+        os.makedirs(directory, exist_ok=True)
+        self._remove_previous_run()
+        self.run = f"{time.time_ns():x}"
+        self.prev = None
+        self.seq = 0
+        self.manifest = None
+        self._stale_files = []   # files of the keyframe before the current one
+        self.bytes_written = 0
+
+    def _remove_previous_run(self):
+        # File names are reused from seq 1 on: nothing of an earlier run may be left
+        for name in os.listdir(self.directory):
+            if name == MANIFEST or name.startswith(('key_', 'patch_')):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def publish(self, frame):
+        """Publishes a frame (an image array or PIL image); returns the bytes written for it."""
+        frame = np.array(frame.convert('RGB')) if hasattr(frame, 'convert') else np.ascontiguousarray(frame[..., :3])
+        if self.prev is not None and self.prev.shape == frame.shape and np.array_equal(self.prev, frame):
+            return 0
+        self.seq += 1
+        rects = None
+        if (self.prev is not None and self.prev.shape == frame.shape
+                and len(self.manifest['updates']) < self.keyframe_every):
+            rects = dirty_rects(self.prev, frame, self.tile)
+            if sum(w * h for _, _, w, h in rects) > self.keyframe_area * frame.shape[0] * frame.shape[1]:
+                rects = None
+        written = self._write_keyframe(frame) if rects is None else self._write_patches(frame, rects)
+        self.prev = frame
+        self.bytes_written += written
+        return written
+
+    def publish_file(self, path):
+        """Publishes a frame that was saved as an image file (e.g. scoreboard.png)."""
+        from PIL import Image
+
+        with Image.open(path) as image:
+            return self.publish(image)
+
+    def _write_keyframe(self, frame):
+        name = f"key_{self.seq}.png"
+        data = _png_bytes(frame)
+        _write_atomic(os.path.join(self.directory, name), data)
+        # Clients may still be fetching the previous keyframe's files; drop
+        # the ones from before that
+        for old in self._stale_files:
+            try:
+                os.remove(os.path.join(self.directory, old))
+            except OSError:
+                pass
+        self._stale_files = self._current_files()
+        self.manifest = {
+            'run': self.run, 'seq': self.seq, 'width': frame.shape[1], 'height': frame.shape[0],
+            'keyframe': {'seq': self.seq, 'file': name}, 'updates': [],
+        }
+        self._write_manifest()
+        return len(data)
+
+    def _write_patches(self, frame, rects):
+        patches, total = [], 0
+        for index, (x, y, w, h) in enumerate(rects):
+            name = f"patch_{self.seq}_{index}.png"
+            data = _png_bytes(frame[y:y + h, x:x + w])
+            _write_atomic(os.path.join(self.directory, name), data)
+            patches.append({'x': x, 'y': y, 'w': w, 'h': h, 'file': name})
+            total += len(data)
+        self.manifest['seq'] = self.seq
+        self.manifest['updates'].append({'seq': self.seq, 'patches': patches})
+        self._write_manifest()
+        return total
+
+    def _current_files(self):
+        if not self.manifest:
+            return []
+        files = [self.manifest['keyframe']['file']]
+        files.extend(patch['file'] for update in self.manifest['updates'] for patch in update['patches'])
+        return files
+
+    def _write_manifest(self):
+        _write_atomic(os.path.join(self.directory, MANIFEST), json.dumps(self.manifest).encode())
+
+
+def serve(directory, port, host=''):
+    """Serves the publisher's directory over HTTP from a background thread."""
+    import functools
+    import threading
+    from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+    class QuietHandler(SimpleHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), functools.partial(QuietHandler, directory=directory))
+    threading.Thread(target=server.serve_forever, name="frame-diff-server", daemon=True).start()
+    print(f"Serving frame updates from {directory} on port {port}")
+    return server
+
+
+class FrameClient:
+    """Keeps a copy of the published frame up to date from a directory or http(s) URL."""
+
+    def __init__(self, source, timeout=10):
+        self.source = source.rstrip('/')
+        self.timeout = timeout
+        self.frame = None
+        self.run = None
+        self.seq = 0
+        self.bytes_received = 0
+
+    def _read(self, name):
+        if self.source.startswith(('http://', 'https://')):
+            import requests
+
+            response = requests.get(f"{self.source}/{name}", timeout=self.timeout)
+            response.raise_for_status()
+            data = response.content
+        else:
+            with open(os.path.join(self.source, name), 'rb') as f:
+                data = f.read()
+        self.bytes_received += len(data)
+        return data
+
+    def _image(self, name):
+        from PIL import Image
+
+        return Image.open(io.BytesIO(self._read(name))).convert('RGB')
+
+    def sync(self):
+        """Applies every update published since the last sync; returns True if the frame changed."""
+        manifest = json.loads(self._read(MANIFEST))
+        run = manifest.get('run')
+        if manifest['seq'] == self.seq and run == self.run and self.frame is not None:
+            return False
+        keyframe = manifest['keyframe']
+        # A restarted publisher counts from 1 again: its updates are not newer than ours
+        if (self.frame is None or run != self.run or manifest['seq'] < self.seq or self.seq < keyframe['seq']
+                or self.frame.size != (manifest['width'], manifest['height'])):
+            self.frame = self._image(keyframe['file'])
+            self.run = run
+            self.seq = keyframe['seq']
+        for update in manifest['updates']:
+            if update['seq'] <= self.seq:
+                continue
+            for patch in update['patches']:
+                self.frame.paste(self._image(patch['file']), (patch['x'], patch['y']))
+            self.seq = update['seq']
+        return True
+
+
+if __name__ == "__main__":
+    # python frame_diff.py SOURCE OUTPUT.png [interval seconds]
+    if len(sys.argv) < 3:
+        sys.exit("usage: python frame_diff.py SOURCE OUTPUT.png [interval]")
+    client = FrameClient(sys.argv[1])
+    interval = float(sys.argv[3]) if len(sys.argv) > 3 else 2.0
+    while True:
+        try:
+            if client.sync():
+                client.frame.save(sys.argv[2])
+                print(f"Frame {client.seq} applied ({client.bytes_received} bytes received so far)")
+        except Exception as e:
+            print(f"Could not sync frame updates: {e}")
+        time.sleep(interval)
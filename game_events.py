@@ -0,0 +1,207 @@
+"""
+Typed change events between consecutive polls of a game.
+
+Every poll used to be handled as a brand-new world. The GameEventEngine
+keeps the previous state of the game, compares it with the new one and
+publishes what changed (runs/baskets scored, lead changes, a new inning or
+quarter, a new batter or pitcher, status transitions, the final) on an
+EventBus. Renderers, loggers and pushers subscribe to the kinds they care
+about and are simply not called when nothing they care about happened.
+"""
+from collections import namedtuple
+
+# --- Event kinds ---
+SCORE = 'score'                  # data: points, score
+LEAD_CHANGE = 'lead_change'      # data: leader (team abbreviation), previous leader
+PERIOD_CHANGE = 'period_change'  # inning/quarter/period; data: period, previous
+NEW_BATTER = 'new_batter'        # MLB only; data: name
+NEW_PITCHER = 'new_pitcher'      # MLB only; data: name, team
+STATUS_CHANGE = 'status_change'  # data: status, previous (None when the game (dis)appears)
+FINAL = 'final'                  # data: winner, away/home scores
+UPDATE = 'update'                # anything else on the scoreboard changed (count, hits, leaders, ...)
+
+ALL_KINDS = (SCORE, LEAD_CHANGE, PERIOD_CHANGE, NEW_BATTER, NEW_PITCHER, STATUS_CHANGE, FINAL, UPDATE)
+
+GameEvent = namedtuple('GameEvent', ['kind', 'game_id', 'team', 'data'])
+
+_NO_STATE = object()
+
+
+def _int(value, default=0):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return default
+
+
+def snapshot(game):
+    """Reduces a game (an ESPN competition dict) to the fields the diff looks at."""
+    if not game:
+        return None
+    status = game.get('status', {})
+    status_type = status.get('type', {})
+    competitors = game.get('competitors', [])
+    away = next((c for c in competitors if c.get('homeAway') == 'away'), {})
+    home = next((c for c in competitors if c.get('homeAway') == 'home'), {})
+    sit = game.get('situation', {}) or {}
+    pitcher = sit.get('pitcher', {}).get('athlete', {})
+    batter = sit.get('batter', {}).get('athlete', {})
+
+    away_score = _int(away.get('score'))
+    home_score = _int(home.get('score'))
+    away_team = away.get('team', {}).get('abbreviation')
+    home_team = home.get('team', {}).get('abbreviation')
+    if away_score > home_score:
+        leader = away_team
+    elif home_score > away_score:
+        leader = home_team
+    else:
+        leader = None
+
+    return {
+        'id': game.get('id'),
+        'status': status_type.get('name'),
+        'completed': bool(status_type.get('completed')),
+        'period': _int(status.get('period')),
+        'away_team': away_team,
+        'home_team': home_team,
+        'away_score': away_score,
+        'home_score': home_score,
+        'leader': leader,
+        'pitcher': pitcher.get('displayName'),
+        'pitcher_team': pitcher.get('team', {}).get('id'),
+        'batter': batter.get('displayName'),
+        'last_play_id': sit.get('lastPlay', {}).get('id'),
+    }
+
+
+def diff(prev, curr, prev_game=None, curr_game=None, last_leader=None):
+    """
+    Returns the list of GameEvents that turn snapshot `prev` into `curr`.
+    Pass the raw games as well to get an UPDATE event for changes the typed
+    events do not cover.
+    """
+    if curr is None:
+        if prev is None:
+            return []
+        return [GameEvent(STATUS_CHANGE, prev['id'], None, {'status': None, 'previous': prev['status']})]
+    game_id = curr['id']
+    if prev is None or prev['id'] != game_id:
+        # A new game: everything about it is news
+        return [GameEvent(STATUS_CHANGE, game_id, None, {'status': curr['status'], 'previous': None})]
+
+    events = []
+    if curr['status'] != prev['status']:
+        events.append(GameEvent(STATUS_CHANGE, game_id, None, {'status': curr['status'], 'previous': prev['status']}))
+    if curr['period'] != prev['period'] and curr['period']:
+        events.append(GameEvent(PERIOD_CHANGE, game_id, None, {'period': curr['period'], 'previous': prev['period']}))
+
+    for side in ('away', 'home'):
+        points = curr[f'{side}_score'] - prev[f'{side}_score']
+        if points > 0:
+            events.append(GameEvent(SCORE, game_id, curr[f'{side}_team'], {'points': points, 'score': curr[f'{side}_score']}))
+
+    previous_leader = last_leader if last_leader is not None else prev['leader']
+    if curr['leader'] and previous_leader and curr['leader'] != previous_leader:
+        events.append(GameEvent(LEAD_CHANGE, game_id, curr['leader'], {'leader': curr['leader'], 'previous': previous_leader}))
+
+    if curr['pitcher'] and curr['pitcher'] != prev['pitcher']:
+        events.append(GameEvent(NEW_PITCHER, game_id, None, {'name': curr['pitcher'], 'team': curr['pitcher_team']}))
+    if curr['batter'] and curr['batter'] != prev['batter']:
+        events.append(GameEvent(NEW_BATTER, game_id, None, {'name': curr['batter']}))
+
+    if curr['completed'] and not prev['completed']:
+        events.append(GameEvent(FINAL, game_id, curr['leader'], {
+            'winner': curr['leader'], 'away_score': curr['away_score'], 'home_score': curr['home_score'],
+        }))
+
+    if not events and prev_game is not None and curr_game is not None and prev_game != curr_game:
+        events.append(GameEvent(UPDATE, game_id, None, {}))
+    return events
+
+
+class EventBus:
+    """
+    Delivers the events of one poll to subscribers. A subscriber is called
+    once per poll with the matching events and the current game, and only if
+    at least one event matches its kinds.
+    """
+
+    def __init__(self):
+        self._subscribers = []
+
+    def subscribe(self, callback, kinds=None):
+        """Calls `callback(events, game)` for polls with events of `kinds` (default: all kinds)."""
+        self._subscribers.append((callback, frozenset(kinds) if kinds else None))
+        return callback
+
+    def unsubscribe(self, callback):
+        self._subscribers = [(cb, kinds) for cb, kinds in self._subscribers if cb is not callback]
+
+    def publish(self, events, game):
+        for callback, kinds in self._subscribers:
+            matching = events if kinds is None else [e for e in events if e.kind in kinds]
+            if matching:
+                callback(matching, game)
+
+
+class GameEventEngine:
+    """Remembers the previous poll of one game and publishes the differences."""
+
+    def __init__(self, bus=None):
+        self.bus = bus or EventBus()
+        self.reset()
+
+    def reset(self):
+        """Forgets the previous poll, so the next update is reported as a new game."""
+        self._prev = _NO_STATE
+        self._prev_game = None
+        self._last_leader = None
+
+    def update(self, game):
+        """Diffs `game` against the previous poll, publishes the events and returns them."""
+        curr = snapshot(game)
+        if self._prev is _NO_STATE:
+            events = [GameEvent(STATUS_CHANGE, curr and curr['id'], None,
+                                {'status': curr and curr['status'], 'previous': None})]
+        else:
+            events = diff(self._prev, curr, self._prev_game, game, self._last_leader)
+
+        prev = None if self._prev is _NO_STATE else self._prev
+        if curr is None or prev is None or prev['id'] != curr['id']:
+            self._last_leader = None
+        if curr and curr['leader']:
+            self._last_leader = curr['leader']
+        self._prev, self._prev_game = curr, game
+
+        if events:
+            try:
+                self.bus.publish(events, game)
+            except Exception:
+                # A subscriber failed (e.g. a render crashed); report everything
+                # again on the next poll so it gets another chance
+                self.reset()
+                raise
+        return events
+
+
+def describe(event):
+    """A one-line, human readable description of an event, for logs."""
+    data = event.data
+    if event.kind == SCORE:
+        return f"{event.team} scores {data['points']} (now {data['score']})"
+    if event.kind == LEAD_CHANGE:
+        return f"Lead change: {data['leader']} ahead of {data['previous']}"
+    if event.kind == PERIOD_CHANGE:
+        return f"Period {data['period']} started"
+    if event.kind == NEW_BATTER:
+        return f"Now batting: {data['name']}"
+    if event.kind == NEW_PITCHER:
+        return f"Now pitching: {data['name']}"
+    if event.kind == STATUS_CHANGE:
+        if data['status'] is None:
+            return "No game on the scoreboard"
+        return f"Status: {data['previous'] or 'new game'} -> {data['status']}"
+    if event.kind == FINAL:
+        return f"Final: {data['away_score']}-{data['home_score']}, {data['winner'] or 'tie'}"
+    return "Scoreboard updated"
@@ -0,0 +1,562 @@
+"""
+Declarative scoreboard layouts, compiled once into render plans.
+
+The scoreboards of the sports differ in the linescore columns, a few
+bboxes and font sizes and which live panels appear, so each sport is a
+spec rather than its own drawing function: per game state
+('pre', 'live', 'final', 'other'), a list of tables (bbox in axes
+coordinates, column widths, rows, font size, header labels, cell fills and
+edges) and texts whose contents and colours are bindings, dotted paths into
+the fields parse_game() extracts from an ESPN competition ('away.score',
+'home.periods.3', 'odds.away', ...). A few drawings that are not tables
+(MLB's last play, the win-probability meter, the winner banner, the score
+timeline) are named panels.
+
+compile_layout() turns a spec into a plan once: cell rectangles are
+resolved to pixels, bindings to getter functions, and everything that only
+depends on the two teams (fills in team colours, header labels, the team
+abbreviations) is separated out for the cached template, so a frame is a
+template copy plus the dynamic texts. Every sport renders through the same
+LayoutScoreboard on pil_render's templates and text sprites; adding a
+sport is adding a spec to SPORTS.
+"""
+import textwrap
+from collections import namedtuple
+
+from PIL import Image, ImageDraw
+
+import pil_render
+import standings
+import upstream
+from pil_render import Table, axes_point, paste_lines, paste_text, px, sprite, wrap
+
+HEADER_COLOR = '#AAAAAA'
+CELL_COLOR = '#444444'
+RHE_COLOR = '#5A5A5A'
+MATCHUP_COLOR = '#555555'
+STATUS_COLOR = '#26FF00'
+FOOTER_COLOR = '#808080'
+FOOTER_POINTS = 12
+MAX_TEMPLATES = 32
+
+# The top-level fields of parse_game(); bindings start with one of these
+FIELD_ROOTS = {'status', 'away', 'home', 'odds', 'situation', 'matchup', 'form', 'recent_plays',
+               'last_play', 'win_probability'}
+# Bindings that only change with the teams; cells bound to them go into the template
+TEMPLATE_PATHS = {'away.abbr', 'away.color', 'away.alt', 'home.abbr', 'home.color', 'home.alt'}
+
+STATES = {'STATUS_SCHEDULED': 'pre', 'STATUS_IN_PROGRESS': 'live', 'STATUS_FINAL': 'final'}
+
+
+# --- Spec helpers ---
+
+def table(bbox, col_widths, rows, fontsize, labels=None, label_color=HEADER_COLOR,
+          fills=(), edges=(), cells=(), when=None):
+    """
+    A table element. fills/edges are (rows, cols, colour) with rows and
+    cols an int or a range; cells are (row, col, binding, colour). `when`
+    is a binding that must be truthy for the table to be drawn.
+    """
+    return {'kind': 'table', 'table': Table(tuple(bbox), tuple(col_widths), rows, fontsize),
+            'labels': labels, 'label_color': label_color, 'fills': list(fills), 'edges': list(edges),
+            'cells': list(cells), 'when': when}
+
+
+def text(binding, xy, fontsize, color='white', anchor='mm', when=None):
+    """A single text at `xy` in axes coordinates."""
+    return {'kind': 'text', 'binding': binding, 'xy': xy, 'fontsize': fontsize, 'color': color,
+            'anchor': anchor, 'when': when}
+
+
+def team_cells(rows, col, binding, color='white'):
+    """(row, col, 'away.<binding>'), (row, col, 'home.<binding>') for the away and home rows."""
+    return [(row, col, f"{side}.{binding}", color.format(side=side))
+            for row, side in zip(rows, ('away', 'home'))]
+
+
+def linescore(bbox, col_widths, periods, totals, fontsize=38, fill=CELL_COLOR, total_fill=None,
+              edge='black', edge_totals=False, label_color=HEADER_COLOR):
+    """The linescore table: a team column, `periods` period columns and (label, binding) totals."""
+    columns = 1 + periods + len(totals)
+    labels = [''] + [str(p) for p in range(1, periods + 1)] + [label for label, _ in totals]
+    fills = [(range(3), range(columns), fill)]
+    if total_fill:
+        fills.append((range(3), range(periods + 1, columns), total_fill))
+    fills += [(1, 0, 'away.color'), (2, 0, 'home.color')]
+    cells = team_cells((1, 2), 0, 'abbr', '{side}.alt')
+    for p in range(periods):
+        cells += team_cells((1, 2), p + 1, f'periods.{p}')
+    for i, (_, binding) in enumerate(totals):
+        cells += team_cells((1, 2), periods + 1 + i, binding)
+    return table(bbox, col_widths, 3, fontsize, labels, label_color, fills,
+                 [(range(1, 3), range(1, (columns if edge_totals else periods + 1)), edge)], cells)
+
+
+def pre_game_table():
+    return table((0.2, 0.65, 0.6, 0.4), (0.3, 0.4, 0.3), 3, 32, ["Team", "Status", "Odds"], 'white',
+                 fills=[(range(1, 3), range(3), CELL_COLOR), (1, 0, 'away.color'), (2, 0, 'home.color')],
+                 cells=team_cells((1, 2), 0, 'abbr', '{side}.alt')
+                 + [(1, 1, 'status.start_time', 'white'), (1, 2, 'odds.away', 'white'), (2, 2, 'odds.home', 'white')])
+
+
+def form_table(bbox, fontsize):
+    cells = [(row, col, f'form.{row - 1}.{col}', f'{side}.alt' if col == 0 else 'white')
+             for row, side in ((1, 'away'), (2, 'home')) for col in range(len(standings.FORM_COLUMNS))]
+    return table(bbox, (0.16,) + (0.14,) * 6, 3, fontsize, standings.FORM_COLUMNS,
+                 fills=[(1, 0, 'away.color'), (2, 0, 'home.color')], cells=cells, when='form')
+
+
+def post_game_table():
+    return table((0.35, 0.3, 0.3, 0.25), (0.3, 0.2, 0.4), 2, 30,
+                 fills=[(range(2), range(3), CELL_COLOR), (0, 0, 'away.color'), (1, 0, 'home.color')],
+                 cells=team_cells((0, 1), 0, 'abbr', '{side}.alt') + team_cells((0, 1), 1, 'score')
+                 + [(0, 2, 'status.detail', 'white')])
+
+
+def leaders_table(bbox, categories, fontsize=18):
+    """One column per leader category (label, name), a row per team (and an empty one, like GetNBA's)."""
+    fills = [(range(4), range(len(categories)), MATCHUP_COLOR),
+             (1, range(len(categories)), 'away.color'), (2, range(len(categories)), 'home.color')]
+    cells = [cell for col, (_, name) in enumerate(categories)
+             for cell in team_cells((1, 2), col, f'leaders.{name}', '{side}.alt')]
+    return table(bbox, (0.3,) * len(categories), 4, fontsize, [label for label, _ in categories],
+                 fills=fills, cells=cells)
+
+
+# --- Sport specs ---
+
+def _mlb():
+    lines = linescore((0.05, 0.6, 0.9, 0.35), (0.2,) + (0.05,) * 12, 9,
+                      [('R', 'score'), ('H', 'hits'), ('E', 'errors')], total_fill=RHE_COLOR)
+    pitchers = table((0.25, 0.375, 0.5, 0.25), (0.5, 0.5), 3, 18, ["Away Starter", "Home Starter"],
+                     fills=[(1, 0, 'away.color'), (1, 1, 'home.color')],
+                     cells=[(1, 0, 'away.probable.name', 'away.alt'), (1, 1, 'home.probable.name', 'home.alt'),
+                            (2, 0, 'away.probable.stats', 'white'), (2, 1, 'home.probable.stats', 'white')])
+    matchup = table((0.25, 0.4, 0.5, 0.15), (0.3, 0.3), 2, 24, ["Pitching", "At Bat"],
+                    fills=[(0, range(2), MATCHUP_COLOR), (1, 0, 'matchup.pitcher.color'),
+                           (1, 1, 'matchup.batter.color')],
+                    cells=[(1, 0, 'matchup.pitcher.name', 'matchup.pitcher.alt'),
+                           (1, 1, 'matchup.batter.name', 'matchup.batter.alt')])
+    count = table((0.0, 0.2, 0.5, 0.15), (1.0,), 2, 20,
+                  cells=[(0, 0, 'situation.bases', 'white'), (1, 0, 'situation.count', 'white')])
+    return {
+        'pre': [pre_game_table(), pitchers, form_table((0.15, 0.05, 0.7, 0.25), 18)],
+        'live': [lines, matchup, count],
+        'final': [lines, post_game_table()],
+        'other': [lines],
+        'panels': {'live': ['last_play', 'win_probability', 'timeline'],
+                   'final': ['winner', 'timeline'], 'other': ['timeline']},
+    }
+
+
+def _quarters(period_labels, total_label, live, live_panels=()):
+    """Basketball/football/hockey: a period linescore with a total and the status line above it."""
+    periods = len(period_labels)
+    lines = linescore((0.075, 0.55, 0.85, 0.35), (0.20,) + (0.15,) * (periods + 1), periods,
+                      [(total_label, 'score')], fill='#3D3D3D', edge='#555555', edge_totals=True,
+                      label_color='#CBCBCB')
+    lines['labels'] = [''] + list(period_labels) + [total_label]
+    status = text('status.detail', (0.5, 1.0), 38, STATUS_COLOR, anchor='mt')
+    return {
+        'pre': [pre_game_table(), form_table((0.15, 0.3, 0.7, 0.25), 22)],
+        'live': [lines, status] + live,
+        'final': [lines, status, post_game_table()],
+        'other': [lines, status],
+        'panels': {'live': list(live_panels) + ['timeline'], 'final': ['winner', 'timeline'], 'other': ['timeline']},
+    }
+
+
+def _nba():
+    return _quarters(['1', '2', '3', '4'], 'TOT', [leaders_table((0.25, 0.1, 0.6, 0.3), [
+        ("Points", 'points'), ("Assists", 'assists'), ("Rebounds", 'rebounds')])])
+
+
+def _nfl():
+    situation = table((0.05, 0.2, 0.5, 0.15), (1.0,), 2, 24,
+                      cells=[(0, 0, 'situation.downDistanceText', 'white'),
+                             (1, 0, 'situation.possessionText', HEADER_COLOR)])
+    return _quarters(['1', '2', '3', '4'], 'TOT', [situation], live_panels=['last_play'])
+
+
+def _nhl():
+    # The fourth linescore entry is overtime
+    return _quarters(['1', '2', '3', 'OT'], 'T', [leaders_table((0.25, 0.1, 0.6, 0.3), [
+        ("Goals", 'goals'), ("Assists", 'assists'), ("Points", 'points')])])
+
+
+SPORTS = {'mlb': _mlb, 'nba': _nba, 'wnba': _nba, 'nfl': _nfl, 'nhl': _nhl}
+
+
+# --- Game fields ---
+
+def _odds(game, away_team, home_team):
+    away_odds, home_odds = 'N/A', 'N/A'
+    odds_container = game.get('odds')
+    if isinstance(odds_container, list) and odds_container:
+        odds_data = odds_container[0]
+        away_odds = odds_data.get('details', 'N/A')
+        home_odds = odds_data.get('overUnder', 'N/A')
+        if (away_odds == 'N/A' or home_odds == 'N/A') and 'details' in odds_data:
+            parts = odds_data['details'].split(' ')
+            if len(parts) == 2:
+                if parts[0] == away_team: away_odds = parts[1]
+                elif parts[0] == home_team: home_odds = parts[1]
+    if str(away_odds).upper() == 'EVEN': away_odds = 100
+    if str(home_odds).upper() == 'EVEN': home_odds = 100
+    fmt = lambda odds: f"+{odds}" if isinstance(odds, (int, float)) and odds > 0 else str(odds)
+    return fmt(away_odds), fmt(home_odds)
+
+
+def _start_time(status_detail):
+    time_part = ""
+    if ' - ' in status_detail:
+        time_part = status_detail.split(' - ')[1].strip()
+    elif ',' in status_detail:
+        time_part = status_detail.split(',')[1].strip()
+    return ' '.join(time_part.split(' ')[:-1]) if time_part else status_detail
+
+
+def _bases(sit):
+    runners = [name for key, name in (('onFirst', '1st'), ('onSecond', '2nd'), ('onThird', '3rd')) if sit.get(key)]
+    if not runners:
+        return "Bases Empty"
+    if len(runners) == 3:
+        return "Bases Loaded"
+    return f"{'Runner on' if len(runners) == 1 else 'Runners on'} {' & '.join(runners)}"
+
+
+def _leaders(comp):
+    leaders = {}
+    for category in comp.get('leaders', []) or []:
+        name = category.get('name') or category.get('type', {}).get('name')
+        if name and category.get('leaders'):
+            top = category['leaders'][0]
+            leaders[name] = f"{top.get('athlete', {}).get('displayName', 'N/A')} ({top.get('value', 0)})"
+    return leaders
+
+
+def _side(comp):
+    team = comp.get('team', {})
+    probables = comp.get('probables', [])
+    return {
+        'id': comp.get('id'),
+        'abbr': team.get('abbreviation', 'N/A'),
+        'color': f"#{team.get('color', 'FFFFFF')}",
+        'alt': f"#{team.get('alternateColor', '000000')}",
+        'score': str(comp.get('score', '')),
+        'hits': str(comp.get('hits', '')),
+        'errors': str(comp.get('errors', '')),
+        'periods': [str(int(score.get('value', 0))) for score in comp.get('linescores', [])],
+        'probable': {'name': probables[0].get('athlete', {}).get('displayName', 'TBD') if probables else 'TBD',
+                     'stats': probables[0].get('summary', '') if probables else ''},
+        'leaders': _leaders(comp),
+    }
+
+
+def parse_game(game):
+    """The fields the layouts bind to, extracted once per frame from an ESPN competition."""
+    status_type = game.get('status', {}).get('type', {})
+    status_detail = status_type.get('shortDetail', 'TBD')
+    competitors = game.get('competitors', [])
+    away = _side(next((c for c in competitors if c.get('homeAway') == 'away'), {}))
+    home = _side(next((c for c in competitors if c.get('homeAway') == 'home'), {}))
+    away_odds, home_odds = _odds(game, away['abbr'], home['abbr'])
+    sit = game.get('situation', {}) or {}
+    outs = sit.get('outs', 0)
+
+    def player(role):
+        athlete = sit.get(role, {}).get('athlete', {})
+        side = home if athlete.get('team', {}).get('id') == home['id'] else away
+        return {'name': athlete.get('displayName', 'N/A'), 'color': side['color'], 'alt': side['alt']}
+
+    return {
+        'status': {'name': status_type.get('name'), 'detail': status_detail, 'start_time': _start_time(status_detail)},
+        'away': away, 'home': home,
+        'odds': {'away': away_odds, 'home': home_odds},
+        'situation': dict(sit, bases=f"Bases: {_bases(sit)}",
+                          count=f"{'1 Out' if outs == 1 else f'{outs} Outs'}   |   {sit.get('balls', 0)}-{sit.get('strikes', 0)}"),
+        'matchup': {'pitcher': player('pitcher'), 'batter': player('batter')},
+        'form': standings.form_rows(game, away['abbr'], home['abbr']),
+        'recent_plays': game.get('recentPlays'),
+        'last_play': sit.get('lastPlay', {}).get('text', 'N/A'),
+        'win_probability': game.get('winProbability'),
+    }
+
+
+# --- Compilation ---
+
+Element = namedtuple('Element', ['when', 'fills', 'edges', 'texts', 'dynamic_fills', 'dynamic_texts'])
+StatePlan = namedtuple('StatePlan', ['elements', 'panels'])
+
+
+def binding(path):
+    """(getter, is_template) for a dotted path into the fields; anything else is a literal."""
+    if not isinstance(path, str) or path.split('.')[0] not in FIELD_ROOTS:
+        return (lambda fields: path), True
+    keys = [int(key) if key.isdigit() else key for key in path.split('.')]
+
+    def get(fields):
+        value = fields
+        for key in keys:
+            try:
+                value = value[key]
+            except (KeyError, IndexError, TypeError):
+                return ''
+        return value if value is not None else ''
+    return get, path in TEMPLATE_PATHS
+
+
+def _span(value):
+    return value if isinstance(value, range) else (value,)
+
+
+def _center(box):
+    return (box[0] + box[2]) / 2.0, (box[1] + box[3]) / 2.0
+
+
+def compile_element(spec):
+    when = binding(spec['when'])[0] if spec['when'] else None
+    fills, edges, texts, dynamic_fills, dynamic_texts = [], [], [], [], []
+    if spec['kind'] == 'text':
+        get, static = binding(spec['binding'])
+        color, static_color = binding(spec['color'])
+        entry = (axes_point(*spec['xy']), spec['fontsize'], get, color, spec['anchor'])
+        (texts if static and static_color else dynamic_texts).append(entry)
+        return Element(when, fills, edges, texts, dynamic_fills, dynamic_texts)
+
+    tbl = spec['table']
+    cells = pil_render.table_cells(tbl)
+    # A later fill of the same cell replaces the earlier one in place, so
+    # shared cell borders are painted in the same order as without it
+    cell_fills = {}
+    for rows, cols, color in spec['fills']:
+        for r in _span(rows):
+            for c in _span(cols):
+                cell_fills[r, c] = binding(color)
+    for (r, c), (get, static) in cell_fills.items():
+        (fills if static else dynamic_fills).append((cells[r][c], get))
+    for rows, cols, color in spec['edges']:
+        edges += [(cells[r][c], color) for r in _span(rows) for c in _span(cols)]
+    for c, label in enumerate(spec['labels'] or []):
+        texts.append((_center(cells[0][c]), tbl.fontsize, lambda fields, label=label: label,
+                      lambda fields: spec['label_color'], 'mm'))
+    for r, c, path, color in spec['cells']:
+        get, static = binding(path)
+        color_get, static_color = binding(color)
+        entry = (_center(cells[r][c]), tbl.fontsize, get, color_get, 'mm')
+        (texts if static and static_color else dynamic_texts).append(entry)
+    return Element(when, fills, edges, texts, dynamic_fills, dynamic_texts)
+
+
+def compile_layout(spec):
+    """{state: StatePlan} for a sport spec (see SPORTS)."""
+    panels = spec.get('panels', {})
+    return {state: StatePlan(tuple(compile_element(e) for e in spec[state]), tuple(panels.get(state, ())))
+            for state in ('pre', 'live', 'final', 'other')}
+
+
+_plans = {}
+
+
+def plan_for(sport):
+    """The compiled plan of a sport, compiled on first use and kept for the process."""
+    plan = _plans.get(sport)
+    if plan is None:
+        if sport not in SPORTS:
+            raise ValueError(f"No layout for {sport!r} (one of {', '.join(sorted(SPORTS))})")
+        plan = _plans[sport] = compile_layout(SPORTS[sport]())
+    return plan
+
+
+# --- Rendering ---
+
+class LayoutScoreboard:
+    """Renders scoreboard frames of one sport from its compiled plan, cached templates and text sprites."""
+
+    def __init__(self, sport='mlb', title='DC SCOREBOARD', title_suffix='HYPE', win_text='YANKEES WIN',
+                 no_game_text='And The Mets Still Suck'):
+        self.sport = sport
+        self.plan = plan_for(sport)
+        self.title = title
+        self.title_suffix = title_suffix
+        self.win_text = win_text
+        self.no_game_text = no_game_text
+        self._templates = {}
+        self._timeline_limits = {}
+        self.template_builds = 0
+
+    def template(self, key, build):
+        """The cached template for `key`, built with `build(frame)` the first time."""
+        frame = self._templates.get(key)
+        if frame is None:
+            if len(self._templates) >= MAX_TEMPLATES:
+                self._templates.clear()
+            frame = Image.new('RGB', pil_render.CANVAS_SIZE, pil_render.BACKGROUND)
+            build(frame)
+            self._templates[key] = frame
+            self.template_builds += 1
+        return frame
+
+    def _title(self, frame, lines):
+        # matplotlib puts the baseline of the last title line TITLE_PAD above the axes
+        x, axes_top = axes_point(0.5, 1.0)
+        baseline = axes_top - pil_render.TITLE_PAD_POINTS * pil_render.DPI / 72.0
+        step = sum(pil_render.line_metrics(50)) * pil_render.LINE_SPACING
+        for i, line in enumerate(lines):
+            paste_text(frame, line, (x, baseline - step * (len(lines) - 1 - i)), 50, 'white', anchor='ms')
+
+    def render(self, game, team, updated_at_text, score_timeline=None):
+        """Returns the scoreboard frame (an RGB image) for `game`."""
+        if not game:
+            lines = [f"No Game Today for {team}", self.no_game_text]
+            return self.template(('none',) + tuple(lines), lambda f: self._title(f, lines)).copy()
+
+        title = self.title.split('\n') + [f"{team} {self.title_suffix}"]
+        fields = parse_game(game)
+        state = STATES.get(fields['status']['name'], 'other')
+        plan = self.plan[state]
+        elements = [e for e in plan.elements if e.when is None or e.when(fields)]
+
+        def build(frame):
+            self._title(frame, title)
+            draw = ImageDraw.Draw(frame)
+            for element in elements:
+                for box, color in element.fills:
+                    draw.rectangle(box, fill=color(fields))
+                for box, color in element.edges:
+                    draw.rectangle(box, outline=color, width=1)
+                for xy, points, get, color, anchor in element.texts:
+                    paste_text(frame, str(get(fields)), xy, points, color(fields), anchor=anchor)
+
+        teams = tuple((fields[side]['abbr'], fields[side]['color'], fields[side]['alt']) for side in ('away', 'home'))
+        key = (state, tuple(title), teams, tuple(e.when is None or bool(e.when(fields)) for e in plan.elements))
+        frame = self.template(key, build).copy()
+        draw = ImageDraw.Draw(frame)
+        for element in elements:
+            for box, color in element.dynamic_fills:
+                draw.rectangle(box, fill=color(fields))
+            for xy, points, get, color, anchor in element.dynamic_texts:
+                paste_text(frame, str(get(fields)), xy, points, color(fields), anchor=anchor)
+        for panel in plan.panels:
+            getattr(self, '_' + panel)(frame, game, fields, team, score_timeline)
+
+        paste_footer(frame, updated_at_text, upstream.is_stale(game))
+        return frame
+
+    # --- Panels ---
+
+    def _last_play(self, frame, game, fields, team, score_timeline):
+        cells = pil_render.table_cells(Table((0.66, 0.2, 0.25, 0.15), (1.0,), 2, 20))
+        recent_plays = fields['recent_plays']
+        paste_text(frame, "Recent Plays" if recent_plays else "Last Play", _center(cells[0][0]), 20, 'white')
+        if recent_plays:
+            lines = [textwrap.shorten(play['text'], width=40, placeholder='...') for play in recent_plays]
+            paste_lines(frame, lines, _center(cells[1][0]), 14, 'white')
+        else:
+            x, y = _center(cells[1][0])
+            width = 2 * min(x, pil_render.CANVAS_SIZE[0] - x)
+            paste_lines(frame, wrap(fields['last_play'], 20, width), (x, y), 20, 'white')
+
+    def _win_probability(self, frame, game, fields, team, score_timeline):
+        home_wp = fields['win_probability']
+        if home_wp is None:
+            return
+        away, home = fields['away'], fields['home']
+        meter_x, meter_y, meter_w, meter_h = 0.3, 0.07, 0.4, 0.05
+        away_w = meter_w * (1 - home_wp)
+        draw = ImageDraw.Draw(frame)
+        left, top = axes_point(meter_x, meter_y + meter_h)
+        split, _ = axes_point(meter_x + away_w, 0)
+        right, bottom = axes_point(meter_x + meter_w, meter_y)
+        draw.rectangle((left, top, split, bottom), fill=away['color'])
+        draw.rectangle((split, top, right, bottom), fill=home['color'])
+        middle = (top + bottom) / 2.0
+        paste_text(frame, f"{away['abbr']} {100 * (1 - home_wp):.0f}%", (axes_point(meter_x - 0.01, 0)[0], middle), 20, 'white', anchor='rm')
+        paste_text(frame, f"{home['abbr']} {100 * home_wp:.0f}%", (axes_point(meter_x + meter_w + 0.01, 0)[0], middle), 20, 'white', anchor='lm')
+        paste_text(frame, "Win Probability", axes_point(0.5, meter_y + meter_h + 0.01), 14, HEADER_COLOR, anchor='md')
+
+    def _winner(self, frame, game, fields, team, score_timeline):
+        away, home = fields['away'], fields['home']
+        try:
+            away_score, home_score = int(away['score']), int(home['score'])
+        except ValueError:
+            return
+        winner = away['abbr'] if away_score > home_score else home['abbr'] if home_score > away_score else ''
+        if winner != team:
+            return
+        image, dx, dy = sprite(self.win_text, 60, 'blue', anchor='ms')
+        x, y = axes_point(0.5, 0.15)
+        pad = 0.2 * px(60)
+        box = (x + dx - pad, y + dy - pad, x + dx + image.width + pad, y + dy + image.height + pad)
+        box = tuple(int(round(v)) for v in box)
+        overlay = Image.new('RGBA', (box[2] - box[0], box[3] - box[1]), (0, 0, 0, 0))
+        ImageDraw.Draw(overlay).rounded_rectangle((0, 0, overlay.width - 1, overlay.height - 1),
+                                                  radius=pad, fill=(255, 255, 255, 128))
+        frame.paste(overlay, box[:2], overlay)
+        frame.paste(image, (int(round(x + dx)), int(round(y + dy))), image)
+
+    def _timeline(self, frame, game, fields, team, score_timeline):
+        """The lead (and win probability) strip, drawn as polylines."""
+        if score_timeline is None or not len(score_timeline) or score_timeline.game_id != game.get('id'):
+            return
+        left, bottom, width, height = pil_render.TIMELINE_RECT
+        canvas_w, canvas_h = pil_render.CANVAS_SIZE
+        box = (left * canvas_w, (1 - bottom - height) * canvas_h, (left + width) * canvas_w, (1 - bottom) * canvas_h)
+        x_max, y_max = self._timeline_limits.get(score_timeline.game_id, (0, 0))
+        minutes, lead = score_timeline.minutes, score_timeline.lead
+        if minutes[-1] >= x_max:
+            x_max = max(30.0, 2 * minutes[-1])
+        if abs(lead[-1]) >= y_max:
+            y_max = max(3.0, 2 * abs(lead[-1]))
+        self._timeline_limits = {score_timeline.game_id: (x_max, y_max)}
+
+        sx = lambda m: box[0] + (box[2] - box[0]) * m / x_max
+        sy = lambda v, lo, hi: box[3] - (box[3] - box[1]) * (v - lo) / (hi - lo)
+        draw = ImageDraw.Draw(frame)
+        draw.line((box[0], sy(0, -y_max, y_max), box[2], sy(0, -y_max, y_max)), fill='#888888', width=1)
+        steps = []
+        for i, (m, v) in enumerate(zip(minutes, lead)):
+            if i:
+                steps.append((sx(m), steps[-1][1]))
+            steps.append((sx(m), sy(v, -y_max, y_max)))
+        if len(steps) > 1:
+            draw.line(steps, fill='white', width=2)
+        wp = score_timeline.win_probability
+        points = [(sx(m), sy(p, 0, 1)) for m, p in zip(minutes, wp) if p == p]
+        if len(points) > 1:
+            draw.line(points, fill='#26FF00', width=2)
+        x = box[0] - 0.01 * (box[2] - box[0])
+        paste_text(frame, f"{score_timeline.home_team} +", (x, box[1]), 12, 'white', anchor='rt')
+        paste_text(frame, f"{score_timeline.away_team} +", (x, box[3]), 12, 'white', anchor='rd')
+
+
+def paste_footer(frame, updated_at_text, stale=False, clear=False):
+    """
+    Pastes the "Last Updated" line at the bottom right. With `clear` its band
+    (nothing else is drawn at that height) is painted over first, so a shown
+    frame gets a newer time without being rendered again.
+    """
+    x, y = axes_point(0.99, 0.01)
+    if clear:
+        ascent, descent = pil_render.line_metrics(FOOTER_POINTS, 'normal')
+        ImageDraw.Draw(frame).rectangle((0, y - ascent - 2, frame.width, y + descent + 2), fill=pil_render.BACKGROUND)
+    color = upstream.STALE_COLOR if stale else FOOTER_COLOR
+    paste_text(frame, f'Last Updated: {updated_at_text}', (x, y), FOOTER_POINTS, color, weight='normal', anchor='rs')
+
+
+_engines = {}
+
+
+def render_scoreboard(game, team, updated_at_text, score_timeline=None, sport='mlb', **texts):
+    """
+    Renders a frame with the process-wide engine of `sport` (templates and
+    sprites stay warm). `texts` (title, win_text, no_game_text) replace the
+    engine's texts; templates are keyed by their text, so a changed title
+    only builds new ones.
+    """
+    engine = _engines.get(sport)
+    if engine is None:
+        engine = _engines[sport] = LayoutScoreboard(sport)
+    for name, value in texts.items():
+        setattr(engine, name, value)
+    return engine.render(game, team, updated_at_text, score_timeline)
@@ -0,0 +1,381 @@
+"""
+The main loop shared by the scoreboard scripts.
+
+GetNY.py and GetNBA.py each had the same __main__ block: the output sinks,
+the warm start, the game event engines, the render pool, frame diffs,
+recaps, celebrations, reloaded settings and the Supervisor. Every feature
+had to be wired in twice. run(script) is that block once. The script passes
+its own module, and its settings, paths and fetch/draw functions are read
+from it when they are used, so settings reloaded into the script (see
+config.py) apply here too. The features of one sport are optional
+settings: RECENT_PLAYS and SHOW_WIN_PROBABILITY (GetNY), SLATE_MODE (GetNBA).
+"""
+import atexit
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import archive
+import fonts
+import game_events
+import plays
+import profiler
+import recap
+import render_pool
+import schedule_index
+import sinks
+import supervisor
+import upstream
+import warm_start
+
+
+# --- Poll helpers ---
+
+def league(script):
+    """The league of the script's API_URL, like 'mlb'."""
+    return schedule_index.sport_of(script.API_URL)[1]
+
+
+def script_name(script):
+    """The importable name of a script (also when it runs as __main__), for worker and recap processes."""
+    return os.path.splitext(os.path.basename(script.__file__))[0]
+
+
+def play_tracker(script):
+    """A PlayTracker for the script's league, or None without RECENT_PLAYS."""
+    recent_plays = getattr(script, 'RECENT_PLAYS', 0)
+    if not recent_plays:
+        return None
+    return plays.PlayTracker(plays.summary_url(script.API_URL), recent_plays, script.HEADERS)
+
+
+def attach_recent_plays(game, tracker):
+    """Adds the tracker's recent plays to a live game as game['recentPlays']."""
+    if game and tracker and game.get('status', {}).get('type', {}).get('state') == 'in':
+        tracker.poll(game)
+        game['recentPlays'] = tracker.recent_plays()
+    return game
+
+
+def attach_win_probability(script, games):
+    """Adds the home win probability of every live game in `games` (one batched lookup)."""
+    if getattr(script, 'SHOW_WIN_PROBABILITY', False):
+        import win_prob
+        win_prob.attach_win_probability(games)
+    return games
+
+
+def log_events(events, game):
+    """Prints the typed game events of one poll."""
+    for event in events:
+        print(f"Game event: {game_events.describe(event)}")
+
+
+def archive_finals(season_archive, json_data, season_standings=None):
+    """Records the final games of a fetched slate in the season archive (see archive.py)."""
+    if season_archive is None or not json_data or upstream.is_stale(json_data):
+        return
+    try:
+        added = season_archive.add_slate(json_data)
+        if season_standings is not None and (added or season_standings.season is None):
+            season_standings.load(season_archive)
+    except Exception as e:
+        print(f"Could not archive the final games: {e}")
+
+
+def recap_on_final(script, history, processes, team=None):
+    """
+    Event subscriber that builds the animated recap of a game once it is
+    final (see recap.py) and adds its process to `processes`; `team`
+    defaults to the configured team at that time.
+    """
+    def start(events, game):
+        recap_team = team or script.TEAM_ABBREVIATION
+        history_path = history.path(game['id'])
+        if os.path.exists(history_path):
+            output_path = os.path.join(script.RECAP_DIR, f"{recap_team}_{game['id']}{script.RECAP_FORMAT}")
+            processes.append(recap.start_recap(script_name(script), recap_team, history_path, output_path))
+    return start
+
+
+def refresh_footer(fig, game):
+    """
+    Shows the time of a poll that changed nothing in the "Last Updated"
+    footer on screen, so the window still tells that polling works. Only the
+    footer of the shown frame is repainted; the saved frame keeps the time
+    of its last change.
+    """
+    view = render_pool.frame_view(fig)
+    if game is None or not view.showing():
+        return
+    import numpy as np
+    import layouts
+    from PIL import Image
+
+    frame = Image.fromarray(view.frame)
+    layouts.paste_footer(frame, upstream.updated_text(game), upstream.is_stale(game), clear=True)
+    view.show_frame(np.asarray(frame))
+
+
+def publish_frame_diff(publisher, save_path):
+    """Publishes the changed rectangles of a saved frame for remote displays (see frame_diff.py)."""
+    try:
+        written = publisher.publish_file(save_path)
+    except Exception as e:
+        print(f"Could not publish the frame update: {e}")
+        return
+    if written:
+        print(f"Frame update {publisher.seq} published ({written} bytes)")
+
+
+# --- Main loop ---
+
+def run(script):
+    """Runs the scoreboard of `script` (the GetNY or GetNBA module) until the window is closed."""
+    slate_mode = getattr(script, 'SLATE_MODE', False)
+    pool_mode = bool(script.RENDER_WORKERS) and not slate_mode
+    script.ensure_output_directory_exists()
+
+    # Frames and payloads go out through the output sinks, each written on
+    # its own thread and queue (see sinks.py); what is queued at exit is
+    # still written
+    outputs = script.outputs = sinks.Fanout([sinks.FileSink()])
+    if script.FRAMEBUFFER_DEVICE:
+        try:
+            shown_path = script.SAVE_PATH_SLATE if slate_mode else script.SAVE_PATH_PNG
+            outputs.add(sinks.FramebufferSink(script.FRAMEBUFFER_DEVICE, shown_path))
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not use the framebuffer {script.FRAMEBUFFER_DEVICE}: {e}")
+    if script.SINK_HTTP_PORT:
+        outputs.add(sinks.HttpSink(script.SINK_HTTP_PORT))
+    atexit.register(outputs.close)
+
+    # Start the first fetch right away so it overlaps with the GUI startup,
+    # and show the last rendered frame while matplotlib is being imported.
+    fetch_executor = ThreadPoolExecutor(max_workers=1)
+    # While ESPN fails, the last good payload is served (marked stale) and a
+    # circuit breaker spaces out the retries; see upstream.py
+    upstream_cache = upstream.UpstreamCache(script.fetch_scoreboard, seed_path=script.SAVE_PATH_JSON)
+    first_fetch = fetch_executor.submit(upstream_cache.fetch)
+    fetch_executor.shutdown(wait=False)
+    splash = warm_start.show_last_frame(script.SAVE_PATH_PNG)
+
+    import matplotlib.pyplot as plt
+    fonts.use_scoreboard_font()
+    plt.ion()
+    fig = plt.figure(figsize=(16, 9))
+    fig.patch.set_facecolor('#606060')
+    # numpy is loaded with matplotlib by now, and with it what needs it:
+    # build the win-probability tables once so every poll is just a lookup
+    import standings
+    import timeline
+    if getattr(script, 'SHOW_WIN_PROBABILITY', False):
+        import win_prob
+        win_prob.tables()
+    fig.canvas.mpl_connect('close_event', lambda event: sys.exit(0))
+
+    mng = plt.get_current_fig_manager()
+    try: mng.window.showMaximized()
+    except AttributeError:
+        try: mng.full_screen_toggle()
+        except AttributeError: print("Warning: Could not automatically maximize or full-screen the window.")
+
+    # Redraw the game saved by the previous run until the live fetch is back
+    state = warm_start.load_state(script.SAVE_PATH_STATE, script.TEAM_ABBREVIATION)
+    if state and state.get('game') and not first_fetch.done():
+        script.draw_scoreboard(fig, state['game'], updated_at=state.get('saved_at'))
+    plt.pause(0.001)
+    if splash:
+        splash.close()
+    while not first_fetch.done():
+        plt.pause(0.1)
+    first_data = first_fetch.result()
+    season_archive = archive.SeasonArchive(script.SAVE_PATH_ARCHIVE) if script.ARCHIVE_FINALS else None
+    season_standings = standings.Standings(league(script).upper()) if season_archive else None
+    archive_finals(season_archive, first_data, season_standings)
+
+    recap_processes = []
+
+    def fetch():
+        # Finished recaps are collected here, so none is left a zombie
+        recap_processes[:] = recap.reap(recap_processes)
+        json_data = upstream_cache.fetch()
+        archive_finals(season_archive, json_data, season_standings)
+        return json_data
+
+    # Long-lived service loop: render crashes reset the figure in-process,
+    # errors back off and retry, and outside ACTIVE_HOURS the process idles
+    # instead of exiting and waiting for cron. Each poll is diffed against the
+    # previous one and only polls where something changed get rendered;
+    # the others only refresh the "Last Updated" time in the window.
+    history = recap.GameHistory(script.HISTORY_DIR) if script.RECAP_FORMAT else None
+    publishers = {}
+    if script.PUBLISH_FRAME_DIFFS:
+        import frame_diff
+        keys = ['slate'] if slate_mode else script.TEAMS if pool_mode else [script.TEAM_ABBREVIATION]
+        publishers = {key: frame_diff.FramePublisher(os.path.join(script.FRAME_DIFF_DIR, key)) for key in keys}
+        if script.FRAME_DIFF_PORT:
+            frame_diff.serve(script.FRAME_DIFF_DIR, script.FRAME_DIFF_PORT)
+
+    def watch(team, score_timeline):
+        """A GameEventEngine with the subscribers every team has; `team` None follows TEAM_ABBREVIATION."""
+        engine = game_events.GameEventEngine()
+        engine.bus.subscribe(log_events, kinds=set(game_events.ALL_KINDS) - {game_events.UPDATE})
+        engine.bus.subscribe(lambda events, game: score_timeline.record(game))
+        engine.bus.subscribe(lambda events, game: outputs.publish(sinks.GAME, team or script.TEAM_ABBREVIATION, game))
+        if history:
+            engine.bus.subscribe(lambda events, game: history.record(game))
+            engine.bus.subscribe(recap_on_final(script, history, recap_processes, team), kinds={game_events.FINAL})
+        return engine
+
+    engines = {}
+    trackers = {}
+    frame_diff_sink = None
+    if slate_mode:
+        import slate
+        renderer = slate.SlateRenderer()
+        if publishers:
+            outputs.add(sinks.FrameDiffSink({script.SAVE_PATH_SLATE: publishers['slate']}))
+        view = render_pool.FrameView(fig)
+        worker = supervisor.RenderWorker(fig, lambda fig, json_data: script.show_slate(json_data, renderer, view),
+                                         reset=lambda fig: renderer.reset())
+        step = lambda: worker.render(fetch())
+        pause = plt.pause
+        try:
+            worker.render(first_data)
+        except Exception as e:
+            print(f"An error occurred drawing the first slate: {e}")
+    elif pool_mode:
+        # Fetch and parse here, render in warm worker processes and show the
+        # finished frames of the first team in the window.
+        pool = render_pool.RenderPool(script_name(script), script.RENDER_WORKERS)
+        view = render_pool.frame_view(fig)
+        timelines = {team: timeline.ScoreTimeline() for team in script.TEAMS}
+        for team in script.TEAMS:
+            trackers[team] = play_tracker(script)
+            engines[team] = watch(team, timelines[team])
+            engines[team].bus.subscribe(
+                lambda events, game, team=team: pool.submit(team, game, team=team, save_path=script.team_png_path(team),
+                                                            score_timeline=timelines[team])
+            )
+
+        def submit_games(json_data):
+            teams = script.TEAMS
+            games = [upstream.mark_stale(script.find_game(json_data, team), json_data) if json_data else None
+                     for team in teams]
+            # The whole slate goes through the win-probability tables at once
+            attach_win_probability(script, games)
+            for team, game in zip(teams, games):
+                if team == script.TEAM_ABBREVIATION:
+                    warm_start.save_state(script.SAVE_PATH_STATE, team, game)
+                game = standings.attach_form(attach_recent_plays(game, trackers[team]), season_standings)
+                if not engines[team].update(game) and team == teams[0]:
+                    refresh_footer(fig, game)
+
+        def show_frame(team, save_path, seconds):
+            if team in publishers and os.path.exists(save_path):
+                publish_frame_diff(publishers[team], save_path)
+            if team == script.TEAMS[0] and os.path.exists(save_path):
+                view.show(save_path)
+
+        step = lambda: submit_games(fetch())
+        pause = lambda seconds: pool.wait_for_frames(seconds, show_frame, plt.pause)
+        submit_games(first_data)
+    else:
+        worker = supervisor.RenderWorker(fig, script.show_game)
+        score_timeline = timeline.ScoreTimeline()
+        trackers[None] = play_tracker(script)
+        engines[None] = watch(None, score_timeline)
+        engines[None].bus.subscribe(lambda events, game: worker.render(game, score_timeline))
+        if publishers:
+            # Published from the frame itself, off the loop, as one of the output sinks
+            frame_diff_sink = outputs.add(
+                sinks.FrameDiffSink({script.SAVE_PATH_PNG: publishers[script.TEAM_ABBREVIATION]}))
+
+        def update_game(game):
+            attach_win_probability(script, [game])
+            game = standings.attach_form(attach_recent_plays(game, trackers[None]), season_standings)
+            if not engines[None].update(game):
+                refresh_footer(fig, game)
+
+        step = lambda: update_game(script.fetch_and_find_game(fetch))
+        pause = plt.pause
+        try:
+            update_game(upstream.mark_stale(script.find_game(first_data), first_data) if first_data else None)
+        except Exception as e:
+            print(f"An error occurred drawing the first game: {e}")
+
+    celebration_player = None
+    if script.CELEBRATIONS and not slate_mode:
+        import celebrations
+        kinds = (celebrations.LEAD, celebrations.WIN)
+        if league(script) == 'mlb':
+            kinds = (celebrations.HOME_RUN,) + kinds
+        celebration_player = celebrations.CelebrationPlayer(fig, kinds, {celebrations.WIN: script.WIN_TEXT})
+        shown_team = script.TEAMS[0] if pool_mode else script.TEAM_ABBREVIATION
+        # Line up the shown team's animations for the first pause; later games and
+        # teams are lined up by the subscriber as they appear
+        celebration_player.prepare(script.find_game(first_data, shown_team) if first_data else None, shown_team)
+        if pool_mode:
+            engines[shown_team].bus.subscribe(celebration_player.subscriber(shown_team))
+        else:
+            engines[None].bus.subscribe(celebration_player.subscriber(lambda: script.TEAM_ABBREVIATION))
+        pause = celebration_player.wrap(pause)
+    pause(script.UPDATE_INTERVAL_SECONDS)
+
+    # Kept as one list so a reloaded TEAM_ABBREVIATION reaches the poll gate
+    watched_teams = None if slate_mode else script.TEAMS if pool_mode else [script.TEAM_ABBREVIATION]
+
+    def poll_gate():
+        if not script.POLL_ONLY_NEAR_GAMES:
+            return None
+        schedule = schedule_index.ScheduleIndex(script.API_URL, schedule_index.index_path(script.output_dir, script.API_URL),
+                                                script.HEADERS)
+        return schedule.poll_gate(watched_teams)
+
+    def apply_settings(changes):
+        """Carries settings reloaded from the config file over to the running loop (see config.py)."""
+        nonlocal season_standings
+        service.interval = script.UPDATE_INTERVAL_SECONDS
+        service.windows = script.ACTIVE_HOURS
+        team = script.TEAM_ABBREVIATION
+        if 'TEAM_ABBREVIATION' in changes and not slate_mode:
+            watched_teams[:] = [team]
+            if frame_diff_sink is not None:
+                if team not in publishers:
+                    publishers[team] = frame_diff.FramePublisher(os.path.join(script.FRAME_DIFF_DIR, team))
+                frame_diff_sink.publishers[script.SAVE_PATH_PNG] = publishers[team]
+        if 'API_URL' in changes:
+            # Another league: the cached payload, schedule, standings and plays were of the old one
+            upstream_cache.reset()
+            service.gate = poll_gate()
+            if season_standings is not None:
+                season_standings = standings.Standings(league(script).upper())
+                season_standings.load(season_archive)
+            for key in trackers:
+                trackers[key] = play_tracker(script)
+        if 'WIN_TEXT' in changes and celebration_player:
+            celebration_player.texts[celebrations.WIN] = script.WIN_TEXT
+        # Draw the next poll even if the game did not change; the figure and caches stay
+        for engine in engines.values():
+            engine.reset()
+
+    settings = script.settings
+    settings.on_change = apply_settings
+    settings.install_sighup()
+    loop_profiler = profiler.LoopProfiler(script.PROFILE_DIR, script.PROFILE_CYCLES, outputs)
+    loop_profiler.install_signal()
+    if script.PROFILE_PORT:
+        loop_profiler.serve(script.PROFILE_PORT)
+    step, pause = loop_profiler.wrap(step, pause)
+    service = supervisor.Supervisor(
+        step=step,
+        interval=script.UPDATE_INTERVAL_SECONDS,
+        pause=pause,
+        windows=script.ACTIVE_HOURS,
+        on_idle=lambda resume_at: script.draw_idle(fig, resume_at),
+        idle_tick=fig.canvas.flush_events,
+        gate=poll_gate(),
+        reload=settings.check,
+    )
+    service.run()
@@ -0,0 +1,134 @@
+"""
+Pillow drawing primitives for the scoreboard frames.
+
+Builds the 16:9 scoreboard frame the scripts used to draw with matplotlib
+tables, without matplotlib: every text (digits, team abbreviations, names, status strings)
+is rasterised once into an RGBA sprite cached under (text, size, colour)
+and pasted at a point, and table cells are laid out like matplotlib's.
+Geometry follows matplotlib's: a 1600x900 figure at 100 dpi with the axes
+of subplots_adjust(top=0.78), table bboxes in axes coordinates and font
+sizes in points.
+
+The scoreboards themselves (which tables, what goes in them, the cached
+templates per game state and team) are the layouts in layouts.py. See
+bench_render.py for what a frame costs.
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFont
+
+import fonts
+
+# --- Geometry (matches the scripts' window figure) ---
+DPI = 100
+CANVAS_SIZE = (1600, 900)
+BACKGROUND = '#606060'
+# left, bottom, right, top of the axes in figure fractions
+AXES_RECT = (0.125, 0.11, 0.9, 0.78)
+TITLE_PAD_POINTS = 40
+LINE_SPACING = 1.2
+TIMELINE_RECT = (0.15, 0.015, 0.7, 0.085)  # timeline.PANEL_RECT
+
+Table = namedtuple('Table', ['bbox', 'col_widths', 'rows', 'fontsize'])
+
+
+def px(points):
+    """Font size in points to pixels at the figure's dpi."""
+    return int(round(points * DPI / 72.0))
+
+
+def axes_point(x, y):
+    """Axes coordinates to pixel coordinates (origin top left)."""
+    left, bottom, right, top = AXES_RECT
+    width, height = CANVAS_SIZE
+    return (left + x * (right - left)) * width, (1 - (bottom + y * (top - bottom))) * height
+
+
+def cell_boxes(table):
+    """Pixel boxes (left, top, right, bottom) of every cell, row by row, as matplotlib lays them out."""
+    x, y, w, h = table.bbox
+    left, top = axes_point(x, y + h)
+    right, bottom = axes_point(x + w, y)
+    total = float(sum(table.col_widths))
+    edges = [left]
+    for width in table.col_widths:
+        edges.append(edges[-1] + (right - left) * width / total)
+    row_height = (bottom - top) / table.rows
+    return [
+        [(edges[c], top + r * row_height, edges[c + 1], top + (r + 1) * row_height) for c in range(len(table.col_widths))]
+        for r in range(table.rows)
+    ]
+
+
+@lru_cache(maxsize=None)
+def table_cells(table):
+    """cell_boxes() rounded to whole pixels, cached per table."""
+    return [[tuple(int(round(v)) for v in box) for box in row] for row in cell_boxes(table)]
+
+
+@lru_cache(maxsize=None)
+def font(size_px, weight='bold'):
+    return ImageFont.truetype(fonts.font_file(weight), size_px)
+
+
+@lru_cache(maxsize=4096)
+def sprite(text, points, color, weight='bold', anchor='mm'):
+    """
+    One line of text rasterised into an RGBA sprite; returns (image, dx, dy),
+    the offset of the sprite's corner from the anchor point.
+    """
+    face = font(px(points), weight)
+    left, top, right, bottom = face.getbbox(text, anchor=anchor)
+    image = Image.new('RGBA', (max(1, right - left), max(1, bottom - top)), (0, 0, 0, 0))
+    ImageDraw.Draw(image).text((-left, -top), text, font=face, fill=color, anchor=anchor)
+    return image, left, top
+
+
+@lru_cache(maxsize=None)
+def line_metrics(points, weight='bold'):
+    """
+    (ascent, descent) of "lp", which matplotlib uses for the height of every
+    line when it aligns text vertically and spaces lines.
+    """
+    _, top, _, bottom = font(px(points), weight).getbbox('lp', anchor='ls')
+    return -top, bottom
+
+
+def paste_text(frame, text, xy, points, color, weight='bold', anchor='mm'):
+    """
+    Pastes the sprite for `text` at `xy`. The vertical part of `anchor` follows
+    matplotlib: 'm', 't' and 'd' align the "lp" box, 's' the baseline.
+    """
+    if not text:
+        return
+    x, y = xy
+    ascent, descent = line_metrics(points, weight)
+    y += {'m': (ascent - descent) / 2.0, 't': ascent, 'd': -descent}.get(anchor[1], 0)
+    image, dx, dy = sprite(text, points, color, weight, anchor[0] + 's')
+    frame.paste(image, (int(round(x + dx)), int(round(y + dy))), image)
+
+
+def paste_lines(frame, lines, xy, points, color, weight='bold'):
+    """Centres several lines around `xy` with matplotlib's 1.2 line spacing."""
+    step = sum(line_metrics(points, weight)) * LINE_SPACING
+    y = xy[1] - step * (len(lines) - 1) / 2.0
+    for line in lines:
+        paste_text(frame, line, (xy[0], y), points, color, weight)
+        y += step
+
+
+def wrap(text, points, max_width, weight='bold'):
+    """Greedy word wrap to `max_width` pixels (what matplotlib's wrap=True does inside the figure)."""
+    face = font(px(points), weight)
+    lines, line = [], ''
+    for word in text.split():
+        candidate = f"{line} {word}".strip()
+        if line and face.getlength(candidate) > max_width:
+            lines.append(line)
+            line = word
+        else:
+            line = candidate
+    if line:
+        lines.append(line)
+    return lines
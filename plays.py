@@ -0,0 +1,138 @@
+"""
+Incremental play-by-play from ESPN's per-event summary endpoint.
+
+The scoreboard endpoint only carries the single last play, so anything that
+happens between two polls is lost. A PlayTracker follows one game: it
+remembers the id of the last play it has seen, skips the summary download
+entirely while the scoreboard's lastPlay id has not moved, and otherwise
+only converts the plays after the last seen one (scanning from the end of
+the list). New plays go into a bounded ring buffer of recent plays.
+
+The summary is downloaded on a background thread, so a slow ESPN never
+holds up the loop: poll() starts the download and returns at once, and
+the plays it brings are added on the next poll after it has finished.
+"""
+import threading
+from collections import deque
+
+RECENT_PLAYS = 3
+
+
+def summary_url(scoreboard_url):
+    """Turns a .../scoreboard API URL into the matching .../summary URL."""
+    return scoreboard_url.rsplit('/', 1)[0] + '/summary'
+
+
+def parse_play(play):
+    """Keeps the few fields of a play-by-play entry the scoreboard shows."""
+    return {
+        'id': str(play.get('id')),
+        'text': play.get('text', ''),
+        'period': play.get('period', {}).get('number'),
+        'clock': play.get('clock', {}).get('displayValue'),
+        'scoring': bool(play.get('scoringPlay')),
+        'away_score': play.get('awayScore'),
+        'home_score': play.get('homeScore'),
+    }
+
+
+def plays_after(plays, last_id, limit):
+    """
+    Returns the raw plays that come after `last_id`, scanning backwards so
+    only the new tail is touched. With no (or an unknown) `last_id` only the
+    last `limit` plays are returned.
+    """
+    if last_id is not None:
+        for index in range(len(plays) - 1, -1, -1):
+            if str(plays[index].get('id')) == last_id:
+                return plays[index + 1:]
+    return plays[-limit:] if limit else []
+
+
+class PlayTracker:
+    """Follows the play-by-play of one game and keeps the most recent plays."""
+
+    def __init__(self, url, maxlen=RECENT_PLAYS, headers=None, timeout=10):
+        self.url = url
+        self.headers = headers
+        self.timeout = timeout
+        self.recent = deque(maxlen=maxlen)
+        self.event_id = None
+        self.last_play_id = None
+        self.last_hint = None
+        self.downloads = 0
+        self._fetching = None   # the background download thread, while it runs
+        self._fetched = None    # (event id, hint, plays) of the last finished download
+
+    def reset(self, event_id=None):
+        self.recent.clear()
+        self.event_id = event_id
+        self.last_play_id = None
+        self.last_hint = None
+
+    def fetch_plays(self, event_id):
+        """Downloads the summary for `event_id` and returns its play list (None on errors)."""
+        import requests
+
+        try:
+            response = requests.get(self.url, params={'event': event_id}, headers=self.headers, timeout=self.timeout)
+            response.raise_for_status()
+            self.downloads += 1
+            return response.json().get('plays', [])
+        except requests.exceptions.RequestException as e:
+            print(f"Could not fetch play-by-play for event {event_id}: {e}")
+        except ValueError as e:
+            print(f"Could not decode play-by-play for event {event_id}: {e}")
+        return None
+
+    def _fetch_in_background(self, event_id, hint):
+        try:
+            self._fetched = (event_id, hint, self.fetch_plays(event_id))
+        finally:
+            self._fetching = None
+
+    def poll(self, game):
+        """
+        Adds the plays of the last finished download to the ring buffer and
+        returns them (oldest first); starts a download when `game` has a new one.
+        """
+        if not game:
+            return []
+        event_id = game.get('id')
+        if event_id != self.event_id:
+            self.reset(event_id)
+        new_plays = self._apply_fetched()
+
+        # The scoreboard tells us the id of the latest play for free; if it has
+        # not changed there is nothing new to download
+        hint = (game.get('situation') or {}).get('lastPlay', {}).get('id')
+        hint = str(hint) if hint is not None else None
+        if hint is not None and hint in (self.last_hint, self.last_play_id):
+            return new_plays
+        if self._fetching is None:
+            self._fetching = threading.Thread(target=self._fetch_in_background, args=(event_id, hint),
+                                              name="play-by-play", daemon=True)
+            self._fetching.start()
+        return new_plays
+
+    def _apply_fetched(self):
+        fetched, self._fetched = self._fetched, None
+        if fetched is None:
+            return []
+        event_id, hint, plays = fetched
+        # A download for a game that is no longer followed, or one that failed
+        if event_id != self.event_id or plays is None:
+            return []
+        # An unknown last id gives the last few plays again; keep each play once
+        seen = {play['id'] for play in self.recent}
+        new_plays = [parse_play(play) for play in plays_after(plays, self.last_play_id, self.recent.maxlen)]
+        new_plays = [play for play in new_plays if play['id'] not in seen]
+        self.recent.extend(new_plays)
+        if plays:
+            self.last_play_id = str(plays[-1].get('id'))
+        self.last_hint = hint
+        return new_plays
+
+    def recent_plays(self):
+        """The buffered plays, newest first."""
+        return list(reversed(self.recent))
@@ -0,0 +1,190 @@
+"""
+On-demand profiling of the running scoreboard loop.
+
+When a kiosk starts lagging there was no way to see where a poll spends
+its time short of stopping the process. A LoopProfiler wraps the
+Supervisor's step and pause; it costs nothing until asked, and then runs
+cProfile over the next N cycles (a cycle is one step plus the pause after
+it, where matplotlib draws the window). Ask for a profile with
+
+    kill -USR1 <pid>                                   # PROFILE_CYCLES cycles
+    curl http://127.0.0.1:<PROFILE_PORT>/profile?cycles=20
+
+The result goes to output/profiles/profile_<time>.prof (open it with
+pstats or snakeviz) next to a .txt summary with the time per stage
+(fetch, archive, event diff, render, ...) and the top functions by
+cumulative time.
+
+Image encoding and file writes run on the output sinks' threads (see
+sinks.py), which cProfile does not see; given the Fanout, the summary adds
+the time each sink spent writing during the profiled cycles.
+
+In render pool mode the rendering happens in the worker processes, so a
+profile of the main process shows the fetch and dispatch side only.
+"""
+import os
+import signal
+import time
+from datetime import datetime
+
+PROFILE_CYCLES = 10
+TOP_FUNCTIONS = 30
+# (stage, file name or None for any, function name). Nested stages are
+# reported on their own, so they overlap with the stages that call them.
+STAGES = [
+    ('fetch', 'upstream.py', 'fetch'),
+    ('download', None, 'download_scoreboard'),
+    ('archive', None, 'archive_finals'),
+    ('standings', 'standings.py', 'attach_form'),
+    ('recent plays', None, 'attach_recent_plays'),
+    ('win probability', None, 'attach_win_probability'),
+    ('event diff + subscribers', 'game_events.py', 'update'),
+    ('render', None, 'draw_scoreboard'),
+    ('render (pool dispatch)', 'render_pool.py', 'submit'),
+    ('render (slate)', 'slate.py', 'render'),
+    ('frame capture', 'sinks.py', 'figure_image'),
+    ('frame diff publish', None, 'publish_frame_diff'),
+]
+
+
+def stage_times(stats):
+    """[(stage, cumulative seconds)] of the STAGES found in a pstats.Stats."""
+    found = {}
+    for (filename, _, funcname), (_, _, _, cumulative, _) in stats.stats.items():
+        for stage, stage_file, stage_func in STAGES:
+            if funcname == stage_func and (stage_file is None or os.path.basename(filename) == stage_file):
+                # Same-named functions calling each other: the outer one has the larger time
+                found[stage] = max(found.get(stage, 0.0), cumulative)
+    return [(stage, found[stage]) for stage, _, _ in STAGES if stage in found]
+
+
+class LoopProfiler:
+    def __init__(self, directory, cycles=PROFILE_CYCLES, outputs=None):
+        self.directory = directory
+        self.cycles = cycles
+        self.outputs = outputs
+        self._sink_times = {}
+        # Cycles asked for; set from a signal handler or the HTTP thread
+        self._requested = 0
+        self._profile = None
+        self._remaining = 0
+        self._seconds = {'step': [], 'pause': []}
+        self.last_summary = None
+
+    def request(self, cycles=None):
+        """Profiles the next `cycles` cycles (default PROFILE_CYCLES), starting with the next step."""
+        self._requested = cycles or self.cycles
+
+    def install_signal(self):
+        """SIGUSR1 requests a profile (main thread only; no-op where the platform has no SIGUSR1)."""
+        if not hasattr(signal, 'SIGUSR1'):
+            return False
+        signal.signal(signal.SIGUSR1, lambda signum, frame: self.request())
+        return True
+
+    def serve(self, port, host='127.0.0.1'):
+        """Answers GET /profile[?cycles=N] on a local port from a background thread."""
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from urllib.parse import parse_qs, urlparse
+
+        profiler = self
+
+        class ProfileHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path != '/profile':
+                    self.send_error(404)
+                    return
+                try:
+                    cycles = int(parse_qs(url.query).get('cycles', [profiler.cycles])[0])
+                except ValueError:
+                    self.send_error(400, "cycles must be a number")
+                    return
+                profiler.request(max(1, cycles))
+                body = f"Profiling the next {max(1, cycles)} cycles into {profiler.directory}\n".encode()
+                self.send_response(202)
+                self.send_header("Content-Type", "text/plain")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), ProfileHandler)
+        threading.Thread(target=server.serve_forever, name="profile-server", daemon=True).start()
+        print(f"Profiles on request at http://{host}:{port}/profile")
+        return server
+
+    def wrap(self, step, pause):
+        """(step, pause) for a Supervisor that profile whole cycles when a profile was requested."""
+        def profiled_step():
+            if self._profile is None and self._requested:
+                self._start()
+            return self._run('step', step)
+
+        def profiled_pause(seconds):
+            try:
+                return self._run('pause', pause, seconds)
+            finally:
+                if self._profile is not None:
+                    self._remaining -= 1
+                    if self._remaining <= 0:
+                        self._finish()
+        return profiled_step, profiled_pause
+
+    def _start(self):
+        import cProfile
+
+        self._remaining, self._requested = self._requested, 0
+        self._profile = cProfile.Profile()
+        self._seconds = {'step': [], 'pause': []}
+        self._sink_times = self.outputs.write_times() if self.outputs is not None else {}
+        print(f"Profiling the next {self._remaining} cycles")
+
+    def _run(self, kind, function, *args):
+        if self._profile is None:
+            return function(*args)
+        started = time.perf_counter()
+        self._profile.enable()
+        try:
+            return function(*args)
+        finally:
+            self._profile.disable()
+            self._seconds[kind].append(time.perf_counter() - started)
+
+    def _finish(self):
+        import pstats
+
+        profile, self._profile = self._profile, None
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        profile.dump_stats(base + ".prof")
+        with open(base + ".txt", "w") as f:
+            stats = pstats.Stats(profile, stream=f)
+            f.write(self.summary(stats) + "\n\n")
+            stats.sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+        self.last_summary = base + ".txt"
+        print(self.summary(stats))
+        print(f"Profile saved to {base}.prof, summary in {base}.txt")
+
+    def summary(self, stats):
+        """Cycle times and the time per stage, per cycle and as a share of the step time."""
+        cycles = max(1, len(self._seconds['step']))
+        step_total = sum(self._seconds['step'])
+        lines = [
+            f"{len(self._seconds['step'])} cycles: step {1000 * step_total / cycles:.1f} ms on average "
+            f"(max {1000 * max(self._seconds['step'], default=0):.1f} ms), "
+            f"pause {1000 * sum(self._seconds['pause']) / cycles:.1f} ms (GUI events and waiting)",
+        ]
+        for stage, seconds in stage_times(stats):
+            share = 100 * seconds / step_total if step_total else 0
+            lines.append(f"  {stage:<26} {1000 * seconds / cycles:8.1f} ms/cycle  {share:5.1f}% of step")
+        if self.outputs is not None:
+            lines.append("Output sinks (their own threads, not part of the step):")
+            for name, (items, seconds) in self.outputs.write_times().items():
+                items_before, seconds_before = self._sink_times.get(name, (0, 0.0))
+                items, seconds = items - items_before, seconds - seconds_before
+                lines.append(f"  {name:<26} {1000 * seconds / cycles:8.1f} ms/cycle  ({items} writes)")
+        return '\n'.join(lines)
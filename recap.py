@@ -0,0 +1,222 @@
+"""
+Animated recap of a game, built from its recorded history.
+
+GameHistory appends every polled state of a game that changed to
+output/history/<game id>.jsonl.gz. Once the game is final, make_recap()
+walks that file one state at a time, renders each state with the
+scoreboard renderer and streams the frames straight into an animated GIF
+(or an MP4 through ffmpeg, when it is installed). Only the previous and
+the pending frame are ever held in memory, however long the game was.
+Consecutive frames that come out identical are merged into one longer
+frame, and every GIF frame after the first only stores the rectangle that
+changed.
+
+The scripts start it in a separate process when a game ends; by hand:
+
+    python recap.py GetNY NYY output/history/401.jsonl.gz recap.gif
+"""
+import gzip
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+FRAME_MS = 200            # how long each recorded state is shown
+FINAL_HOLD_MS = 5000      # the final score stays up this much longer
+MAX_GIF_FRAME_MS = 655350  # GIF delays are 16-bit centiseconds
+
+
+class GameHistory:
+    """Appends the polled states of each game to <directory>/<game id>.jsonl.gz."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, game_id):
+        return os.path.join(self.directory, f"{game_id}.jsonl.gz")
+
+    def record(self, game, at=None):
+        if not game or not game.get('id'):
+            return
+        line = json.dumps({'at': time.time() if at is None else at, 'game': game})
+        # Every append is its own gzip member; readers see one stream
+        with gzip.open(self.path(game['id']), 'at', encoding='utf-8') as f:
+            f.write(line + '\n')
+
+
+def read_history(path):
+    """Yields (timestamp, game) for every recorded state, one line at a time."""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            try:
+                state = json.loads(line)
+            except ValueError:
+                # A line cut short by a crash; skip it
+                continue
+            yield state['at'], state['game']
+
+
+def frames(history_path, render):
+    """Renders every recorded state, growing the score timeline along the way."""
+    import timeline
+
+    score_timeline = timeline.ScoreTimeline()
+    for at, game in read_history(history_path):
+        if game.get('status', {}).get('type', {}).get('state') == 'pre':
+            # The recap starts at the first pitch / tip-off
+            continue
+        score_timeline.record(game, at=at)
+        yield render(game, at, score_timeline)
+
+
+def merge_repeats(frames, frame_ms=FRAME_MS, final_hold_ms=FINAL_HOLD_MS):
+    """Yields (frame, duration in ms), folding identical consecutive frames into one."""
+    from PIL import ImageChops
+
+    pending, duration = None, 0
+    for frame in frames:
+        if pending is not None and ImageChops.difference(pending, frame).getbbox() is None:
+            duration += frame_ms
+            continue
+        if pending is not None:
+            yield pending, duration
+        pending, duration = frame, frame_ms
+    if pending is not None:
+        yield pending, duration + final_hold_ms
+
+
+class GifWriter:
+    """Writes an animated GIF frame by frame; later frames only store the changed rectangle."""
+
+    def __init__(self, path, loop=0):
+        self.path = path
+        self.loop = loop
+        self.frames = 0
+        self._fp = open(path, 'wb')
+        self._previous = None
+
+    def write(self, frame, duration_ms):
+        from PIL import GifImagePlugin, ImageChops
+
+        duration_ms = max(10, min(int(duration_ms), MAX_GIF_FRAME_MS))
+        if self._previous is None:
+            image = frame.quantize(256)
+            header, _ = GifImagePlugin.getheader(image, info={'loop': self.loop, 'duration': duration_ms})
+            chunks = header + GifImagePlugin.getdata(image, (0, 0), duration=duration_ms, disposal=1)
+        else:
+            # Each changed rectangle gets its own palette, so colours that
+            # only show up later in the game (banners, meters) stay exact
+            bbox = ImageChops.difference(self._previous, frame).getbbox() or (0, 0, 1, 1)
+            image = frame.crop(bbox).quantize(256)
+            chunks = GifImagePlugin.getdata(image, bbox[:2], duration=duration_ms, disposal=1,
+                                            include_color_table=True)
+        for chunk in chunks:
+            self._fp.write(chunk)
+        self._previous = frame
+        self.frames += 1
+
+    def close(self):
+        self._fp.write(b';')
+        self._fp.close()
+
+
+class Mp4Writer:
+    """Pipes raw frames into ffmpeg; a frame that lasts longer is repeated at the base rate."""
+
+    def __init__(self, path, frame_ms=FRAME_MS):
+        self.path = path
+        self.frame_ms = frame_ms
+        self.frames = 0
+        self._process = None
+
+    def write(self, frame, duration_ms):
+        if self._process is None:
+            width, height = frame.size
+            self._process = subprocess.Popen(
+                ['ffmpeg', '-loglevel', 'error', '-y', '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+                 '-s', f'{width}x{height}', '-r', f'{1000 / self.frame_ms:g}', '-i', '-',
+                 '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-c:v', 'libx264', '-pix_fmt', 'yuv420p', self.path],
+                stdin=subprocess.PIPE,
+            )
+        data = frame.tobytes()
+        for _ in range(max(1, round(duration_ms / self.frame_ms))):
+            self._process.stdin.write(data)
+        self.frames += 1
+
+    def close(self):
+        if self._process is None:
+            return
+        self._process.stdin.close()
+        if self._process.wait():
+            raise RuntimeError(f"ffmpeg exited with status {self._process.returncode}")
+
+
+def open_writer(path, frame_ms=FRAME_MS):
+    """A writer for `path`; an .mp4 without ffmpeg installed becomes a .gif."""
+    if path.lower().endswith('.mp4'):
+        if shutil.which('ffmpeg'):
+            return Mp4Writer(path, frame_ms)
+        path = os.path.splitext(path)[0] + '.gif'
+        print(f"ffmpeg not found; writing the recap as {path}")
+    return GifWriter(path)
+
+
+def make_recap(history_path, render, output_path, frame_ms=FRAME_MS, final_hold_ms=FINAL_HOLD_MS):
+    """Streams the recorded game into an animation; returns the path written."""
+    writer = open_writer(output_path, frame_ms)
+    try:
+        for frame, duration in merge_repeats(frames(history_path, render), frame_ms, final_hold_ms):
+            writer.write(frame, duration)
+    finally:
+        writer.close()
+    return writer.path
+
+
+def frame_renderer(script, team):
+    """
+    render(game, at, score_timeline) -> RGB image of a scoreboard script's
+    layout (see layouts.py). The footer shows the day rather than the poll
+    time, so the frames of polls that changed nothing come out identical
+    and merge_repeats() folds them.
+    """
+    import layouts
+    import schedule_index
+
+    day = lambda at: datetime.fromtimestamp(at).strftime('%a %b %d')
+    engine = layouts.LayoutScoreboard(schedule_index.sport_of(script.API_URL)[1], title=script.TITLE,
+                                      win_text=script.WIN_TEXT, no_game_text=script.NO_GAME_TEXT)
+    return lambda game, at, score_timeline: engine.render(game, team, day(at), score_timeline).convert('RGB')
+
+
+def start_recap(script_name, team, history_path, output_path):
+    """Builds the recap in a background process, so the display loop keeps running."""
+    print(f"Building the game recap {output_path}")
+    return subprocess.Popen([sys.executable, os.path.abspath(__file__), script_name, team, history_path, output_path])
+
+
+def reap(processes):
+    """Collects the recap processes that have exited (reporting failures); returns the ones still running."""
+    running = []
+    for process in processes:
+        status = process.poll()
+        if status is None:
+            running.append(process)
+        elif status:
+            print(f"The recap process {process.pid} failed with status {status}")
+    return running
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 5:
+        sys.exit("usage: python recap.py SCRIPT TEAM HISTORY OUTPUT(.gif|.mp4)")
+    import importlib
+
+    script_name, team, history_path, output_path = sys.argv[1:]
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    started = time.perf_counter()
+    path = make_recap(history_path, frame_renderer(importlib.import_module(script_name), team), output_path)
+    print(f"Recap saved to {path} in {time.perf_counter() - started:.1f} s")
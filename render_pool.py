@@ -0,0 +1,157 @@
+"""
+Renders scoreboards in a pool of warm worker processes.
+
+Fetching and parsing stay in the main process; parsed games are handed to
+worker processes that each import the scoreboard script once and draw a
+first frame to warm the font and template caches, so a slow render/save no
+longer delays the next poll. Renders for different keys (teams) run on different
+cores in parallel, while at most one render per key is in flight: if newer
+games for the same key arrive in the meantime only the latest one is kept
+(see coalesce.py) and the superseded ones are counted, never rendered.
+"""
+import contextlib
+import importlib
+import io
+import multiprocessing
+import os
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+from coalesce import LatestValueQueue
+
+# How often the main process checks for finished frames while it waits
+FRAME_POLL_SECONDS = 0.25
+# Print the queue counters every this many finished renders
+STATS_EVERY_RENDERS = 100
+
+# Per-process worker state, filled in by _init_worker
+_worker = {}
+
+
+def _init_worker(module_name):
+    """Imports the scoreboard script and warms its caches once."""
+    import bench_render
+
+    module = importlib.import_module(module_name)
+    # Draw a live game once so the fonts, text sprites and live templates are
+    # loaded before the first real render; into memory, the files in output/
+    # belong to the running scoreboard
+    with contextlib.redirect_stdout(io.StringIO()):
+        module.draw_scoreboard(None, bench_render.sample_game('in'), save_path=io.BytesIO())
+    _worker.update(module=module)
+
+
+def _render(key, game, team, save_path, score_timeline=None):
+    start = time.perf_counter()
+    settings = getattr(_worker['module'], 'settings', None)
+    if settings is not None:
+        # Titles and texts edited in the config file (see config.py)
+        settings.check()
+    _worker['module'].draw_scoreboard(None, game, team=team, save_path=save_path, score_timeline=score_timeline)
+    return key, save_path, time.perf_counter() - start
+
+
+class RenderPool:
+    """A pool of warm render processes with latest-wins scheduling per key."""
+
+    def __init__(self, module_name, workers=None):
+        # spawn rather than fork: the parent may already own a GUI window
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count() or 1,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(module_name,),
+        )
+        self.in_flight = {}
+        self.pending = LatestValueQueue()
+        self.rendered = 0
+
+    def submit(self, key, game, team, save_path, score_timeline=None):
+        """Queues a render for `key`, replacing any render still waiting for it."""
+        if key in self.in_flight:
+            self.pending.put(key, (game, team, save_path, score_timeline))
+            return
+        self._start(key, game, team, save_path, score_timeline)
+
+    def _start(self, key, game, team, save_path, score_timeline=None):
+        self.in_flight[key] = self.executor.submit(_render, key, game, team, save_path, score_timeline)
+
+    def poll(self):
+        """
+        Returns (key, save_path, seconds) for every render that finished since
+        the last call and starts the newest pending render for those keys.
+        """
+        finished = []
+        for key, future in list(self.in_flight.items()):
+            if not future.done():
+                continue
+            del self.in_flight[key]
+            try:
+                finished.append(future.result())
+            except Exception as e:
+                print(f"Render for {key} failed in the worker: {e}")
+            self.rendered += 1
+            if self.rendered % STATS_EVERY_RENDERS == 0:
+                print(f"Render queue: {self.rendered} rendered, {self.pending.stats_line()}")
+            waiting = self.pending.pop(key)
+            if waiting:
+                self._start(key, *waiting)
+        return finished
+
+    def wait_for_frames(self, seconds, on_frame, pause=time.sleep):
+        """Spends `seconds` handing finished frames to `on_frame`, pausing with `pause` in between."""
+        deadline = time.monotonic() + seconds
+        while True:
+            for result in self.poll():
+                on_frame(*result)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            pause(min(remaining, FRAME_POLL_SECONDS))
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class FrameView:
+    """Shows frames rendered by the pool in the main window with a single image artist."""
+
+    def __init__(self, fig):
+        self.fig = fig
+        self.image = None
+        self.frame = None
+
+    def show(self, path):
+        import numpy as np
+        from PIL import Image
+
+        with Image.open(path) as image:
+            self.show_frame(np.asarray(image.convert('RGB')))
+
+    def showing(self):
+        """True while the last frame is still what the window shows (no other drawing cleared it)."""
+        return self.image is not None and self.image.axes in self.fig.axes
+
+    def show_frame(self, frame):
+        """Shows an RGB image array (e.g. a frame drawn with Pillow) in the window."""
+        self.frame = frame
+        if not self.showing():
+            self.fig.clf()
+            ax = self.fig.add_axes([0, 0, 1, 1])
+            ax.axis('off')
+            self.image = ax.imshow(frame)
+        else:
+            self.image.set_data(frame)
+        self.fig.canvas.draw_idle()
+
+
+_views = weakref.WeakKeyDictionary()
+
+
+def frame_view(fig):
+    """The figure's FrameView, created on first use."""
+    view = _views.get(fig)
+    if view is None:
+        view = _views[fig] = FrameView(fig)
+    return view
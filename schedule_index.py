@@ -0,0 +1,196 @@
+"""
+Schedule index: who plays when, fetched once a day.
+
+The scripts used to find out there is no game by polling the live
+scoreboard every 10 seconds all day. A ScheduleIndex fetches the next few
+days' slates once a day through the scoreboard's ?dates=YYYYMMDD parameter
+and keeps a compact index, (date, team) -> [{id, start, opponent, home}],
+in output/schedule_<sport>_<league>.json. poll_gate() turns it into game
+windows for the Supervisor: from PREGAME_MINUTES before a start until
+GAME_HOURS after it the scoreboard is polled as before, outside them the
+display idles until the next window opens.
+
+The daily refresh runs on a background thread, so the gate never keeps
+the loop waiting on ESPN. Until it has succeeded for the day the gate stays
+open, i.e. the scripts poll like they did without it, and a failed refresh
+is retried with exponential backoff rather than on every tick.
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import supervisor
+
+DAYS_AHEAD = 7
+RETRY_BASE_SECONDS = 60
+RETRY_MAX_SECONDS = 3600
+PREGAME_MINUTES = 60
+# How long after the start a game may still be on, per sport (rain delays,
+# extra innings and overtime included)
+GAME_HOURS = {'baseball': 5, 'basketball': 3.5, 'football': 4.5, 'hockey': 3.5}
+DEFAULT_GAME_HOURS = 4
+
+
+def sport_of(api_url):
+    """('baseball', 'mlb') for .../sports/baseball/mlb/scoreboard."""
+    parts = api_url.rstrip('/').split('/')
+    index = parts.index('sports') if 'sports' in parts else len(parts) - 3
+    return parts[index + 1], parts[index + 2]
+
+
+def index_path(directory, api_url):
+    return os.path.join(directory, "schedule_{}_{}.json".format(*sport_of(api_url)))
+
+
+def parse_start(value):
+    """An ESPN date ('2026-10-19T23:05Z') as a naive local datetime, like datetime.now()."""
+    for fmt in ('%Y-%m-%dT%H:%MZ', '%Y-%m-%dT%H:%M:%SZ'):
+        try:
+            return datetime.strptime(value, fmt).replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def index_day(json_data):
+    """{team: [{id, start, opponent, home}, ...]} for one day's scoreboard payload."""
+    teams = {}
+    for event in (json_data or {}).get('events', []):
+        game = event.get('competitions', [{}])[0]
+        competitors = game.get('competitors', [])
+        for competitor in competitors:
+            team = competitor.get('team', {}).get('abbreviation')
+            opponent = next((c.get('team', {}).get('abbreviation') for c in competitors if c is not competitor), None)
+            if team:
+                teams.setdefault(team, []).append({
+                    'id': event.get('id'), 'start': game.get('date') or event.get('date'),
+                    'opponent': opponent, 'home': competitor.get('homeAway') == 'home',
+                })
+    return teams
+
+
+class ScheduleIndex:
+    def __init__(self, api_url, path, headers=None, days_ahead=DAYS_AHEAD):
+        self.api_url = api_url
+        self.path = path
+        self.headers = headers
+        self.days_ahead = days_ahead
+        self.fetched_on = None
+        self.days = {}   # 'YYYY-MM-DD' -> index_day()
+        self._refreshing = None   # the background refresh thread, while it runs
+        self._retry_at = 0.0      # monotonic time before which a failed refresh is not retried
+        self._backoff = supervisor.Backoff(RETRY_BASE_SECONDS, RETRY_MAX_SECONDS)
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.fetched_on, self.days = saved.get('fetched_on'), saved.get('days', {})
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({'fetched_on': self.fetched_on, 'days': self.days}, f)
+        os.replace(tmp_path, self.path)
+
+    def fetch_day(self, day):
+        import requests
+
+        response = requests.get(self.api_url, params={'dates': day.strftime('%Y%m%d')},
+                                headers=self.headers, timeout=10)
+        response.raise_for_status()
+        return response.json()
+
+    def refresh(self, today=None):
+        """Fetches yesterday (games past midnight) through DAYS_AHEAD days from today."""
+        today = today or datetime.now().date()
+        days = {}
+        for offset in range(-1, self.days_ahead):
+            day = today + timedelta(days=offset)
+            days[day.isoformat()] = index_day(self.fetch_day(day))
+        self.days, self.fetched_on = days, today.isoformat()
+        self.save()
+        print(f"Schedule for {len(days)} days saved to {self.path}")
+
+    def ensure_fresh(self, today=None):
+        """
+        Starts the day's refresh in the background if it is due; returns
+        False while there is no index for today (being fetched or failed).
+        """
+        today = today or datetime.now().date()
+        if self.fetched_on == today.isoformat():
+            return True
+        if self._refreshing is None and time.monotonic() >= self._retry_at:
+            self._refreshing = threading.Thread(target=self._refresh_in_background, args=(today,),
+                                                name="schedule-refresh", daemon=True)
+            self._refreshing.start()
+        return False
+
+    def _refresh_in_background(self, today):
+        try:
+            self.refresh(today)
+            self._backoff.reset()
+        except Exception as e:
+            delay = self._backoff.next_delay()
+            self._retry_at = time.monotonic() + delay
+            print(f"Could not fetch the schedule: {e} (retrying in {delay:.0f}s)")
+        finally:
+            self._refreshing = None
+
+    def games(self, day, team=None):
+        """The games on `day` (a date or 'YYYY-MM-DD'), of `team` or of everyone."""
+        teams = self.days.get(day if isinstance(day, str) else day.isoformat(), {})
+        if team is not None:
+            return list(teams.get(team, []))
+        seen, games = set(), []
+        for entries in teams.values():
+            for entry in entries:
+                if entry['id'] not in seen:
+                    seen.add(entry['id'])
+                    games.append(entry)
+        return games
+
+    def windows(self, teams=None, pregame_minutes=PREGAME_MINUTES, game_hours=None):
+        """Sorted (open, close) datetimes of every indexed game of `teams` (None: all teams)."""
+        if game_hours is None:
+            game_hours = GAME_HOURS.get(sport_of(self.api_url)[0], DEFAULT_GAME_HOURS)
+        windows = set()
+        for day in self.days:
+            for team in (teams or [None]):
+                for entry in self.games(day, team):
+                    start = parse_start(entry.get('start'))
+                    if start:
+                        windows.add((start - timedelta(minutes=pregame_minutes), start + timedelta(hours=game_hours)))
+        return sorted(windows)
+
+    def next_game(self, team=None, now=None):
+        """(start, entry) of the next game of `team` that has not finished, or None."""
+        now = now or datetime.now()
+        for day in sorted(self.days):
+            for entry in sorted(self.games(day, team), key=lambda entry: entry.get('start') or ''):
+                start = parse_start(entry.get('start'))
+                if start and start + timedelta(hours=DEFAULT_GAME_HOURS) > now:
+                    return start, entry
+        return None
+
+    def poll_gate(self, teams=None):
+        """
+        A Supervisor gate: gate(now) is None inside a game window (poll),
+        else the time the next window opens (or tomorrow, to fetch the
+        schedule again, when no game is indexed).
+        """
+        def gate(now):
+            if not self.ensure_fresh(now.date()):
+                return None
+            tomorrow = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+            for opens, closes in self.windows(teams):
+                if closes <= now:
+                    continue
+                return None if opens <= now else min(opens, tomorrow)
+            return tomorrow
+        return gate
@@ -0,0 +1,93 @@
+"""
+Upstream responses shared between scoreboard processes on one host.
+
+GetNY.py, its copies for other teams and the NBA scripts each poll ESPN on
+their own, although the ones for the same league ask for the same URL. A
+SharedCache keeps each response in a file named after the URL. A process
+that finds the file fresh (younger than the TTL) just reads it; the first
+one to find it expired takes an exclusive lock, fetches and writes the new
+copy while the others wait on the lock and then read what it wrote. N
+processes cost one request per TTL instead of N. Failures are cached too,
+so a failing ESPN is not asked N times either.
+
+Locking uses fcntl.flock; where that does not exist (Windows) every process
+simply fetches for itself when the file is expired.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+CACHE_DIR = os.path.join(tempfile.gettempdir(), "scoreboard_cache")
+DEFAULT_TTL = 8  # seconds; a little under the scripts' 10 s poll
+
+
+class CachedError(IOError):
+    """Another process failed to fetch this URL within the TTL."""
+
+
+class SharedCache:
+    def __init__(self, directory=CACHE_DIR, ttl=DEFAULT_TTL):
+        self.directory = directory
+        self.ttl = ttl
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode()).hexdigest()[:16] + ".json")
+
+    def _read_fresh(self, path, ttl):
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get('fetched_at', 0) >= ttl:
+            return None
+        return entry
+
+    def _answer(self, entry):
+        if entry.get('error'):
+            age = time.time() - entry['fetched_at']
+            raise CachedError(f"{entry['error']} (cached from {age:.0f} s ago)")
+        return entry['payload']
+
+    def get(self, url, fetch, ttl=None):
+        """
+        The payload for `url`: from the cache file while it is fresh, else
+        from `fetch()` (called by one process at a time). Exceptions raised
+        by fetch are cached as well and re-raised as CachedError by readers.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        path = self.path(url)
+        entry = self._read_fresh(path, ttl)
+        if entry is not None:
+            return self._answer(entry)
+
+        with open(path + ".lock", "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            # Whoever held the lock before us may just have refreshed it
+            entry = self._read_fresh(path, ttl)
+            if entry is not None:
+                return self._answer(entry)
+            entry = {'url': url, 'fetched_at': time.time()}
+            try:
+                entry['payload'] = fetch()
+            except Exception as e:
+                entry['error'] = f"{type(e).__name__}: {e}"
+                self._write(path, entry)
+                raise
+            self._write(path, entry)
+            return entry['payload']
+
+    def _write(self, path, entry):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
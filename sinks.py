@@ -0,0 +1,327 @@
+"""
+Output sinks: every frame, payload and game handed over once and written
+to all outputs concurrently.
+
+The scripts used to write scoreboard_data.json and scoreboard.png inline,
+in the fetch and render functions, so a slow disk (an NFS share, an SD
+card) delayed the next poll and everything else that was written after
+it. A Fanout gives every sink its own thread and a small bounded queue:
+publish() only enqueues. When a sink falls behind, a newer item for the
+same output replaces the queued one, and when its queue is full the oldest
+item is dropped, so the loop and the other sinks never wait on it.
+
+Items are (kind, key, item): FRAME is an RGB PIL image to be saved as
+`key` (the PNG path), PAYLOAD the scoreboard JSON for `key` (its path),
+GAME one team's game, keyed by the team. Payloads and games are turned
+into JSON text by publish(), on the caller's thread: the loop keeps adding
+fields to the games it published (form, recent plays, win probability),
+and the sinks must write them as they were. Sinks:
+
+- FileSink: the files in output/, written atomically,
+- FrameDiffSink: dirty-rectangle updates for remote displays (frame_diff.py),
+- FramebufferSink: a Linux framebuffer device such as /dev/fb0,
+- HttpSink: the latest frames and payloads over HTTP (with ETags) and a
+  server-sent event stream of game updates at /events.
+
+Published frames are shared between the sinks and must not be changed
+afterwards.
+"""
+import abc
+import collections
+import io
+import json
+import os
+import threading
+import time
+
+FRAME, PAYLOAD, GAME = 'frame', 'payload', 'game'
+QUEUE_SIZE = 4
+CLOSE_TIMEOUT_SECONDS = 5
+
+
+def figure_image(fig):
+    """The figure as drawn on its canvas, as an RGB image (draws it first)."""
+    import numpy as np
+    from PIL import Image
+
+    fig.canvas.draw()
+    return Image.fromarray(np.array(fig.canvas.buffer_rgba())[..., :3])
+
+
+def png_bytes(image, compress_level=6):
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG', compress_level=compress_level)
+    return buffer.getvalue()
+
+
+def _write_atomic(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class Sink(abc.ABC):
+    """An output. write() runs on the sink's own thread, one item at a time."""
+    kinds = (FRAME, PAYLOAD, GAME)
+    name = 'sink'
+
+    @abc.abstractmethod
+    def write(self, kind, key, item):
+        """Writes one item (see the module docstring for the kinds)."""
+
+    def close(self):
+        pass
+
+
+class FileSink(Sink):
+    """Frames as PNG and payloads as JSON at the paths they are keyed by."""
+    kinds = (FRAME, PAYLOAD)
+    name = 'files'
+
+    def __init__(self, compress_level=6):
+        self.compress_level = compress_level
+
+    def write(self, kind, key, item):
+        if kind == FRAME:
+            _write_atomic(key, png_bytes(item, self.compress_level))
+            print(f"Scoreboard image saved to {key}")
+        else:
+            _write_atomic(key, item.encode())
+            print(f"Successfully saved latest data to {key}")
+
+
+class FrameDiffSink(Sink):
+    """Publishes frames for remote displays; `publishers` maps a frame's path to its FramePublisher."""
+    kinds = (FRAME,)
+    name = 'frame diffs'
+
+    def __init__(self, publishers):
+        self.publishers = publishers
+
+    def write(self, kind, key, item):
+        publisher = self.publishers.get(key)
+        if publisher is None:
+            return
+        written = publisher.publish(item)
+        if written:
+            print(f"Frame update {publisher.seq} published ({written} bytes)")
+
+
+class FramebufferSink(Sink):
+    """Shows the frames of one path on a Linux framebuffer (16 or 32 bits per pixel)."""
+    kinds = (FRAME,)
+    name = 'framebuffer'
+
+    def __init__(self, device='/dev/fb0', key=None):
+        self.device = device
+        self.key = key
+        sysfs = os.path.join('/sys/class/graphics', os.path.basename(device))
+        with open(os.path.join(sysfs, 'virtual_size')) as f:
+            self.size = tuple(int(v) for v in f.read().strip().split(','))
+        with open(os.path.join(sysfs, 'bits_per_pixel')) as f:
+            self.bits_per_pixel = int(f.read())
+        if self.bits_per_pixel not in (16, 32):
+            raise ValueError(f"{device}: {self.bits_per_pixel} bits per pixel is not supported")
+
+    def write(self, kind, key, item):
+        import numpy as np
+
+        if self.key is not None and key != self.key:
+            return
+        image = item if item.size == self.size else item.resize(self.size)
+        if self.bits_per_pixel == 32:
+            data = image.convert('RGB').tobytes('raw', 'BGRX')
+        else:
+            rgb = np.asarray(image.convert('RGB'), dtype=np.uint16)
+            data = (((rgb[..., 0] >> 3) << 11) | ((rgb[..., 1] >> 2) << 5) | (rgb[..., 2] >> 3)).astype('<u2').tobytes()
+        with open(self.device, 'r+b', buffering=0) as fb:
+            fb.write(data)
+
+
+class HttpSink(Sink):
+    """
+    Serves the latest frame and payload of every path as /<file name> (with
+    an ETag, so unchanged polls cost a 304) and pushes game updates to
+    clients of /events as server-sent events.
+    """
+    name = 'http'
+
+    def __init__(self, port, host=''):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        self.files = {}      # file name -> (content type, bytes, etag)
+        self.version = 0
+        self.games = {}      # team -> last game JSON
+        self.changed = threading.Condition()
+        sink = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                name = self.path.split('?')[0].lstrip('/')
+                if name == 'events':
+                    sink._stream(self)
+                    return
+                entry = sink.files.get(name)
+                if entry is None:
+                    self.send_error(404)
+                    return
+                content_type, body, etag = entry
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name="sink-http-server", daemon=True).start()
+        print(f"Serving the latest scoreboard on port {port}")
+
+    def write(self, kind, key, item):
+        if kind == GAME:
+            with self.changed:
+                self.games[key] = f'{{"team": {json.dumps(key)}, "game": {item}}}'
+                self.version += 1
+                self.changed.notify_all()
+            return
+        if kind == FRAME:
+            entry = ('image/png', png_bytes(item, 1))
+        else:
+            entry = ('application/json', item.encode())
+        self.version += 1
+        self.files[os.path.basename(key)] = entry + (f'"{self.version}"',)
+
+    def _stream(self, handler):
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.send_header("Cache-Control", "no-cache")
+        handler.end_headers()
+        sent = {}
+        try:
+            while True:
+                with self.changed:
+                    self.changed.wait_for(lambda: any(sent.get(t) is not g for t, g in self.games.items()), timeout=30)
+                    pending = [(t, g) for t, g in self.games.items() if sent.get(t) is not g]
+                for team, data in pending:
+                    handler.wfile.write(f"data: {data}\n\n".encode())
+                    sent[team] = data
+                if not pending:
+                    # Keeps proxies from closing an idle stream
+                    handler.wfile.write(b": keep-alive\n\n")
+                handler.wfile.flush()
+        except OSError:
+            pass
+
+    def close(self):
+        self.server.shutdown()
+
+
+class _SinkQueue:
+    """One sink's bounded queue and thread."""
+
+    def __init__(self, sink, size):
+        self.sink = sink
+        self.size = size
+        self.queue = collections.deque()
+        self.condition = threading.Condition()
+        self.busy = False
+        self.closing = False
+        self.written = self.dropped = self.failures = 0
+        self.seconds = 0.0   # spent in write()
+        self.thread = threading.Thread(target=self._run, name=f"sink-{sink.name}", daemon=True)
+        self.thread.start()
+
+    def put(self, kind, key, item):
+        with self.condition:
+            for i, (queued_kind, queued_key, _) in enumerate(self.queue):
+                if (queued_kind, queued_key) == (kind, key):
+                    # Only the newest version of an output is worth writing
+                    self.queue[i] = (kind, key, item)
+                    self.dropped += 1
+                    return
+            if len(self.queue) >= self.size:
+                self.queue.popleft()
+                self.dropped += 1
+            self.queue.append((kind, key, item))
+            self.condition.notify()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.queue or self.closing)
+                if not self.queue:
+                    return
+                kind, key, item = self.queue.popleft()
+                self.busy = True
+            started = time.perf_counter()
+            try:
+                self.sink.write(kind, key, item)
+                self.written += 1
+            except Exception as e:
+                self.failures += 1
+                print(f"Output {self.sink.name} failed for {key}: {e}")
+            finally:
+                self.seconds += time.perf_counter() - started
+                with self.condition:
+                    self.busy = False
+                    self.condition.notify_all()
+
+    def flush(self, timeout=None):
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.queue and not self.busy, timeout)
+
+    def close(self, timeout=None):
+        with self.condition:
+            self.closing = True
+            self.condition.notify_all()
+        self.thread.join(timeout)
+        self.sink.close()
+
+
+class Fanout:
+    """Hands every published item to each sink that takes its kind, without waiting for any of them."""
+
+    def __init__(self, sinks=(), queue_size=QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._queues = []
+        for sink in sinks:
+            self.add(sink)
+
+    def add(self, sink):
+        self._queues.append(_SinkQueue(sink, self.queue_size))
+        return sink
+
+    def publish(self, kind, key, item):
+        queues = [queue for queue in self._queues if kind in queue.sink.kinds]
+        if queues and kind != FRAME:
+            # JSON text as of now: the loop changes payloads and games after publishing them
+            item = json.dumps(item, indent=4 if kind == PAYLOAD else None)
+        for queue in queues:
+            queue.put(kind, key, item)
+
+    def flush(self, timeout=None):
+        """Waits until every sink has written what was published so far."""
+        return all(queue.flush(timeout) for queue in self._queues)
+
+    def close(self, timeout=CLOSE_TIMEOUT_SECONDS):
+        """Writes what is still queued (up to `timeout` per sink) and stops the sinks."""
+        for queue in self._queues:
+            queue.close(timeout)
+
+    def stats(self):
+        """{sink name: (written, dropped, failed)}."""
+        return {queue.sink.name: (queue.written, queue.dropped, queue.failures) for queue in self._queues}
+
+    def write_times(self):
+        """{sink name: (items written or failed, seconds spent writing them)} so far."""
+        return {queue.sink.name: (queue.written + queue.failures, queue.seconds) for queue in self._queues}
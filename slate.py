@@ -0,0 +1,275 @@
+"""
+Full-slate scoreboard: every game of the night as a grid of cards, drawn
+with Pillow the same way GetNBA.html lays them out in the browser.
+
+The grid geometry only depends on the number of games, so it is computed
+once per game count and cached. Each card is rendered to its own RGBA tile
+and cached under the values it shows; the slate canvas is kept between
+cycles and only the cards whose game changed are drawn and pasted again.
+"""
+import os
+from collections import namedtuple
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFont
+
+import fonts
+import upstream
+
+try:
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+except NameError:
+    # Fallback for interactive environments
+    script_dir = os.getcwd()
+
+# --- Configuration ---
+CANVAS_SIZE = (1920, 1080)
+LOGO_DIR = os.path.join(script_dir, "logos")
+BACKGROUND_PATH = os.path.join(script_dir, "gggg.png")
+MAX_GAMES = 12          # like GetNBA.html: with more games only the active ones are shown
+GRID_GAP = 24
+GRID_WIDTH = 0.9        # share of the canvas width used by the grid
+TITLE_HEIGHT = 150
+CARD_RADIUS = 32
+
+# Colours from GetNBA.html
+CARD_FILL = (123, 183, 201, 85)
+CARD_BORDER = (255, 255, 255, 28)
+LIVE_CARD_FILL = (125, 109, 61, 40)
+LIVE_CARD_BORDER = (255, 255, 255, 46)
+WIN_COLOR = '#26FF00'
+LOSE_COLOR = '#FF2222'
+LIVE_STATUS_COLOR = '#FFD700'
+
+Layout = namedtuple('Layout', ['cols', 'rows', 'tile_size', 'positions', 'logo_size', 'score_size', 'status_size'])
+
+
+def card_style(num_games):
+    """(columns, card height, logo size, score font size): the breakpoints of GetNBA.html."""
+    if num_games >= 9:
+        return (4 if num_games > 9 else 3), 180, 90, 42
+    if num_games in (1, 2):
+        return num_games, 480, 240, 90
+    if num_games in (3, 4):
+        return 2, 320, 160, 60
+    if num_games in (5, 6):
+        return 3, 320, 160, 60
+    return 4, 320, 160, 60
+
+
+@lru_cache(maxsize=None)
+def compute_layout(num_games, canvas_size=CANVAS_SIZE):
+    """Card positions and sizes for `num_games` cards, computed once per count."""
+    width, height = canvas_size
+    cols, card_height, logo_size, score_size = card_style(max(1, num_games))
+    rows = max(1, -(-num_games // cols))
+    tile_width = int((width * GRID_WIDTH - GRID_GAP * (cols - 1)) / cols)
+
+    # Shrink the cards (never grow them) if the rows do not fit under the title
+    available = height - TITLE_HEIGHT - 2 * GRID_GAP
+    needed = rows * card_height + (rows - 1) * GRID_GAP
+    if needed > available:
+        scale = (available - (rows - 1) * GRID_GAP) / (rows * card_height)
+        card_height = int(card_height * scale)
+        logo_size, score_size = int(logo_size * scale), int(score_size * scale)
+        needed = rows * card_height + (rows - 1) * GRID_GAP
+    status_size = 32 if card_height >= 240 else 24
+    # A card needs room for the logos side by side, and for the score and
+    # status line under them
+    logo_size = min(logo_size, tile_width // 3, card_height - score_size - status_size - 40)
+
+    left = (width - cols * tile_width - (cols - 1) * GRID_GAP) // 2
+    top = TITLE_HEIGHT + (height - TITLE_HEIGHT - needed) // 2
+    positions = tuple(
+        (left + (i % cols) * (tile_width + GRID_GAP), top + (i // cols) * (card_height + GRID_GAP))
+        for i in range(num_games)
+    )
+    return Layout(cols, rows, (tile_width, card_height), positions, logo_size, score_size, status_size)
+
+
+@lru_cache(maxsize=None)
+def font(size):
+    return ImageFont.truetype(fonts.font_file('bold'), size)
+
+
+@lru_cache(maxsize=None)
+def logo(abbreviation, size):
+    """A team logo from logos/ scaled to `size`, or None if there is no file for the team."""
+    path = os.path.join(LOGO_DIR, f"{abbreviation}.png")
+    if not os.path.exists(path):
+        return None
+    image = Image.open(path).convert('RGBA')
+    image.thumbnail((size, size), Image.LANCZOS)
+    return image
+
+
+def slate_games(json_data, limit=MAX_GAMES):
+    """
+    The games to show, in GetNBA.html's order: games not yet final first, then
+    finals, each by start time. With more than `limit` games only the
+    unfinished ones are shown.
+    """
+    events = (json_data or {}).get('events', [])
+    active, final = [], []
+    for event in events[:limit]:
+        game = event.get('competitions', [{}])[0]
+        completed = game.get('status', {}).get('type', {}).get('completed')
+        (final if completed else active).append(game)
+    active.sort(key=lambda game: game.get('date', ''))
+    final.sort(key=lambda game: game.get('date', ''))
+    return active if len(events) > limit else active + final
+
+
+def slate_title(json_data):
+    leagues = (json_data or {}).get('leagues') or [{}]
+    abbreviation = leagues[0].get('abbreviation')
+    title = f"{abbreviation} Scoreboard - DC Hype" if abbreviation else "Scoreboard - DC Hype"
+    if upstream.is_stale(json_data):
+        title += f" ({json_data[upstream.STALE_MINUTES_KEY]} min old)"
+    return title
+
+
+def card_values(game):
+    """Everything a card shows; two games with the same values share a tile."""
+    competitors = game.get('competitors', [])
+    away = next((c for c in competitors if c.get('homeAway') == 'away'), {})
+    home = next((c for c in competitors if c.get('homeAway') == 'home'), {})
+    status_type = game.get('status', {}).get('type', {})
+    return (
+        away.get('team', {}).get('abbreviation', ''), str(away.get('score') or '0'),
+        home.get('team', {}).get('abbreviation', ''), str(home.get('score') or '0'),
+        status_type.get('shortDetail', ''), status_type.get('state') == 'in', bool(status_type.get('completed')),
+    )
+
+
+def _score_colors(away_score, home_score, completed):
+    if not completed:
+        return 'white', 'white'
+    try:
+        away, home = int(away_score), int(home_score)
+    except ValueError:
+        return 'white', 'white'
+    if away > home:
+        return WIN_COLOR, LOSE_COLOR
+    if home > away:
+        return LOSE_COLOR, WIN_COLOR
+    return 'white', 'white'
+
+
+def render_tile(values, layout):
+    """Draws one game card as an RGBA tile."""
+    away_team, away_score, home_team, home_score, detail, live, completed = values
+    width, height = layout.tile_size
+    tile = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(tile)
+    draw.rounded_rectangle(
+        (0, 0, width - 1, height - 1), radius=CARD_RADIUS,
+        fill=LIVE_CARD_FILL if live else CARD_FILL, outline=LIVE_CARD_BORDER if live else CARD_BORDER, width=2,
+    )
+
+    score_font = font(max(8, layout.score_size))
+    away_color, home_color = _score_colors(away_score, home_score, completed)
+    logo_top = max(8, int(height * 0.08))
+    for center, team, score, color in ((width * 0.3, away_team, away_score, away_color),
+                                       (width * 0.7, home_team, home_score, home_color)):
+        image = logo(team, layout.logo_size)
+        if image is not None:
+            tile.alpha_composite(image, (int(center - image.width / 2), logo_top + (layout.logo_size - image.height) // 2))
+        else:
+            draw.text((center, logo_top + layout.logo_size / 2), team, font=font(max(8, layout.logo_size // 3)),
+                      fill='white', anchor='mm')
+        draw.text((center, logo_top + layout.logo_size + 8), score, font=score_font, fill=color, anchor='mt')
+
+    status_font = font(layout.status_size)
+    draw.text((width / 2, height - max(12, int(height * 0.06))), detail, font=status_font,
+              fill=LIVE_STATUS_COLOR if live else 'white', anchor='mb')
+    return tile
+
+
+@lru_cache(maxsize=4)
+def background(canvas_size=CANVAS_SIZE, title=None):
+    """gggg.png cover-scaled under GetNBA.html's dark gradient, with the title."""
+    width, height = canvas_size
+    if os.path.exists(BACKGROUND_PATH):
+        image = Image.open(BACKGROUND_PATH).convert('RGBA')
+        scale = max(width / image.width, height / image.height)
+        image = image.resize((int(image.width * scale + 0.5), int(image.height * scale + 0.5)), Image.LANCZOS)
+        left, top = (image.width - width) // 2, (image.height - height) // 2
+        image = image.crop((left, top, left + width, top + height))
+    else:
+        image = Image.new('RGBA', canvas_size, (127, 127, 127, 255))
+
+    # linear-gradient(rgba(34,34,34,0.7), rgb(57,57,57))
+    gradient = Image.new('RGBA', (1, height))
+    for y in range(height):
+        t = y / max(1, height - 1)
+        shade = int(34 + (57 - 34) * t)
+        gradient.putpixel((0, y), (shade, shade, shade, int(255 * (0.7 + 0.3 * t))))
+    image.alpha_composite(gradient.resize(canvas_size))
+
+    if title:
+        draw = ImageDraw.Draw(image)
+        draw.text((width / 2 + 2, 64), title, font=font(58), fill='black', anchor='mm')
+        draw.text((width / 2, 60), title, font=font(58), fill='white', anchor='mm')
+    return image
+
+
+class SlateRenderer:
+    """Keeps the slate canvas between cycles and redraws only the cards that changed."""
+
+    def __init__(self, canvas_size=CANVAS_SIZE, max_tiles=64):
+        self.canvas_size = canvas_size
+        self.max_tiles = max_tiles
+        self.canvas = None
+        self._frame = None       # (layout, title) the canvas was built for
+        self._slots = []         # values currently shown in each slot
+        self._tiles = {}         # (values, tile size) -> tile
+        self.changed = False     # whether the last render() touched the canvas
+        self.tiles_rendered = 0
+        self.tiles_pasted = 0
+
+    def reset(self):
+        """Forgets the canvas, so the next render starts from the background."""
+        self._frame = None
+
+    def tile(self, values, layout):
+        key = (values, layout.tile_size, layout.logo_size, layout.score_size)
+        tile = self._tiles.get(key)
+        if tile is None:
+            if len(self._tiles) >= self.max_tiles:
+                # Old scores never come back; start over rather than track ages
+                self._tiles.clear()
+            tile = self._tiles[key] = render_tile(values, layout)
+            self.tiles_rendered += 1
+        return tile
+
+    def render(self, games, title=None):
+        """Brings the canvas up to date with `games` and returns it (an RGBA image)."""
+        layout = compute_layout(len(games), self.canvas_size)
+        base = background(self.canvas_size, title)
+        self.changed = False
+        if self._frame != (layout, title):
+            # Different number of games or league: start from a clean background
+            self.canvas = base.copy()
+            self._frame = (layout, title)
+            self._slots = [None] * len(games)
+            self.changed = True
+            if not games:
+                ImageDraw.Draw(self.canvas).text(
+                    (self.canvas_size[0] / 2, self.canvas_size[1] / 2), "No games found.",
+                    font=font(48), fill='white', anchor='mm')
+
+        width, height = layout.tile_size
+        for slot, game in enumerate(games):
+            values = card_values(game)
+            if self._slots[slot] == values:
+                continue
+            x, y = layout.positions[slot]
+            box = (x, y, x + width, y + height)
+            region = base.crop(box)
+            region.alpha_composite(self.tile(values, layout))
+            self.canvas.paste(region, box)
+            self._slots[slot] = values
+            self.tiles_pasted += 1
+            self.changed = True
+        return self.canvas
@@ -0,0 +1,156 @@
+"""
+Records, splits, last 10, differential and streaks from the season archive.
+
+A Standings object holds one league's season of results (one row per team
+and game from archive.py's team_games table) in preallocated NumPy arrays
+that double when full. load() only reads rows added since the last call,
+so picking up a new final is one small indexed query. table() computes
+every aggregate for all teams at once with bincount/lexsort instead of
+looping over games per team, and is cached until new results arrive.
+
+attach_form() puts the two teams' lines on a scheduled game as
+game['teamForm'], which the pre-game screens show.
+"""
+import numpy as np
+
+INITIAL_CAPACITY = 1024
+LAST_N = 10
+# team, opponent, home, score, opponent score, start (minutes since the epoch)
+_TEAM, _OPPONENT, _HOME, _SCORE, _AGAINST, _START = range(6)
+
+
+class Standings:
+    def __init__(self, league=None, capacity=INITIAL_CAPACITY):
+        self.league = league
+        self.season = None
+        self.reset(capacity)
+
+    def reset(self, capacity=INITIAL_CAPACITY):
+        self.teams = []
+        self._team_index = {}
+        self._data = np.zeros((6, capacity), dtype=np.int64)
+        self._size = 0
+        self._seen = set()
+        self._last_rowid = 0
+        self._table = None
+
+    def __len__(self):
+        return self._size
+
+    def _index(self, team):
+        index = self._team_index.get(team)
+        if index is None:
+            index = self._team_index[team] = len(self.teams)
+            self.teams.append(team)
+        return index
+
+    def add(self, game_id, team, opponent, date, home, score, opponent_score):
+        """Adds one team's result of one game; duplicates and games without a score are ignored."""
+        if score is None or opponent_score is None or (game_id, team) in self._seen:
+            return False
+        self._seen.add((game_id, team))
+        if self._size == self._data.shape[1]:
+            grown = np.zeros((6, 2 * self._size), dtype=np.int64)
+            grown[:, :self._size] = self._data[:, :self._size]
+            self._data = grown
+        start = np.datetime64((date or '1970-01-01')[:16].rstrip('Z'), 'm').astype(np.int64)
+        self._data[:, self._size] = (self._index(team), self._index(opponent), bool(home), score, opponent_score, start)
+        self._size += 1
+        self._table = None
+        return True
+
+    def load(self, archive):
+        """Reads the results archived since the last call (of the league's latest season)."""
+        conn = archive.conn
+        season = conn.execute("SELECT MAX(season) FROM games WHERE league IS ?", (self.league,)).fetchone()[0]
+        if season != self.season:
+            # New season (or the first load): start over
+            self.reset()
+            self.season = season
+        rows = conn.execute(
+            "SELECT t.rowid, t.game_id, t.team, t.opponent, t.date, t.home, t.score, t.opponent_score "
+            "FROM team_games t JOIN games g ON g.id = t.game_id "
+            "WHERE t.rowid > ? AND t.league IS ? AND g.season IS ? ORDER BY t.rowid",
+            (self._last_rowid, self.league, season),
+        ).fetchall()
+        added = 0
+        for row in rows:
+            added += self.add(*tuple(row)[1:])
+            self._last_rowid = max(self._last_rowid, row[0])
+        return added
+
+    def table(self):
+        """Arrays indexed like self.teams: wins, losses, home/away W-L, last-N W-L, differential, streak."""
+        if self._table is not None:
+            return self._table
+        n, count = self._size, len(self.teams)
+        team, home = self._data[_TEAM, :n], self._data[_HOME, :n].astype(bool)
+        margin = self._data[_SCORE, :n] - self._data[_AGAINST, :n]
+        won, lost = margin > 0, margin < 0
+        tally = lambda mask: np.bincount(team, weights=mask, minlength=count).astype(int)
+
+        # Each team's games in date order, one block per team
+        order = np.lexsort((self._data[_START, :n], team))
+        sorted_team, result = team[order], np.sign(margin[order])
+        games = np.bincount(team, minlength=count)
+        ends = np.cumsum(games)
+        recent = (ends[sorted_team] - 1 - np.arange(n)) < LAST_N
+        recent_tally = lambda mask: np.bincount(sorted_team, weights=mask & recent, minlength=count).astype(int)
+
+        # Streak: length of the run of equal results at the end of each block
+        change = np.ones(n, dtype=bool)
+        change[1:] = (result[1:] != result[:-1]) | (sorted_team[1:] != sorted_team[:-1])
+        run_start = np.maximum.accumulate(np.where(change, np.arange(n), 0))
+        last = np.maximum(ends - 1, 0)
+        has_games = games > 0
+        streak = np.where(has_games, last - run_start[last] + 1, 0) if n else np.zeros(count, dtype=int)
+        streak_kind = np.where(has_games, result[last], 0) if n else np.zeros(count, dtype=int)
+
+        self._table = {
+            'wins': tally(won), 'losses': tally(lost),
+            'home_wins': tally(won & home), 'home_losses': tally(lost & home),
+            'away_wins': tally(won & ~home), 'away_losses': tally(lost & ~home),
+            'last_wins': recent_tally(won[order]), 'last_losses': recent_tally(lost[order]),
+            'differential': np.bincount(team, weights=margin, minlength=count).astype(int),
+            'streak': streak, 'streak_kind': streak_kind,
+        }
+        return self._table
+
+    def form(self, team):
+        """Display strings for one team, or None if it has no results yet."""
+        index = self._team_index.get(team)
+        if index is None:
+            return None
+        t = {key: values[index] for key, values in self.table().items()}
+        kind = {1: 'W', -1: 'L'}.get(int(t['streak_kind']), 'T')
+        return {
+            'record': f"{t['wins']}-{t['losses']}",
+            'home': f"{t['home_wins']}-{t['home_losses']}",
+            'away': f"{t['away_wins']}-{t['away_losses']}",
+            'last': f"{t['last_wins']}-{t['last_losses']}",
+            'differential': f"{t['differential']:+d}",
+            'streak': f"{kind}{t['streak']}" if t['streak'] else '-',
+        }
+
+
+FORM_COLUMNS = ["Team", "Record", "Home", "Away", f"Last {LAST_N}", "Diff", "Streak"]
+FORM_KEYS = ('record', 'home', 'away', 'last', 'differential', 'streak')
+
+
+def attach_form(game, standings):
+    """Sets game['teamForm'] = {team: form} on a scheduled game when both teams have results."""
+    if standings is None or not game or game.get('status', {}).get('type', {}).get('state') != 'pre':
+        return game
+    teams = [c.get('team', {}).get('abbreviation') for c in game.get('competitors', [])]
+    forms = {team: standings.form(team) for team in teams}
+    if all(forms.values()):
+        game['teamForm'] = forms
+    return game
+
+
+def form_rows(game, away_team, home_team):
+    """Cell text of the pre-game form table (away row, home row), or None without teamForm."""
+    forms = game.get('teamForm')
+    if not forms or away_team not in forms or home_team not in forms:
+        return None
+    return [[team] + [forms[team][key] for key in FORM_KEYS] for team in (away_team, home_team)]
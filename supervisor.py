@@ -0,0 +1,218 @@
+"""
+Long-lived service mode for the scoreboard scripts.
+
+The scripts used to break out of their loop on the first exception and exit
+at 1:30 AM, relying on cron to start them again (and paying the full Python,
+matplotlib and GUI startup every time). The Supervisor here keeps one
+process running instead:
+
+- the figure is owned by a RenderWorker that is reset in-process after a
+  render crash instead of taking the process down,
+- errors are classified and retried with exponential backoff,
+- outside the configured active hours the display is put to sleep with a
+  message and the loop idles on an Event wait, which costs almost no CPU.
+"""
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+# --- Configuration ---
+# (start, end) pairs in 24h "HH:MM". A window whose end is before its start
+# runs past midnight. The default matches isWithinActiveHours() in GetNBA.html.
+ACTIVE_HOURS = [("12:30", "01:30")]
+IDLE_POLL_SECONDS = 5
+BACKOFF_BASE_SECONDS = 5
+BACKOFF_MAX_SECONDS = 300
+MAX_RENDER_FAILURES = 3
+
+# --- Error classes ---
+TRANSIENT = 'transient'  # network, disk, timeouts: retry with backoff
+RENDER = 'render'        # a bug or bad data in the drawing code: reset the figure and retry
+FATAL = 'fatal'          # out of memory, Ctrl+C, window closed: let it propagate
+
+
+def classify_error(exc):
+    """Sorts an exception raised by a loop iteration into TRANSIENT, RENDER or FATAL."""
+    if isinstance(exc, (MemoryError, KeyboardInterrupt, SystemExit)) or not isinstance(exc, Exception):
+        return FATAL
+    # requests/urllib3 errors all derive from IOError (OSError), so this also
+    # covers them without importing requests here
+    if isinstance(exc, (OSError, TimeoutError, ConnectionError)):
+        return TRANSIENT
+    return RENDER
+
+
+def _parse_hhmm(value):
+    hours, minutes = value.split(':')
+    return int(hours) * 60 + int(minutes)
+
+
+def parse_windows(windows):
+    """Turns [("12:30", "01:30"), ...] into [(750, 90), ...] minutes since midnight."""
+    return [(_parse_hhmm(start), _parse_hhmm(end)) for start, end in windows]
+
+
+def _in_window(minute, start, end):
+    if start <= end:
+        return start <= minute <= end
+    # Window crosses midnight
+    return minute >= start or minute <= end
+
+
+def within_active_hours(now=None, windows=ACTIVE_HOURS):
+    """True if `now` falls in any of the active windows. No windows means always active."""
+    if not windows:
+        return True
+    now = now or datetime.now()
+    minute = now.hour * 60 + now.minute
+    return any(_in_window(minute, start, end) for start, end in parse_windows(windows))
+
+
+def next_active_time(now=None, windows=ACTIVE_HOURS):
+    """Returns the datetime at which the next active window starts (or `now` if already active)."""
+    now = now or datetime.now()
+    if within_active_hours(now, windows):
+        return now
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    starts = []
+    for start, _ in parse_windows(windows):
+        start_time = midnight + timedelta(minutes=start)
+        if start_time <= now:
+            start_time += timedelta(days=1)
+        starts.append(start_time)
+    return min(starts)
+
+
+class Backoff:
+    """Exponential backoff with jitter, reset after the next success."""
+
+    def __init__(self, base=BACKOFF_BASE_SECONDS, maximum=BACKOFF_MAX_SECONDS):
+        self.base = base
+        self.maximum = maximum
+        self.failures = 0
+
+    def next_delay(self):
+        delay = self.base * (2 ** self.failures)
+        self.failures += 1
+        # Up to 20% jitter so several kiosks do not retry in lockstep
+        return min(self.maximum, delay * (1 + random.random() * 0.2))
+
+    def reset(self):
+        self.failures = 0
+
+
+class RenderWorker:
+    """
+    Owns the figure and runs every render against it. When rendering keeps
+    crashing the figure is cleared and re-initialised in-process, so the
+    window (and the process) stay up.
+    """
+
+    def __init__(self, fig, render, reset=None, max_failures=MAX_RENDER_FAILURES):
+        self.fig = fig
+        self._render = render
+        self._reset = reset
+        self.max_failures = max_failures
+        self.failures = 0
+        self.restarts = 0
+
+    def render(self, *args, **kwargs):
+        try:
+            result = self._render(self.fig, *args, **kwargs)
+        except Exception:
+            self.failures += 1
+            if self.failures >= self.max_failures:
+                self.restart()
+            raise
+        self.failures = 0
+        return result
+
+    def restart(self):
+        """Throws away everything drawn on the figure and re-runs the reset hook."""
+        print(f"Restarting render worker after {self.failures} failed renders.")
+        facecolor = self.fig.get_facecolor()
+        self.fig.clf()
+        self.fig.patch.set_facecolor(facecolor)
+        if self._reset:
+            self._reset(self.fig)
+        self.failures = 0
+        self.restarts += 1
+
+
+class Supervisor:
+    """
+    Runs `step()` every `interval` seconds inside the active hours.
+
+    `pause(seconds)` is used between steps (plt.pause keeps the GUI alive),
+    `on_idle(resume_at)` is called once when entering the idle period and
+    `idle_tick()` every IDLE_POLL_SECONDS while idle. Inside the active hours
+    `gate(now)`, if given, can still send the loop idling by returning the
+    datetime to resume at (e.g. the next game window); None means poll.
+    `reload()`, if given, runs before every step and idle tick (e.g. to
+    pick up a changed config file); when it returns something true an idle
+    period ends early, so new hours or teams are looked at right away.
+    """
+
+    def __init__(self, step, interval, pause=time.sleep, windows=ACTIVE_HOURS,
+                 on_idle=None, idle_tick=None, on_error=None, gate=None, reload=None):
+        self.step = step
+        self.interval = interval
+        self.pause = pause
+        self.windows = windows
+        self.on_idle = on_idle
+        self.idle_tick = idle_tick
+        self.on_error = on_error
+        self.gate = gate
+        self.reload = reload
+        self.backoff = Backoff()
+        # Set to stop the loop, or to cut an idle period short
+        self.stop_event = threading.Event()
+        self.wake_event = threading.Event()
+
+    def run(self):
+        while not self.stop_event.is_set():
+            if self.reload:
+                self.reload()
+            now = datetime.now()
+            if not within_active_hours(now, self.windows):
+                self.idle(next_active_time(now, self.windows))
+                continue
+            resume_at = self.gate(now) if self.gate else None
+            if resume_at and resume_at > now:
+                self.idle(resume_at, "No game coming up")
+                continue
+
+            try:
+                self.step()
+                self.backoff.reset()
+                delay = self.interval
+            except Exception as e:
+                kind = classify_error(e)
+                if kind == FATAL:
+                    raise
+                delay = max(self.interval, self.backoff.next_delay())
+                print(f"{kind.capitalize()} error in the main loop, retrying in {delay:.0f}s: {e}")
+                if self.on_error:
+                    self.on_error(e, kind)
+            self.pause(delay)
+
+    def idle(self, resume_at, reason="Outside active hours"):
+        """Sleeps until `resume_at`, the wake event or the stop event, whichever is first."""
+        print(f"{reason}, idling until {resume_at.strftime('%H:%M')}.")
+        if self.on_idle:
+            self.on_idle(resume_at)
+        self.wake_event.clear()
+        while not self.stop_event.is_set() and not self.wake_event.is_set():
+            remaining = (resume_at - datetime.now()).total_seconds()
+            if remaining <= 0:
+                break
+            self.wake_event.wait(min(remaining, IDLE_POLL_SECONDS))
+            if self.idle_tick:
+                self.idle_tick()
+            if self.reload and self.reload():
+                break
+
+    def stop(self):
+        self.stop_event.set()
+        self.wake_event.set()
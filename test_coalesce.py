@@ -0,0 +1,41 @@
+import threading
+
+from coalesce import LatestValueQueue
+
+
+def test_keeps_only_the_latest_value_per_key():
+    queue = LatestValueQueue()
+    queue.put('NYY', 1)
+    queue.put('BOS', 1)
+    queue.put('NYY', 2)
+    assert len(queue) == 2
+    assert queue.get(timeout=0) == ('NYY', 2)
+    assert queue.get(timeout=0) == ('BOS', 1)
+    assert queue.get(timeout=0) is None
+    assert queue.stats() == {'put': 3, 'coalesced': 1, 'delivered': 2, 'waiting': 0}
+
+
+def test_a_busy_key_keeps_its_place():
+    queue = LatestValueQueue()
+    queue.put('NYY', 1)
+    queue.put('BOS', 1)
+    for value in range(2, 10):
+        queue.put('NYY', value)
+    assert queue.get(timeout=0) == ('NYY', 9)
+    assert queue.get(timeout=0) == ('BOS', 1)
+
+
+def test_pop_one_key():
+    queue = LatestValueQueue()
+    queue.put('NYY', 1)
+    assert 'NYY' in queue
+    assert queue.pop('BOS') is None
+    assert queue.pop('NYY') == 1
+    assert 'NYY' not in queue
+    assert "1 queued, 0 coalesced (0%), 1 delivered, 0 waiting" == queue.stats_line()
+
+
+def test_get_waits_for_a_put():
+    queue = LatestValueQueue()
+    threading.Timer(0.05, queue.put, args=('NYY', 1)).start()
+    assert queue.get(timeout=5) == ('NYY', 1)
@@ -0,0 +1,60 @@
+import json
+import types
+
+import pytest
+
+import config
+import supervisor
+
+
+def reloader(tmp_path, live=(), **settings):
+    module = types.SimpleNamespace(**settings)
+    return config.ConfigReloader(module, str(tmp_path / 'config.json'), live,
+                                 validators={'ACTIVE_HOURS': supervisor.parse_windows})
+
+
+def test_coerce_keeps_the_shape_of_the_setting(tmp_path):
+    settings = reloader(tmp_path, INTERVAL=10, RATIO=0.5, FLAG=True, NAME='NYY',
+                        ACTIVE_HOURS=[("12:30", "01:30")], PORT=None)
+    assert settings._coerce('INTERVAL', 15.0) == 15
+    assert isinstance(settings._coerce('RATIO', 1), float)
+    assert settings._coerce('ACTIVE_HOURS', [["09:00", "17:00"]]) == [("09:00", "17:00")]
+    assert settings._coerce('PORT', 8080) == 8080
+    assert settings._coerce('NAME', None) is None
+
+
+@pytest.mark.parametrize('name, value', [
+    ('INTERVAL', 'fast'),
+    ('INTERVAL', 1.5),
+    ('INTERVAL', True),
+    ('FLAG', 1),
+    ('NAME', 5),
+    ('ACTIVE_HOURS', "09:00-17:00"),
+    ('ACTIVE_HOURS', [["9am", "5pm"]]),
+])
+def test_coerce_rejects_the_wrong_type(tmp_path, name, value):
+    settings = reloader(tmp_path, INTERVAL=10, FLAG=True, NAME='NYY', ACTIVE_HOURS=[("12:30", "01:30")])
+    with pytest.raises((TypeError, ValueError)):
+        settings._coerce(name, value)
+
+
+def test_only_live_settings_reload(tmp_path):
+    settings = reloader(tmp_path, live=['TEAM'], TEAM='NYY', WORKERS=0)
+    path = tmp_path / 'config.json'
+    path.write_text(json.dumps({'TEAM': 'BOS', 'WORKERS': 2}))
+    assert settings.check() == {'TEAM': 'BOS', 'WORKERS': 2}
+
+    changes = []
+    settings.on_change = changes.append
+    path.write_text(json.dumps({'TEAM': 'TOR', 'WORKERS': 4}))
+    settings._requested = True
+    assert settings.check() == {'TEAM': 'TOR'}
+    assert changes == [{'TEAM': 'TOR'}]
+    assert settings.module.WORKERS == 2
+
+
+def test_bad_values_keep_the_current_settings(tmp_path):
+    settings = reloader(tmp_path, TEAM='NYY', INTERVAL=10)
+    (tmp_path / 'config.json').write_text(json.dumps({'TEAM': 'BOS', 'INTERVAL': 'soon', 'OTHER': 1}))
+    assert settings.check() == {'TEAM': 'BOS'}
+    assert settings.module.INTERVAL == 10
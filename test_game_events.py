@@ -0,0 +1,85 @@
+import game_events
+from game_events import FINAL, LEAD_CHANGE, SCORE, STATUS_CHANGE, UPDATE
+
+
+def game(away_score, home_score, status='STATUS_IN_PROGRESS', period=1, completed=False, **situation):
+    return {
+        'id': '401',
+        'status': {'period': period, 'type': {'name': status, 'completed': completed}},
+        'competitors': [
+            {'homeAway': 'away', 'score': str(away_score), 'team': {'abbreviation': 'BOS'}},
+            {'homeAway': 'home', 'score': str(home_score), 'team': {'abbreviation': 'NYY'}},
+        ],
+        'situation': situation,
+    }
+
+
+def kinds(events):
+    return [event.kind for event in events]
+
+
+def test_snapshot_leader():
+    assert game_events.snapshot(game(2, 1))['leader'] == 'BOS'
+    assert game_events.snapshot(game(1, 2))['leader'] == 'NYY'
+    assert game_events.snapshot(game(1, 1))['leader'] is None
+    assert game_events.snapshot(None) is None
+
+
+def test_diff_score_and_lead_change():
+    prev, curr = game_events.snapshot(game(1, 0)), game_events.snapshot(game(1, 2))
+    events = game_events.diff(prev, curr)
+    assert kinds(events) == [SCORE, LEAD_CHANGE]
+    assert events[0].team == 'NYY' and events[0].data == {'points': 2, 'score': 2}
+    assert events[1].data == {'leader': 'NYY', 'previous': 'BOS'}
+
+
+def test_tie_is_not_a_lead_change():
+    events = game_events.diff(game_events.snapshot(game(1, 0)), game_events.snapshot(game(1, 1)))
+    assert kinds(events) == [SCORE]
+
+
+def test_lead_change_through_a_tie():
+    engine = game_events.GameEventEngine()
+    engine.update(game(1, 0))
+    assert kinds(engine.update(game(1, 1))) == [SCORE]
+    events = engine.update(game(1, 2))
+    assert kinds(events) == [SCORE, LEAD_CHANGE]
+    assert events[1].data == {'leader': 'NYY', 'previous': 'BOS'}
+
+
+def test_retaking_the_lead_after_a_tie_is_no_change():
+    engine = game_events.GameEventEngine()
+    engine.update(game(1, 0))
+    engine.update(game(1, 1))
+    assert kinds(engine.update(game(2, 1))) == [SCORE]
+
+
+def test_final_names_the_winner():
+    events = game_events.diff(game_events.snapshot(game(3, 5)),
+                              game_events.snapshot(game(3, 5, 'STATUS_FINAL', completed=True)))
+    assert kinds(events) == [STATUS_CHANGE, FINAL]
+    assert events[1].data == {'winner': 'NYY', 'away_score': 3, 'home_score': 5}
+
+
+def test_update_only_for_untyped_changes():
+    before, after = game(0, 0, balls=1), game(0, 0, balls=2)
+    prev, curr = game_events.snapshot(before), game_events.snapshot(after)
+    assert kinds(game_events.diff(prev, curr, before, after)) == [UPDATE]
+    assert game_events.diff(prev, curr, before, dict(before)) == []
+
+
+def test_new_and_vanished_game():
+    curr = game_events.snapshot(game(0, 0))
+    assert game_events.diff(None, curr)[0].data == {'status': 'STATUS_IN_PROGRESS', 'previous': None}
+    assert game_events.diff(curr, None)[0].data == {'status': None, 'previous': 'STATUS_IN_PROGRESS'}
+    assert game_events.diff(None, None) == []
+
+
+def test_engine_publishes_only_changes():
+    engine = game_events.GameEventEngine()
+    published = []
+    engine.bus.subscribe(lambda events, game: published.append(kinds(events)), kinds={SCORE})
+    engine.update(game(0, 0))
+    assert engine.update(game(0, 0)) == []
+    engine.update(game(0, 1))
+    assert published == [[SCORE]]
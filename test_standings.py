@@ -0,0 +1,77 @@
+import standings
+
+
+def season(results):
+    """A Standings with one game per (date, home, away, home score, away score)."""
+    table = standings.Standings('MLB', capacity=2)
+    for number, (date, home, away, home_score, away_score) in enumerate(results):
+        game_id = str(number)
+        table.add(game_id, home, away, date, True, home_score, away_score)
+        table.add(game_id, away, home, date, False, away_score, home_score)
+    return table
+
+
+RESULTS = [
+    ('2026-04-01T23:05Z', 'NYY', 'BOS', 5, 3),
+    ('2026-04-02T23:05Z', 'NYY', 'BOS', 2, 4),
+    ('2026-04-03T23:05Z', 'BOS', 'NYY', 1, 6),
+    ('2026-04-04T23:05Z', 'BOS', 'NYY', 0, 2),
+]
+
+
+def test_form_lines():
+    table = season(RESULTS)
+    assert len(table) == 8
+    assert table.form('NYY') == {'record': '3-1', 'home': '1-1', 'away': '2-0', 'last': '3-1',
+                                 'differential': '+7', 'streak': 'W2'}
+    assert table.form('BOS') == {'record': '1-3', 'home': '0-2', 'away': '1-1', 'last': '1-3',
+                                 'differential': '-7', 'streak': 'L2'}
+    assert table.form('TOR') is None
+
+
+def test_streak_follows_dates_not_insertion_order():
+    table = season(list(reversed(RESULTS)))
+    assert table.form('NYY')['streak'] == 'W2'
+
+
+def test_last_n_counts_only_the_latest_games():
+    results = [(f'2026-05-{day:02d}T23:05Z', 'NYY', 'BOS', 1, 0) for day in range(1, 13)]
+    results.append(('2026-05-13T23:05Z', 'NYY', 'BOS', 0, 1))
+    form = season(results).form('NYY')
+    assert form['record'] == '12-1'
+    assert form['last'] == '9-1'
+    assert form['streak'] == 'L1'
+
+
+def test_duplicates_and_unscored_games_are_ignored():
+    table = season(RESULTS[:1])
+    assert not table.add('0', 'NYY', 'BOS', RESULTS[0][0], True, 5, 3)
+    assert not table.add('9', 'NYY', 'BOS', '2026-04-09T23:05Z', True, None, None)
+    assert table.form('NYY')['record'] == '1-0'
+
+
+def test_table_is_recomputed_after_new_results():
+    table = season(RESULTS[:1])
+    assert table.form('NYY')['record'] == '1-0'
+    table.add('9', 'NYY', 'BOS', '2026-04-09T23:05Z', True, 0, 1)
+    assert table.form('NYY')['record'] == '1-1'
+
+
+def scheduled_game():
+    return {
+        'status': {'type': {'state': 'pre'}},
+        'competitors': [{'team': {'abbreviation': 'BOS'}}, {'team': {'abbreviation': 'NYY'}}],
+    }
+
+
+def test_attach_form_on_scheduled_games_only():
+    table = season(RESULTS)
+    game = standings.attach_form(scheduled_game(), table)
+    assert game['teamForm']['NYY']['record'] == '3-1'
+    rows = standings.form_rows(game, 'BOS', 'NYY')
+    assert rows[1] == ['NYY', '3-1', '1-1', '2-0', '3-1', '+7', 'W2']
+
+    live = scheduled_game()
+    live['status']['type']['state'] = 'in'
+    assert 'teamForm' not in standings.attach_form(live, table)
+    assert 'teamForm' not in standings.attach_form(scheduled_game(), season(RESULTS[:0]))
@@ -0,0 +1,58 @@
+from datetime import datetime
+
+import pytest
+
+import supervisor
+
+NIGHT = [("12:30", "01:30")]
+
+
+def at(hhmm, day=19):
+    hours, minutes = map(int, hhmm.split(':'))
+    return datetime(2026, 10, day, hours, minutes)
+
+
+def test_parse_windows():
+    assert supervisor.parse_windows([("12:30", "01:30"), ("00:00", "23:59")]) == [(750, 90), (0, 1439)]
+
+
+@pytest.mark.parametrize('now, active', [
+    ("12:29", False),
+    ("12:30", True),
+    ("18:00", True),
+    ("00:00", True),
+    ("01:30", True),
+    ("01:31", False),
+    ("09:00", False),
+])
+def test_window_past_midnight(now, active):
+    assert supervisor.within_active_hours(at(now), NIGHT) is active
+
+
+def test_no_windows_is_always_active():
+    assert supervisor.within_active_hours(at("03:00"), [])
+
+
+def test_next_active_time():
+    assert supervisor.next_active_time(at("09:00"), NIGHT) == at("12:30")
+    assert supervisor.next_active_time(at("18:00"), NIGHT) == at("18:00")
+    # Past today's only start: tomorrow's
+    assert supervisor.next_active_time(at("20:00"), [("08:00", "17:00")]) == at("08:00", day=20)
+    # The earliest of several windows
+    assert supervisor.next_active_time(at("05:00"), [("20:00", "22:00"), ("07:00", "09:00")]) == at("07:00")
+
+
+def test_backoff_grows_to_the_maximum_and_resets():
+    backoff = supervisor.Backoff(base=5, maximum=60)
+    delays = [backoff.next_delay() for _ in range(6)]
+    assert 5 <= delays[0] <= 6
+    assert 10 <= delays[1] <= 12
+    assert delays[-1] == 60
+    backoff.reset()
+    assert backoff.next_delay() <= 6
+
+
+def test_classify_error():
+    assert supervisor.classify_error(TimeoutError()) == supervisor.TRANSIENT
+    assert supervisor.classify_error(KeyError('score')) == supervisor.RENDER
+    assert supervisor.classify_error(MemoryError()) == supervisor.FATAL
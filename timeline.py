@@ -0,0 +1,100 @@
+"""
+Running score/lead timeline of a game, drawn incrementally.
+
+A ScoreTimeline records the polled states of one game in preallocated NumPy
+arrays that double in size when full, so appending a point is O(1) however
+long the game runs (extra innings, overtime). The scoreboard draws it as a
+strip under the tables (see layouts.py), straight from the array views.
+"""
+import time
+
+import numpy as np
+
+INITIAL_CAPACITY = 256
+# Where the strip sits on the 16:9 scoreboard (figure fraction), below "Last Updated"
+PANEL_RECT = (0.15, 0.015, 0.7, 0.085)
+
+
+class ScoreTimeline:
+    """Score history of one game: minutes since the first poll, away/home score, home win probability."""
+
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        self._data = np.full((4, capacity), np.nan)
+        self._size = 0
+        self.game_id = None
+        self.started_at = None
+        self.away_team = self.home_team = None
+
+    def reset(self, game_id=None):
+        self._size = 0
+        self.game_id = game_id
+        self.started_at = None
+
+    def __len__(self):
+        return self._size
+
+    def __getstate__(self):
+        # Only ship the used part of the buffer to render workers
+        state = self.__dict__.copy()
+        state['_data'] = self._data[:, :self._size].copy()
+        return state
+
+    @property
+    def minutes(self):
+        return self._data[0, :self._size]
+
+    @property
+    def away(self):
+        return self._data[1, :self._size]
+
+    @property
+    def home(self):
+        return self._data[2, :self._size]
+
+    @property
+    def lead(self):
+        """Home minus away score."""
+        return self.home - self.away
+
+    @property
+    def win_probability(self):
+        return self._data[3, :self._size]
+
+    def append(self, minutes, away, home, win_probability=np.nan):
+        if self._size == self._data.shape[1]:
+            grown = np.full((4, max(1, 2 * self._size)), np.nan)
+            grown[:, :self._size] = self._data[:, :self._size]
+            self._data = grown
+        self._data[:, self._size] = (minutes, away, home, win_probability)
+        self._size += 1
+
+    def record(self, game, at=None):
+        """
+        Appends the state of a live or finished game, if its score or win
+        probability moved since the last point. Returns True if a point was added.
+        """
+        if not game or game.get('status', {}).get('type', {}).get('state') not in ('in', 'post'):
+            return False
+        if game.get('id') != self.game_id:
+            self.reset(game.get('id'))
+        competitors = game.get('competitors', [])
+        away = next((c for c in competitors if c.get('homeAway') == 'away'), {})
+        home = next((c for c in competitors if c.get('homeAway') == 'home'), {})
+        self.away_team = away.get('team', {}).get('abbreviation')
+        self.home_team = home.get('team', {}).get('abbreviation')
+        try:
+            away_score, home_score = float(away.get('score') or 0), float(home.get('score') or 0)
+        except ValueError:
+            return False
+        wp = game.get('winProbability', np.nan)
+
+        at = time.time() if at is None else at
+        if self.started_at is None:
+            self.started_at = at
+        if self._size:
+            last = self._data[:, self._size - 1]
+            same_wp = (np.isnan(wp) and np.isnan(last[3])) or wp == last[3]
+            if last[1] == away_score and last[2] == home_score and same_wp:
+                return False
+        self.append((at - self.started_at) / 60.0, away_score, home_score, wp)
+        return True
@@ -0,0 +1,144 @@
+"""
+Stale-while-revalidate cache with a circuit breaker around the ESPN fetch.
+
+fetch_scoreboard() returns None whenever ESPN errors or times out, and the
+scripts used to turn that straight into "No Game Today" in the middle of
+a game. UpstreamCache keeps the last good payload and serves a marked copy
+of it while upstream is failing. After FAILURE_THRESHOLD failures in a row
+the breaker opens: ESPN is not called at all until the next probe, and
+the probes back off exponentially while they keep failing. The first
+successful fetch closes the breaker again.
+
+A stale payload (and every game taken from it with mark_stale()) carries
+STALE_KEY, the time the data was fetched, and STALE_MINUTES_KEY, its age in
+whole minutes, so the footer can say how old the numbers are and the
+scoreboard is redrawn once a minute while it is stale, not on every poll.
+"""
+import json
+import os
+import time
+from datetime import datetime
+
+import supervisor
+
+FAILURE_THRESHOLD = 3        # failures in a row that open the breaker
+PROBE_BASE_SECONDS = 15      # first probe after the breaker opens ...
+PROBE_MAX_SECONDS = 120      # ... doubling up to this
+MAX_STALE_SECONDS = 6 * 3600  # older data is not shown at all (yesterday's game)
+STALE_KEY = 'staleSince'
+STALE_MINUTES_KEY = 'staleMinutes'
+STALE_COLOR = '#FFA500'
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+
+
+class CircuitBreaker:
+    """Stops calling a failing upstream and lets a single probe through now and then."""
+
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, probe_base=PROBE_BASE_SECONDS,
+                 probe_max=PROBE_MAX_SECONDS, clock=time.time):
+        self.failure_threshold = failure_threshold
+        self.backoff = supervisor.Backoff(probe_base, probe_max)
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.next_probe = 0
+
+    def allow(self):
+        """Whether the upstream may be called now."""
+        if self.state == OPEN and self.clock() >= self.next_probe:
+            self.state = HALF_OPEN
+        return self.state != OPEN
+
+    def record_success(self):
+        if self.state != CLOSED:
+            print("Upstream is back; circuit breaker closed")
+        self.reset()
+
+    def reset(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.backoff.reset()
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            delay = self.backoff.next_delay()
+            self.next_probe = self.clock() + delay
+            self.state = OPEN
+            print(f"Circuit breaker open after {self.failures} failures; next probe in {delay:.0f} s")
+
+
+class UpstreamCache:
+    """
+    Wraps a fetch function that returns a payload or None. fetch() returns
+    fresh data when upstream answers and the last good payload, marked
+    stale, when it does not (or when the breaker keeps upstream off).
+    """
+
+    def __init__(self, fetch, seed_path=None, breaker=None, max_stale=MAX_STALE_SECONDS, clock=time.time):
+        self._fetch = fetch
+        self.seed_path = seed_path
+        self.breaker = breaker or CircuitBreaker(clock=clock)
+        self.max_stale = max_stale
+        self.clock = clock
+        self.payload = None
+        self.fetched_at = None
+
+    def fetch(self):
+        if self.breaker.allow():
+            payload = self._fetch()
+            if payload is not None:
+                self.breaker.record_success()
+                self.payload, self.fetched_at = payload, self.clock()
+                return payload
+            self.breaker.record_failure()
+        return self.stale()
+
+    def reset(self):
+        """Forgets the last good payload and the failures (the upstream URL changed)."""
+        self.payload = self.fetched_at = None
+        self.seed_path = None
+        self.breaker.reset()
+
+    def stale(self):
+        """The last good payload marked with its age, or None if there is none recent enough."""
+        if self.payload is None:
+            self._load_seed()
+        if self.payload is None:
+            return None
+        age = self.clock() - self.fetched_at
+        if age > self.max_stale:
+            return None
+        print(f"Serving the scoreboard from {int(age)} s ago")
+        return dict(self.payload, **{STALE_KEY: self.fetched_at, STALE_MINUTES_KEY: int(age // 60)})
+
+    def _load_seed(self):
+        # After a restart the payload the last run saved is the best we have
+        if not self.seed_path or not os.path.exists(self.seed_path):
+            return
+        try:
+            with open(self.seed_path) as f:
+                self.payload = json.load(f)
+            self.fetched_at = os.path.getmtime(self.seed_path)
+        except (OSError, ValueError) as e:
+            print(f"Could not read the saved scoreboard {self.seed_path}: {e}")
+
+
+def mark_stale(game, json_data):
+    """Copies the payload's stale marker onto a game taken from it."""
+    if not game or not json_data or STALE_KEY not in json_data:
+        return game
+    return dict(game, **{STALE_KEY: json_data[STALE_KEY], STALE_MINUTES_KEY: json_data[STALE_MINUTES_KEY]})
+
+
+def is_stale(data):
+    return bool(data) and STALE_KEY in data
+
+
+def updated_text(data, updated_at=None):
+    """The footer's "Last Updated" time; for stale data the time it was fetched and its age."""
+    if is_stale(data):
+        fetched = datetime.fromtimestamp(data[STALE_KEY]).strftime('%H:%M:%S')
+        return f"{fetched} (ESPN not responding, {data[STALE_MINUTES_KEY]} min old)"
+    return (datetime.fromtimestamp(updated_at) if updated_at else datetime.now()).strftime('%H:%M:%S')
@@ -0,0 +1,78 @@
+"""
+Warm-start helpers for the scoreboard scripts.
+
+After a reboot or cron relaunch the scripts used to show nothing until
+matplotlib was imported and the first ESPN fetch came back. This module
+keeps a small state file with the last parsed game and can put the last
+rendered PNG on screen with plain Tk before matplotlib is loaded. Only the
+standard library is imported here so it stays cheap to import.
+"""
+import json
+import os
+import time
+
+
+def save_state(path, team, game):
+    """Saves the last parsed game for `team`; written atomically so a power cut never leaves half a file."""
+    state = {'team': team, 'saved_at': time.time(), 'game': game}
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Could not save warm-start state to {path}: {e}")
+
+
+def load_state(path, team):
+    """
+    Returns the saved state dict ({'team', 'saved_at', 'game'}) if it belongs
+    to `team`, otherwise None.
+    """
+    try:
+        with open(path) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get('team') != team:
+        return None
+    return state
+
+
+class LastFrameSplash:
+    """A bare full-screen Tk window showing the last rendered scoreboard PNG."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def close(self):
+        try:
+            self.root.destroy()
+        except Exception:
+            pass
+
+
+def show_last_frame(png_path, background='#606060'):
+    """
+    Puts the last rendered frame on screen right away. Returns a splash
+    object to close once the real figure is up, or None if there is no
+    frame yet or no display/Tk available.
+    """
+    if not os.path.exists(png_path):
+        return None
+    try:
+        import tkinter as tk
+
+        root = tk.Tk()
+        root.configure(background=background)
+        root.attributes('-fullscreen', True)
+        image = tk.PhotoImage(file=png_path)
+        label = tk.Label(root, image=image, background=background, borderwidth=0)
+        # Keep a reference so Tk does not garbage collect the image
+        label.image = image
+        label.pack(expand=True)
+        root.update()
+        return LastFrameSplash(root)
+    except Exception as e:
+        print(f"Could not show the last frame: {e}")
+        return None
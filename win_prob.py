@@ -0,0 +1,214 @@
+"""
+MLB win probability and run expectancy from the live situation.
+
+All the work happens once, at startup: a plate-appearance Markov model
+gives the distribution of runs scored in the rest of a half-inning for
+every base/out state, and a backward pass over the innings turns that into
+a win-probability table indexed by half-inning, outs, bases and score
+difference. Looking up a game during a poll is then a single array index,
+and a whole slate of games is evaluated with one fancy-indexing call.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+# --- Model parameters ---
+# League-average plate appearance outcomes (roughly recent MLB seasons)
+PA_OUTCOMES = {
+    'out': 0.685,
+    'walk': 0.093,
+    'single': 0.140,
+    'double': 0.044,
+    'triple': 0.004,
+    'home_run': 0.031,
+}
+MAX_RUNS = 16        # runs in a half-inning are tracked up to this (last bucket is "or more")
+MAX_DIFF = 20        # score differences are clipped to +/- this
+MAX_INNINGS = 15     # innings beyond this use the last inning's table
+REGULATION_INNINGS = 9
+FIXED_POINT_ITERATIONS = 60
+
+# Base states are bit masks: 1 = runner on first, 2 = second, 4 = third
+BASE_STATES = 8
+TOP, BOTTOM = 0, 1
+
+
+def _runners(bases):
+    return (bases & 1) + ((bases >> 1) & 1) + ((bases >> 2) & 1)
+
+
+def _transitions(bases):
+    """(probability, runs, new bases, out) for every plate appearance outcome from `bases`."""
+    total = sum(PA_OUTCOMES.values())
+    p = {name: value / total for name, value in PA_OUTCOMES.items()}
+    first, second, third = bases & 1, bases & 2, bases & 4
+
+    # Walks only move forced runners
+    if not first:
+        walk = (0, bases | 1)
+    elif not second:
+        walk = (0, bases | 3)
+    elif not third:
+        walk = (0, 7)
+    else:
+        walk = (1, 7)
+
+    return [
+        (p['out'], 0, bases, True),
+        (p['walk'], walk[0], walk[1], False),
+        # Runners on second and third score on a single, the runner on first stops at second
+        (p['single'], (1 if second else 0) + (1 if third else 0), 1 | (2 if first else 0), False),
+        # ... and on a double the runner on first stops at third
+        (p['double'], (1 if second else 0) + (1 if third else 0), 2 | (4 if first else 0), False),
+        (p['triple'], _runners(bases), 4, False),
+        (p['home_run'], _runners(bases) + 1, 0, False),
+    ]
+
+
+def _shift(dist, runs):
+    """Shifts a runs distribution by `runs`, piling the overflow into the last bucket."""
+    if runs == 0:
+        return dist
+    shifted = np.zeros_like(dist)
+    shifted[..., runs:] = dist[..., :-runs]
+    shifted[..., -1] += dist[..., -runs:].sum(axis=-1)
+    return shifted
+
+
+@lru_cache(maxsize=None)
+def runs_distribution():
+    """
+    R[outs, bases, k]: probability of scoring exactly k more runs in the half
+    inning from the given base/out state.
+    """
+    runs = np.zeros((4, BASE_STATES, MAX_RUNS))
+    runs[3, :, 0] = 1.0  # three outs: no more runs
+    transitions = [_transitions(bases) for bases in range(BASE_STATES)]
+    for outs in (2, 1, 0):
+        # Non-out outcomes stay on the same out level, so iterate to a fixed point
+        level = np.zeros((BASE_STATES, MAX_RUNS))
+        for _ in range(FIXED_POINT_ITERATIONS):
+            new_level = np.zeros_like(level)
+            for bases in range(BASE_STATES):
+                for prob, scored, new_bases, is_out in transitions[bases]:
+                    source = runs[outs + 1, new_bases] if is_out else level[new_bases]
+                    new_level[bases] += prob * _shift(source, scored)
+            level = new_level
+        runs[outs] = level
+    return runs[:3]
+
+
+@lru_cache(maxsize=None)
+def run_expectancy():
+    """RE[outs, bases]: expected runs in the rest of the half inning (the classic RE24 table)."""
+    return runs_distribution() @ np.arange(MAX_RUNS)
+
+
+def _half_start_distribution(inning):
+    runs = runs_distribution()
+    # Extra innings start with a runner on second
+    return runs[0, 2] if inning > REGULATION_INNINGS else runs[0, 0]
+
+
+@lru_cache(maxsize=None)
+def tables():
+    """
+    Returns (start, live):
+    start[h, d] is the home win probability at the start of half-inning h
+    (h = 2 * (inning - 1) + half) with home-minus-away difference d - MAX_DIFF;
+    live[h, outs, bases, d] is the same in the middle of half-inning h.
+    """
+    halves = 2 * MAX_INNINGS
+    diffs = np.arange(-MAX_DIFF, MAX_DIFF + 1)
+    n_diffs = len(diffs)
+    runs = runs_distribution()
+    start = np.zeros((halves, n_diffs))
+    # after_half[h, d, k]: win probability once half-inning h ended with k runs scored
+    after_half = np.zeros((halves, n_diffs, MAX_RUNS))
+
+    def value_after(h, new_diffs):
+        inning, half = h // 2 + 1, h % 2
+        clipped = np.clip(new_diffs, -MAX_DIFF, MAX_DIFF)
+        if half == BOTTOM and inning >= REGULATION_INNINGS:
+            decided = np.where(clipped > 0, 1.0, 0.0)
+            if h + 1 >= halves:
+                following = np.full(clipped.shape, 0.5)
+            else:
+                following = start[h + 1][clipped + MAX_DIFF]
+            return np.where(clipped == 0, following, decided)
+        if half == TOP and inning >= REGULATION_INNINGS:
+            # Home team leading after the top of the 9th (or later) does not bat
+            return np.where(clipped > 0, 1.0, start[h + 1][clipped + MAX_DIFF])
+        return start[h + 1][clipped + MAX_DIFF]
+
+    scored = np.arange(MAX_RUNS)
+    for h in range(halves - 1, -1, -1):
+        sign = 1 if h % 2 == BOTTOM else -1
+        new_diffs = diffs[:, None] + sign * scored[None, :]
+        after_half[h] = value_after(h, new_diffs)
+        start[h] = after_half[h] @ _half_start_distribution(h // 2 + 1)
+
+    # live[h, outs, bases, d] = sum_k R[outs, bases, k] * after_half[h, d, k]
+    live = np.einsum('obk,hdk->hobd', runs, after_half)
+    return start, live
+
+
+def win_probability_batch(innings, halves, outs, bases, diffs):
+    """
+    Home win probability for arrays of situations in one vectorised lookup.
+    `halves` is TOP/BOTTOM, `bases` the runner bit mask, `diffs` home minus away.
+    """
+    _, live = tables()
+    innings = np.clip(np.asarray(innings), 1, MAX_INNINGS)
+    h = 2 * (innings - 1) + np.asarray(halves)
+    outs = np.clip(np.asarray(outs), 0, 2)
+    d = np.clip(np.asarray(diffs), -MAX_DIFF, MAX_DIFF) + MAX_DIFF
+    return live[h, outs, np.asarray(bases), d]
+
+
+def situation(game):
+    """
+    Extracts (inning, half, outs, bases, diff) from a live game, or None if the
+    game is not in progress. Between half-innings ("Mid 3rd", "End 3rd") the
+    situation is that of the start of the next half with nobody on.
+    """
+    status = game.get('status', {})
+    if status.get('type', {}).get('state') != 'in':
+        return None
+    competitors = game.get('competitors', [])
+    scores = {c.get('homeAway'): int(float(c.get('score') or 0)) for c in competitors}
+    diff = scores.get('home', 0) - scores.get('away', 0)
+    inning = max(1, int(status.get('period') or 1))
+    detail = status.get('type', {}).get('shortDetail', '')
+    sit = game.get('situation') or {}
+
+    if detail.startswith('Mid'):
+        return inning, BOTTOM, 0, 0, diff
+    if detail.startswith('End'):
+        return inning + 1, TOP, 0, 0, diff
+    half = BOTTOM if detail.startswith('Bot') else TOP
+    bases = (1 if sit.get('onFirst') else 0) | (2 if sit.get('onSecond') else 0) | (4 if sit.get('onThird') else 0)
+    return inning, half, int(sit.get('outs') or 0), bases, diff
+
+
+def evaluate_slate(games):
+    """
+    Home win probabilities for a list of games in one batched call; entries for
+    games that are not in progress are NaN.
+    """
+    result = np.full(len(games), np.nan)
+    rows = [(i, situation(game)) for i, game in enumerate(games) if game]
+    rows = [(i, sit) for i, sit in rows if sit is not None]
+    if rows:
+        index, situations = zip(*rows)
+        columns = np.array(situations).T
+        result[list(index)] = win_probability_batch(*columns)
+    return result
+
+
+def attach_win_probability(games):
+    """Stores the home win probability of each live game as game['winProbability']."""
+    for game, wp in zip(games, evaluate_slate(games)):
+        if game and not np.isnan(wp):
+            game['winProbability'] = float(wp)
+    return games